@@ -0,0 +1,131 @@
+"""
+Compares to_data and to_object of hand-written IdentifiedDataSerializable and
+Portable classes with the ones generated by hazelcast.serialization.compiler.
+"""
+import sys
+import timeit
+from os.path import dirname
+
+sys.path.append(dirname(dirname(__file__)))
+
+from hazelcast import six
+from hazelcast.config import SerializationConfig
+from hazelcast.serialization.api import IdentifiedDataSerializable, Portable
+from hazelcast.serialization.compiler import compile_identified_serializable, compile_portable
+from hazelcast.serialization.portable.classdef import ClassDefinitionBuilder, FieldType
+from hazelcast.serialization.service import SerializationServiceV1
+
+NUMBER = 50000
+FACTORY_ID = 1
+CLASS_ID = 1
+
+
+class Trade(object):
+    def __init__(self, id=0, quantity=0, price=0.0, timestamp=0, buy=False, symbol=None, venue=None):
+        self.id = id
+        self.quantity = quantity
+        self.price = price
+        self.timestamp = timestamp
+        self.buy = buy
+        self.symbol = symbol
+        self.venue = venue
+
+    def get_factory_id(self):
+        return FACTORY_ID
+
+    def get_class_id(self):
+        return CLASS_ID
+
+
+class IdentifiedTrade(Trade, IdentifiedDataSerializable):
+    def write_data(self, out):
+        out.write_long(self.id)
+        out.write_int(self.quantity)
+        out.write_double(self.price)
+        out.write_long(self.timestamp)
+        out.write_boolean(self.buy)
+        out.write_utf(self.symbol)
+        out.write_utf(self.venue)
+
+    def read_data(self, inp):
+        self.id = inp.read_long()
+        self.quantity = inp.read_int()
+        self.price = inp.read_double()
+        self.timestamp = inp.read_long()
+        self.buy = inp.read_boolean()
+        self.symbol = inp.read_utf()
+        self.venue = inp.read_utf()
+
+
+@compile_identified_serializable([
+    ("id", FieldType.LONG),
+    ("quantity", FieldType.INT),
+    ("price", FieldType.DOUBLE),
+    ("timestamp", FieldType.LONG),
+    ("buy", FieldType.BOOLEAN),
+    ("symbol", FieldType.UTF),
+    ("venue", FieldType.UTF),
+])
+class CompiledIdentifiedTrade(IdentifiedTrade):
+    pass
+
+
+class PortableTrade(Trade, Portable):
+    def write_portable(self, writer):
+        writer.write_long("id", self.id)
+        writer.write_int("quantity", self.quantity)
+        writer.write_double("price", self.price)
+        writer.write_long("timestamp", self.timestamp)
+        writer.write_boolean("buy", self.buy)
+        writer.write_utf("symbol", self.symbol)
+        writer.write_utf("venue", self.venue)
+
+    def read_portable(self, reader):
+        self.id = reader.read_long("id")
+        self.quantity = reader.read_int("quantity")
+        self.price = reader.read_double("price")
+        self.timestamp = reader.read_long("timestamp")
+        self.buy = reader.read_boolean("buy")
+        self.symbol = reader.read_utf("symbol")
+        self.venue = reader.read_utf("venue")
+
+
+TRADE_CLASS_DEF = ClassDefinitionBuilder(FACTORY_ID, CLASS_ID) \
+    .add_long_field("id") \
+    .add_int_field("quantity") \
+    .add_double_field("price") \
+    .add_long_field("timestamp") \
+    .add_boolean_field("buy") \
+    .add_utf_field("symbol") \
+    .add_utf_field("venue") \
+    .build()
+
+
+@compile_portable(TRADE_CLASS_DEF)
+class CompiledPortableTrade(PortableTrade):
+    pass
+
+
+def measure(name, cls, identified):
+    config = SerializationConfig()
+    if identified:
+        config.data_serializable_factories[FACTORY_ID] = {CLASS_ID: cls}
+    else:
+        config.portable_factories[FACTORY_ID] = {CLASS_ID: cls}
+        config.class_definitions.add(TRADE_CLASS_DEF)
+    service = SerializationServiceV1(config)
+
+    trade = cls(1234567, 100, 99.5, 1600000000000, True, "HZ", "NYSE")
+    data = service.to_data(trade)
+
+    to_data_time = timeit.timeit(lambda: service.to_data(trade), number=NUMBER)
+    to_object_time = timeit.timeit(lambda: service.to_object(data), number=NUMBER)
+    six.print_("{:24s} to_data: {:6.3f} us   to_object: {:6.3f} us".format(
+        name, to_data_time / NUMBER * 1e6, to_object_time / NUMBER * 1e6))
+
+
+if __name__ == '__main__':
+    measure("identified", IdentifiedTrade, True)
+    measure("identified (compiled)", CompiledIdentifiedTrade, True)
+    measure("portable", PortableTrade, False)
+    measure("portable (compiled)", CompiledPortableTrade, False)
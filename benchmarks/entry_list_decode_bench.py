@@ -0,0 +1,40 @@
+"""
+Measures reading and decoding a response with a large entry list,
+like the ones of the map entry_set and values calls.
+"""
+import sys
+import timeit
+from os.path import dirname
+
+sys.path.append(dirname(dirname(__file__)))
+
+from hazelcast import six
+from hazelcast.connection import _Reader
+from hazelcast.protocol.builtin import EntryListCodec, DataCodec
+from hazelcast.protocol.client_message import create_initial_buffer, REQUEST_HEADER_SIZE
+from hazelcast.serialization.data import Data
+
+ENTRY_COUNT = 100000
+NUMBER = 5
+
+
+def create_response():
+    buf = create_initial_buffer(REQUEST_HEADER_SIZE, 0)
+    entries = [(Data(bytearray(20)), Data(bytearray(50))) for _ in range(ENTRY_COUNT)]
+    EntryListCodec.encode(buf, entries, DataCodec.encode, DataCodec.encode, True)
+    return bytes(buf)
+
+
+if __name__ == '__main__':
+    response = create_response()
+
+    def read_and_decode():
+        reader = _Reader(None)
+        reader.read(response)
+        message = reader._read_message()
+        message.next_frame()
+        return EntryListCodec.decode(message, DataCodec.decode, DataCodec.decode)
+
+    elapsed = min(timeit.repeat(read_and_decode, number=NUMBER, repeat=3)) / NUMBER
+    six.print_("Entries: %d" % ENTRY_COUNT)
+    six.print_("  Read and decode: {:.2f} ms ({:.2f} us/entry)".format(elapsed * 1e3, elapsed * 1e6 / ENTRY_COUNT))
@@ -0,0 +1,57 @@
+"""
+Measures the lifecycle of the futures of the invocations: creating one, completing
+it and reading its result, with and without a callback or a continuation.
+"""
+import sys
+import timeit
+from os.path import dirname
+
+sys.path.append(dirname(dirname(__file__)))
+
+from hazelcast import six
+from hazelcast.future import Future
+
+NUMBER = 200000
+
+
+def measure(func):
+    return min(timeit.repeat(func, number=NUMBER, repeat=3)) / NUMBER
+
+
+def set_and_get():
+    f = Future()
+    f.set_result(1)
+    return f.result()
+
+
+def callback(_):
+    pass
+
+
+def with_callback():
+    f = Future()
+    f.add_done_callback(callback)
+    f.set_result(1)
+    return f.result()
+
+
+def continuation(f):
+    return f.result()
+
+
+def with_continuation():
+    f = Future()
+    continued = f.continue_with(continuation)
+    f.set_result(1)
+    return continued.result()
+
+
+if __name__ == '__main__':
+    cases = [
+        ("create", Future),
+        ("set and get result", set_and_get),
+        ("with a callback", with_callback),
+        ("with a continuation", with_continuation),
+    ]
+    for name, func in cases:
+        six.print_("{:<20} {:.2f} us".format(name, measure(func) * 1e6))
@@ -0,0 +1,52 @@
+"""
+Measures near cache hits with Data keys that cache their hash, against keys that
+rehash their buffer on every call as the Data keys used to.
+"""
+import sys
+import timeit
+from os.path import dirname
+
+sys.path.append(dirname(dirname(__file__)))
+
+from hazelcast import six
+from hazelcast.config import SerializationConfig, IN_MEMORY_FORMAT, EVICTION_POLICY
+from hazelcast.hash import murmur_hash3_x86_32
+from hazelcast.near_cache import NearCache
+from hazelcast.serialization.data import Data, DATA_OFFSET
+from hazelcast.serialization.service import SerializationServiceV1
+
+ENTRY_COUNT = 10000
+NUMBER = 10
+KEY_SIZES = [10, 100, 1000]
+
+
+class _RehashingData(Data):
+    def hash_code(self):
+        return murmur_hash3_x86_32(self._buffer, DATA_OFFSET, self.data_size())
+
+    def __hash__(self):
+        return self.hash_code()
+
+
+def measure(service, key_size, data_class):
+    near_cache = NearCache("default", service, IN_MEMORY_FORMAT.OBJECT, None, None, True,
+                           EVICTION_POLICY.NONE, ENTRY_COUNT)
+    keys = [data_class(service.to_data(("%d-" % i).ljust(key_size, "x")).to_bytes()) for i in range(ENTRY_COUNT)]
+    for key in keys:
+        near_cache[key] = "value"
+
+    def hits():
+        for key in keys:
+            near_cache[key]
+
+    return min(timeit.repeat(hits, number=NUMBER, repeat=3)) / (NUMBER * ENTRY_COUNT)
+
+
+if __name__ == '__main__':
+    service = SerializationServiceV1(SerializationConfig())
+    for key_size in KEY_SIZES:
+        rehashing = measure(service, key_size, _RehashingData)
+        cached = measure(service, key_size, Data)
+        six.print_("Key size: %d" % key_size)
+        six.print_("  Rehashing:   {:.2f} us/hit".format(rehashing * 1e6))
+        six.print_("  Cached hash: {:.2f} us/hit  speedup: {:.2f}x".format(cached * 1e6, rehashing / cached))
@@ -0,0 +1,46 @@
+"""
+Compares computing the partition ids of the keys one by one with computing them in a batch.
+The batch uses NumPy when it is installed.
+"""
+import sys
+import timeit
+from os.path import dirname
+
+sys.path.append(dirname(dirname(__file__)))
+
+from hazelcast import six
+from hazelcast import hash as hash_module
+from hazelcast.config import SerializationConfig
+from hazelcast.partition import _InternalPartitionService
+from hazelcast.serialization import SerializationServiceV1
+
+KEY_COUNT = 100000
+REPEAT = 5
+
+
+def measure():
+    service = SerializationServiceV1(SerializationConfig())
+    keys = [service.to_data("key-%d" % i) for i in range(KEY_COUNT)]
+    partition_service = _InternalPartitionService(None, {})
+    partition_service.partition_count = 271
+
+    def one_by_one():
+        return [partition_service.get_partition_id(key) for key in keys]
+
+    def batch():
+        return partition_service.get_partition_ids(keys)
+
+    assert one_by_one() == batch()
+
+    one_by_one_time = min(timeit.repeat(one_by_one, number=1, repeat=REPEAT))
+    batch_time = min(timeit.repeat(batch, number=1, repeat=REPEAT))
+    six.print_("Keys: %d, NumPy: %s" % (KEY_COUNT, hash_module.NUMPY_ENABLED))
+    six.print_("One by one: {:.3f} s".format(one_by_one_time))
+    six.print_("Batch:      {:.3f} s  speedup: {:.2f}x".format(batch_time, one_by_one_time / batch_time))
+
+
+if __name__ == '__main__':
+    measure()
+    if hash_module.NUMPY_ENABLED:
+        hash_module.NUMPY_ENABLED = False
+        measure()
@@ -0,0 +1,56 @@
+"""
+Measures writing and reading an array of 10k doubles with the item by item loop,
+with the bulk struct packing and, when NumPy is installed, with the NumPy arrays.
+"""
+import sys
+import timeit
+from os.path import dirname
+
+sys.path.append(dirname(dirname(__file__)))
+
+from hazelcast import six
+from hazelcast.serialization.input import _ObjectDataInput
+from hazelcast.serialization.output import _ObjectDataOutput
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+ITEM_COUNT = 10000
+NUMBER = 100
+VALUES = [i * 0.5 for i in range(ITEM_COUNT)]
+
+
+def per_item(values):
+    out = _ObjectDataOutput(1024, None)
+    out._write_array_fnc(values, out.write_double)
+    inp = _ObjectDataInput(out.to_byte_array())
+    inp._read_array_fnc(inp.read_double)
+
+
+def bulk(values):
+    out = _ObjectDataOutput(1024, None)
+    out.write_double_array(values)
+    inp = _ObjectDataInput(out.to_byte_array())
+    inp.read_double_array()
+
+
+def ndarray(values):
+    out = _ObjectDataOutput(1024, None, not numpy.little_endian)
+    out.write_double_array(values)
+    inp = _ObjectDataInput(out.to_byte_array(), 0, None, not numpy.little_endian)
+    inp.read_ndarray("d")
+
+
+def measure(name, func, values):
+    elapsed = min(timeit.repeat(lambda: func(values), number=NUMBER, repeat=3)) / NUMBER
+    six.print_("{:<10} {:.3f} ms".format(name, elapsed * 1e3))
+
+
+if __name__ == '__main__':
+    six.print_("Write and read %d doubles" % ITEM_COUNT)
+    measure("Per item", per_item, VALUES)
+    measure("Bulk", bulk, VALUES)
+    if numpy is not None:
+        measure("NumPy", ndarray, numpy.array(VALUES))
@@ -0,0 +1,107 @@
+"""
+Measures how the throughput of the reactor scales with the number of I/O threads.
+
+Each member is simulated by an echo server running in a separate process.
+The client keeps a connection per member and pipelines messages over them.
+The per-message work on the client side hashes the payload, which releases
+the GIL just like the socket I/O does.
+"""
+import hashlib
+import multiprocessing
+import socket
+import sys
+import threading
+import time
+from os.path import dirname
+
+sys.path.append(dirname(dirname(__file__)))
+
+from hazelcast import six
+from hazelcast.config import ClientNetworkConfig, ClientProperties
+from hazelcast.core import Address
+from hazelcast.protocol.builtin import ByteArrayCodec
+from hazelcast.protocol.client_message import OutboundMessage, create_initial_buffer, REQUEST_HEADER_SIZE
+from hazelcast.reactor import AsyncoreReactor
+
+MEMBER_COUNT = 8
+MESSAGES_PER_MEMBER = 2000
+PAYLOAD_SIZE = 64 * 1024
+HASH_ROUNDS = 8
+THREAD_COUNTS = [1, 2, 4, 8]
+
+
+def _echo(listener):
+    sock, _ = listener.accept()
+    sock.recv(3)  # protocol bytes
+    while True:
+        data = sock.recv(1 << 16)
+        if not data:
+            break
+        sock.sendall(data)
+
+
+def _start_member():
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    process = multiprocessing.Process(target=_echo, args=(listener,))
+    process.daemon = True
+    process.start()
+    return Address(*listener.getsockname()), process
+
+
+class _ConnectionManager(object):
+    live = True
+
+    def on_connection_close(self, connection, cause):
+        pass
+
+
+def measure(io_thread_count):
+    members = [_start_member() for _ in range(MEMBER_COUNT)]
+    reactor = AsyncoreReactor(ClientProperties({"hazelcast.client.io.thread.count": io_thread_count}), {})
+    reactor.start()
+
+    remaining = [MEMBER_COUNT * MESSAGES_PER_MEMBER]
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def on_message(message):
+        message.next_frame()
+        payload = ByteArrayCodec.decode(message)
+        for _ in range(HASH_ROUNDS):
+            hashlib.sha256(payload).digest()
+
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                done.set()
+
+    connections = [reactor.connection_factory(_ConnectionManager(), i, address, ClientNetworkConfig(), on_message)
+                   for i, (address, _) in enumerate(members)]
+
+    buf = create_initial_buffer(REQUEST_HEADER_SIZE, 0)
+    ByteArrayCodec.encode(buf, b"x" * PAYLOAD_SIZE, True)
+
+    start = time.time()
+    for _ in range(MESSAGES_PER_MEMBER):
+        for connection in connections:
+            connection.send_message(OutboundMessage(buf, False))
+    done.wait()
+    elapsed = time.time() - start
+
+    reactor.shutdown()
+    for _, process in members:
+        process.terminate()
+    return MEMBER_COUNT * MESSAGES_PER_MEMBER / elapsed
+
+
+if __name__ == '__main__':
+    baseline = None
+    six.print_("--------------------------------------------------------------------------------")
+    for count in THREAD_COUNTS:
+        throughput = measure(count)
+        baseline = baseline or throughput
+        six.print_("I/O threads: {:2d}  msg/s: {:10.0f}  speedup: {:.2f}x".format(count, throughput,
+                                                                                  throughput / baseline))
+    six.print_("--------------------------------------------------------------------------------")
@@ -0,0 +1,43 @@
+"""
+Measures building map get and put requests from the precompiled request templates,
+against encoding them with the codecs.
+"""
+import sys
+import timeit
+from os.path import dirname
+
+sys.path.append(dirname(dirname(__file__)))
+
+from hazelcast import six
+from hazelcast.config import SerializationConfig
+from hazelcast.protocol.codec import map_get_codec, map_put_codec
+from hazelcast.protocol.template import RequestTemplate
+from hazelcast.serialization.service import SerializationServiceV1
+
+NUMBER = 100000
+NAME = "benchmark-map"
+
+
+def measure(func):
+    return min(timeit.repeat(func, number=NUMBER, repeat=3)) / NUMBER
+
+
+if __name__ == '__main__':
+    service = SerializationServiceV1(SerializationConfig())
+    key = service.to_data("key-1")
+    value = service.to_data("value-1")
+    get_template = RequestTemplate(map_get_codec._REQUEST_MESSAGE_TYPE, NAME, "<q", True)
+    put_template = RequestTemplate(map_put_codec._REQUEST_MESSAGE_TYPE, NAME, "<qq", False)
+
+    cases = [
+        ("get", lambda: map_get_codec.encode_request(NAME, key, 1),
+         lambda: get_template.encode_request(key, None, 1)),
+        ("put", lambda: map_put_codec.encode_request(NAME, key, value, 1, -1),
+         lambda: put_template.encode_request(key, value, 1, -1)),
+    ]
+    for operation, codec, template in cases:
+        codec_time = measure(codec)
+        template_time = measure(template)
+        six.print_("Map %s request" % operation)
+        six.print_("  Codec:    {:.2f} us".format(codec_time * 1e6))
+        six.print_("  Template: {:.2f} us  speedup: {:.2f}x".format(template_time * 1e6, codec_time / template_time))
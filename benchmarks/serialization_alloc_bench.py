@@ -0,0 +1,60 @@
+"""
+Measures the time and the memory allocated by to_data and to_object for small objects,
+with the pooled data outputs and inputs and without them.
+"""
+import sys
+import timeit
+import tracemalloc
+from os.path import dirname
+
+sys.path.append(dirname(dirname(__file__)))
+
+from hazelcast import six
+from hazelcast.config import SerializationConfig
+from hazelcast.serialization.service import SerializationServiceV1, DEFAULT_MAX_POOLED_BUFFER_SIZE
+
+NUMBER = 100000
+VALUES = [
+    ("str", "key-12345"),
+    ("int", 12345),
+    ("float", 1.5),
+]
+
+
+def allocated_bytes(func, number):
+    tracemalloc.start()
+    try:
+        func()  # warm up the pools
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for _ in range(number):
+            func()
+        # the peak covers the short lived buffers that are already freed
+        return tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+
+def measure(max_pooled_buffer_size):
+    service = SerializationServiceV1(SerializationConfig(), max_pooled_buffer_size=max_pooled_buffer_size)
+    for name, value in VALUES:
+        data = service.to_data(value)
+
+        def to_data():
+            service.to_data(value)
+
+        def to_object():
+            service.to_object(data)
+
+        to_data_time = timeit.timeit(to_data, number=NUMBER)
+        to_object_time = timeit.timeit(to_object, number=NUMBER)
+        six.print_("{:6s} to_data: {:6.3f} us  peak alloc: {:6d} B   to_object: {:6.3f} us  peak alloc: {:6d} B".format(
+            name, to_data_time / NUMBER * 1e6, allocated_bytes(to_data, 1000),
+            to_object_time / NUMBER * 1e6, allocated_bytes(to_object, 1000)))
+
+
+if __name__ == '__main__':
+    six.print_("Without pooling")
+    measure(0)
+    six.print_("With pooling")
+    measure(DEFAULT_MAX_POOLED_BUFFER_SIZE)
@@ -0,0 +1,376 @@
+import asyncio
+import logging
+import socket
+import threading
+import time
+
+from collections import deque
+
+from hazelcast.config import ClientProperties
+from hazelcast.connection import Connection, create_ssl_context
+from hazelcast.core import Address
+from hazelcast.errors import HazelcastError
+from hazelcast.future import Future
+
+# BufferedProtocol lets the event loop receive directly into the buffer of
+# the reader. It is available in Python 3.7+, plain Protocol is used otherwise.
+_BaseProtocol = getattr(asyncio, "BufferedProtocol", asyncio.Protocol)
+
+_PROTOCOL_BYTES = b"CP2"
+
+
+class AsyncioReactor(object):
+    """
+    Reactor that runs the network I/O and the timers of the client on asyncio
+    event loops, each of which is driven by a dedicated thread.
+    """
+    _is_live = False
+    logger = logging.getLogger("HazelcastClient.AsyncioReactor")
+
+    def __init__(self, properties, logger_extras):
+        self._logger_extras = logger_extras
+        self._write_high_water_mark = properties.get_int(ClientProperties.IO_WRITE_QUEUE_HIGH_WATER_MARK_BYTES)
+        self._write_low_water_mark = properties.get_int(ClientProperties.IO_WRITE_QUEUE_LOW_WATER_MARK_BYTES)
+        self._max_frame_size = properties.get_int(ClientProperties.IO_MAX_FRAME_SIZE)
+        io_thread_count = max(properties.get_int(ClientProperties.IO_THREAD_COUNT), 1)
+        self._io_loops = [_EventLoopThread("hazelcast-reactor-io-%s" % i, logger_extras)
+                          for i in range(io_thread_count)]
+        self._timer_loop = _EventLoopThread("hazelcast-reactor-timer", logger_extras)
+        self._timers = set()
+        self._scheduled_timers = 0
+        self._expired_timers = 0
+        self._canceled_timers = 0
+        self._total_timer_lateness = 0.0
+        self._max_timer_lateness = 0.0
+
+    def start(self):
+        self._is_live = True
+        for io_loop in self._io_loops:
+            io_loop.start()
+        self._timer_loop.start(self._cleanup_all_timers)
+
+    def add_timer_absolute(self, timeout, callback):
+        return self.add_timer(timeout - time.time(), callback)
+
+    def add_timer(self, delay, callback):
+        loop = self._timer_loop.loop
+        timer = AsyncioTimer(loop, time.time() + delay, callback, self._cleanup_timer, self._run_timer)
+        self._timers.add(timer)
+        self._scheduled_timers += 1
+        try:
+            loop.call_soon_threadsafe(timer.schedule, max(delay, 0))
+        except RuntimeError:
+            # event loop is closed, the timer will never run
+            self._timers.discard(timer)
+        return timer
+
+    def get_timer_statistics(self):
+        """
+        Returns the statistics of the timers.
+
+        :return: (Dict), Dictionary that stores the number of pending, scheduled, expired and
+            canceled timers along with the average and maximum lateness of the expired timers in seconds.
+        """
+        expired = self._expired_timers
+        return {
+            "pending": len(self._timers),
+            "scheduled": self._scheduled_timers,
+            "expired": expired,
+            "canceled": self._canceled_timers,
+            "average_lateness": self._total_timer_lateness / expired if expired else 0.0,
+            "max_lateness": self._max_timer_lateness,
+        }
+
+    def shutdown(self):
+        if not self._is_live:
+            return
+
+        self._is_live = False
+
+        current_thread = threading.current_thread()
+        for io_loop in self._io_loops:
+            io_loop.stop(current_thread)
+        self._timer_loop.stop(current_thread)
+
+    def connection_factory(self, connection_manager, connection_id, address, network_config, message_callback):
+        # In the smart client mode, there is a connection per member. Assigning
+        # each new connection to the least loaded loop spreads the members
+        # evenly across the threads. A connection never moves to another loop,
+        # which preserves the order of its reads and writes.
+        io_loop = min(self._io_loops, key=lambda l: len(l.connections))
+        return AsyncioConnection(io_loop.loop, io_loop.connections, connection_manager, connection_id, address,
+                                 network_config, message_callback, self._write_high_water_mark,
+                                 self._write_low_water_mark, self._max_frame_size, self._logger_extras)
+
+    def _run_timer(self, timer):
+        # Called on the timer loop
+        self._timers.discard(timer)
+        lateness = time.time() - timer.end
+        self._expired_timers += 1
+        self._total_timer_lateness += lateness
+        if lateness > self._max_timer_lateness:
+            self._max_timer_lateness = lateness
+        timer.timer_ended_cb()
+
+    def _cleanup_timer(self, timer):
+        try:
+            self._timers.remove(timer)
+            self._canceled_timers += 1
+        except KeyError:
+            pass
+
+    def _cleanup_all_timers(self):
+        for timer in list(self._timers):
+            timer.timer_ended_cb()
+        self._timers.clear()
+
+
+class _EventLoopThread(object):
+    """
+    Runs an asyncio event loop in a dedicated thread.
+    """
+    _thread = None
+    logger = logging.getLogger("HazelcastClient.AsyncioReactor")
+
+    def __init__(self, name, logger_extras):
+        self._name = name
+        self._logger_extras = logger_extras
+        self.loop = asyncio.new_event_loop()
+        self.connections = set()
+
+    def start(self, on_exit=None):
+        self._thread = threading.Thread(target=self._run, args=(on_exit,), name=self._name)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self, on_exit):
+        self.logger.debug("Starting Reactor Thread %s", self._name, extra=self._logger_extras)
+        Future._threading_locals.is_reactor_thread = True
+        loop = self.loop
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        except:
+            self.logger.exception("Error in Reactor Thread", extra=self._logger_extras)
+        finally:
+            loop.close()
+        self.logger.debug("Reactor Thread %s exited.", self._name, extra=self._logger_extras)
+        if on_exit:
+            on_exit()
+
+    def stop(self, current_thread):
+        if self._thread is current_thread:
+            self._close_connections()
+        else:
+            self.loop.call_soon_threadsafe(self._close_connections)
+            self._thread.join()
+
+    def _close_connections(self):
+        for connection in list(self.connections):
+            connection.close(None, HazelcastError("Client is shutting down"))
+        self.connections.clear()
+        # Transports are closed on the next iteration and they release
+        # their sockets on the one after, stop the loop after that
+        self.loop.call_soon(self.loop.call_soon, self.loop.stop)
+
+
+class AsyncioConnection(Connection, _BaseProtocol):
+    def __init__(self, loop, connections, connection_manager, connection_id, address,
+                 network_config, message_callback, write_high_water_mark, write_low_water_mark, max_frame_size,
+                 logger_extras):
+        Connection.__init__(self, connection_manager, connection_id, message_callback, logger_extras,
+                            write_high_water_mark, write_low_water_mark, max_frame_size)
+        self.connected_address = address
+        self._loop = loop
+        self._connections = connections
+        self._transport = None
+        self._write_queue = deque()
+        self._flush_scheduled = False
+        self._writing_paused = False
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            # Connect synchronously, just like the asyncore reactor does, so that
+            # the connection errors are reported to the caller of the factory.
+            sock.settimeout(network_config.connection_timeout or None)
+
+            # set tcp no delay
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            for socket_option in network_config.socket_options:
+                if socket_option.option is socket.SO_RCVBUF:
+                    self._reader.buffer_size = socket_option.value
+
+                sock.setsockopt(socket_option.level, socket_option.option, socket_option.value)
+
+            sock.connect((address.host, address.port))
+            self.local_address = Address(*sock.getsockname())
+        except:
+            sock.close()
+            raise
+
+        ssl_context = None
+        server_hostname = None
+        ssl_config = network_config.ssl
+        if ssl_config.enabled:
+            ssl_context = create_ssl_context(ssl_config)
+            server_hostname = address.host
+
+        self._write_queue.append(_PROTOCOL_BYTES)
+        if self._write_high_water_mark > 0:
+            self._on_write_queued(len(_PROTOCOL_BYTES))
+        connections.add(self)
+        coroutine = loop.create_connection(lambda: self, sock=sock, ssl=ssl_context, server_hostname=server_hostname)
+        asyncio.run_coroutine_threadsafe(coroutine, loop).add_done_callback(self._on_connect)
+
+    def connection_made(self, transport):
+        self._transport = transport
+        self.start_time = time.time()
+        self.logger.debug("Connected to %s", self.connected_address, extra=self._logger_extras)
+        if not self.live:
+            # closed while the transport was being created
+            transport.close()
+            return
+
+        if self._write_high_water_mark > 0:
+            # Keep the messages in the write queue of the connection while the
+            # transport is busy, so that they are counted for the water marks.
+            transport.set_write_buffer_limits(self._write_high_water_mark, self._write_low_water_mark)
+
+        self._flush()
+
+    def pause_writing(self):
+        self._writing_paused = True
+
+    def resume_writing(self):
+        self._writing_paused = False
+        self._flush()
+
+    def get_buffer(self, size_hint):
+        return self._reader.get_buffer()
+
+    def buffer_updated(self, n):
+        reader = self._reader
+        reader.advance(n)
+        self.last_read_time = time.time()
+        reader.process()
+
+    def data_received(self, data):
+        # Used instead of the buffered protocol methods on Python < 3.7
+        reader = self._reader
+        reader.read(data)
+        self.last_read_time = time.time()
+        reader.process()
+
+    def connection_lost(self, exc):
+        self._connections.discard(self)
+        if self.live:
+            self.logger.warning("Connection closed by server", extra=self._logger_extras)
+            self.close(None, IOError(exc or "Connection closed by server"))
+
+    def _on_connect(self, future):
+        if future.cancelled():
+            self.close(None, IOError("Connection is canceled"))
+            return
+
+        error = future.exception()
+        if error:
+            self.close(None, IOError(error))
+
+    def _write(self, buffers):
+        self._write_queue.extend(buffers)
+        # Messages written until the flush runs on the
+        # event loop are sent together with a single call.
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            try:
+                self._loop.call_soon_threadsafe(self._flush)
+            except RuntimeError:
+                # event loop is closed
+                pass
+
+    def _flush(self):
+        # Should be called from the event loop thread.
+        # The flag is cleared before draining the queue, so that
+        # the messages added during the flush schedule a new one.
+        self._flush_scheduled = False
+        transport = self._transport
+        if transport is None or transport.is_closing() or self._writing_paused:
+            return
+
+        write_queue = self._write_queue
+        buffers = []
+        while True:
+            try:
+                buffers.append(write_queue.popleft())
+            except IndexError:
+                break
+
+        # A single fragment of the large messages is written after the queued
+        # messages. The next one is written on the next iteration of the loop,
+        # after the messages queued in the meantime.
+        fragment = self._next_fragment()
+        if fragment is not None:
+            buffers.extend(fragment)
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                self._loop.call_soon(self._flush)
+
+        if buffers:
+            # The selector transports of Python 3.12+ do not pause the protocol
+            # in writelines, so the last buffer is written with write, which does.
+            transport.writelines(buffers[:-1])
+            transport.write(buffers[-1])
+            self.last_write_time = time.time()
+            if self._write_high_water_mark > 0:
+                self._on_write_sent(sum(len(buf) for buf in buffers))
+
+    def _inner_close(self):
+        self._connections.discard(self)
+        transport = self._transport
+        if transport is None:
+            return
+
+        try:
+            self._loop.call_soon_threadsafe(transport.close)
+        except RuntimeError:
+            # event loop is closed
+            pass
+
+    def __repr__(self):
+        return "Connection(id=%s, live=%s, remote_address=%s)" % (self._id, self.live, self.remote_address)
+
+    def __str__(self):
+        return self.__repr__()
+
+
+class AsyncioTimer(object):
+    __slots__ = ("_loop", "_handle", "end", "timer_ended_cb", "timer_canceled_cb", "_timer_expired_cb", "canceled")
+
+    def __init__(self, loop, end, timer_ended_cb, timer_canceled_cb, timer_expired_cb):
+        self._loop = loop
+        self._handle = None
+        self.end = end
+        self.timer_ended_cb = timer_ended_cb
+        self.timer_canceled_cb = timer_canceled_cb
+        self._timer_expired_cb = timer_expired_cb
+        self.canceled = False
+
+    def schedule(self, delay):
+        if not self.canceled:
+            self._handle = self._loop.call_later(delay, self._run)
+
+    def cancel(self):
+        self.canceled = True
+        self.timer_canceled_cb(self)
+        handle = self._handle
+        if handle:
+            try:
+                self._loop.call_soon_threadsafe(handle.cancel)
+            except RuntimeError:
+                # event loop is closed
+                pass
+
+    def _run(self):
+        if not self.canceled:
+            self._timer_expired_cb(self)
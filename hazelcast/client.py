@@ -5,7 +5,7 @@ import json
 import threading
 
 from hazelcast.cluster import ClusterService, RoundRobinLB, _InternalClusterService
-from hazelcast.config import ClientConfig, ClientProperties
+from hazelcast.config import ClientConfig, ClientProperties, REACTOR_TYPE
 from hazelcast.connection import ConnectionManager, DefaultAddressProvider
 from hazelcast.core import DistributedObjectInfo, DistributedObjectEvent
 from hazelcast.invocation import InvocationService, Invocation
@@ -19,7 +19,6 @@ from hazelcast.proxy import ProxyManager, MAP_SERVICE, QUEUE_SERVICE, LIST_SERVI
     TOPIC_SERVICE, RELIABLE_TOPIC_SERVICE, \
     EXECUTOR_SERVICE, PN_COUNTER_SERVICE, FLAKE_ID_GENERATOR_SERVICE
 from hazelcast.near_cache import NearCacheManager
-from hazelcast.reactor import AsyncoreReactor
 from hazelcast.serialization import SerializationServiceV1
 from hazelcast.statistics import Statistics
 from hazelcast.transaction import TWO_PHASE, TransactionManager
@@ -27,6 +26,18 @@ from hazelcast.util import AtomicInteger, DEFAULT_LOGGING
 from hazelcast.discovery import HazelcastCloudAddressProvider, HazelcastCloudDiscovery
 from hazelcast.errors import IllegalStateError
 
+try:
+    from hazelcast.reactor import AsyncoreReactor
+except ImportError:
+    # asyncore is removed in Python 3.12
+    AsyncoreReactor = None
+
+try:
+    from hazelcast.asyncio_reactor import AsyncioReactor
+except ImportError:
+    # Python 2 does not ship with the asyncio module
+    AsyncioReactor = None
+
 
 class HazelcastClient(object):
     """
@@ -43,7 +54,7 @@ class HazelcastClient(object):
         self.name = self._create_client_name()
         self._init_logger()
         self._logger_extras = {"client_name": self.name, "cluster_name": self.config.cluster_name}
-        self._reactor = AsyncoreReactor(self._logger_extras)
+        self._reactor = self._create_reactor()
         self._serialization_service = SerializationServiceV1(serialization_config=self.config.serialization)
         self._near_cache_manager = NearCacheManager(self, self._serialization_service)
         self._internal_lifecycle_service = _InternalLifecycleService(self, self._logger_extras)
@@ -305,6 +316,14 @@ class HazelcastClient(object):
                 self._reactor.shutdown()
                 self._internal_lifecycle_service.fire_lifecycle_event(LifecycleState.SHUTDOWN)
 
+    def _create_reactor(self):
+        reactor_type = self.config.network.reactor_type
+        if reactor_type == REACTOR_TYPE.ASYNCIO or not AsyncoreReactor:
+            if not AsyncioReactor:
+                raise IllegalStateError("Asyncio reactor requires Python 3.4+")
+            return AsyncioReactor(self.properties, self._logger_extras)
+        return AsyncoreReactor(self.properties, self._logger_extras)
+
     def _create_address_provider(self):
         network_config = self.config.network
         address_list_provided = len(network_config.addresses) != 0
@@ -56,6 +56,15 @@ SSL protocol options.
 * TLSv1_3 requires at least Python 2.7.15 or Python 3.7 build with OpenSSL 1.1.1+
 """
 
+COMPRESSION_ALGORITHM = enum(NONE=0, ZLIB=1, LZMA=2)
+"""
+Compression algorithm options of the serialized values.
+
+* NONE : Values are not compressed
+* ZLIB : Values are compressed with zlib, fast with a moderate compression ratio
+* LZMA : Values are compressed with LZMA, slow with a high compression ratio. Requires Python 3
+"""
+
 QUERY_CONSTANTS = enum(KEY_ATTRIBUTE_NAME="__key", THIS_ATTRIBUTE_NAME="this")
 """
 Contains constants for Query.
@@ -84,6 +93,14 @@ Type of the index.
 * BITMAP : Bitmap index. Can be used with equality predicates.
 """
 
+REACTOR_TYPE = enum(ASYNCORE=0, ASYNCIO=1)
+"""
+Type of the reactor which drives the network I/O and the timers of the client.
+
+* ASYNCORE : Reactor based on the asyncore module. Falls back to ASYNCIO on Pythons that do not ship asyncore anymore.
+* ASYNCIO  : Reactor based on an asyncio event loop. Requires Python 3.4+
+"""
+
 _DEFAULT_CLUSTER_NAME = "dev"
 
 _DEFAULT_MAX_ENTRY_COUNT = 10000
@@ -274,6 +291,11 @@ class ClientNetworkConfig(object):
         self.cloud = ClientCloudConfig()
         """Hazelcast Cloud configuration to let the client connect the cluster via Hazelcast.cloud"""
 
+        self.reactor_type = REACTOR_TYPE.ASYNCORE
+        """
+        Type of the reactor used for the network I/O. See :const:`REACTOR_TYPE` for the options.
+        """
+
 
 class SocketOption(object):
     """
@@ -346,6 +368,56 @@ class SerializationConfig(object):
         One of the values of :const:`INTEGER_TYPE` can be assigned. Please see :const:`INTEGER_TYPE` documentation for details of the options.
         """
 
+        self.use_numpy_arrays = False
+        """
+        When set to ``true``, one dimensional NumPy arrays of booleans, 16, 32 and 64 bit integers and 32 and 64 bit
+        floats are serialized as the Java primitive arrays of the same type, and the primitive arrays are
+        deserialized as NumPy arrays. The arrays are read without copying when the byte order of the serialization is
+        the native one; such arrays are read-only. Requires NumPy to be installed.
+        """
+
+        self.use_binary_pickle = False
+        """
+        When set to ``true``, the objects without a serializer are pickled with the highest protocol of the Python
+        version and written as bytes, instead of the text based protocol 0. It is several times smaller and faster.
+        With protocol 5, large buffers such as the ones of NumPy arrays are written out-of-band, without copying them
+        into the pickle. The buffers of the objects passed to the operations directly are not copied at all, they are
+        written to the socket as they are, so such objects must not be modified until the operation completes. Objects
+        pickled in either format are readable regardless of this setting, but the clients that read the objects must
+        support the protocol they are written with.
+        """
+
+        self.compression_algorithm = COMPRESSION_ALGORITHM.NONE
+        """
+        Algorithm the serialized values are compressed with. One of the values of :const:`COMPRESSION_ALGORITHM`
+        can be assigned. Only the values stored in the maps are compressed. Compressed values are only readable by the
+        Python clients, so the server cannot query or process them. Keys, predicates, entry processors and the other
+        objects sent to the server are never compressed. Compressed values are readable regardless of this setting.
+        """
+
+        self.compression_threshold = 1024
+        """
+        Minimum serialized size of a value in bytes, for the value to be compressed.
+        """
+
+        self.compression_policy = {}
+        """
+        Dictionary of type : bool pairs, deciding whether the values of a type are compressed. The values of the types
+        which are not in the dictionary are compressed.
+
+        Example:
+
+            >>> serialization_config.compression_policy[bytearray] = False
+        """
+
+        self.key_cache_max_size = 0
+        """
+        Maximum number of keys kept in the cache of serialized keys. The string, bytes, integer and boolean keys
+        of the map operations are served from the cache together with their partition hash, which removes most of the
+        per call key overhead of workloads that use the same keys repeatedly. The least recently used keys are evicted
+        when the cache is full. Non-positive values disable the cache.
+        """
+
         self._global_serializer = None
         self._custom_serializers = {}
 
@@ -932,8 +1004,11 @@ class ClientProperties(object):
     
     Time passed since invocation started is compared with this property.
     If the time is already passed, then the exception is delegated to the user. If not, the invocation is retried.
-    Note that, if invocation gets no exception and it is a long running one, then it will not get any exception,
-    no matter how small this timeout is set.
+    Also, the invocations that do not receive a response within this time are failed with
+    :class:`~hazelcast.errors.HazelcastTimeoutError`. The pending invocations are checked once a second,
+    so the failure may be reported up to a second later. Blocking operations get the time they may wait
+    on the member on top of this timeout, and the ones that may wait indefinitely, such as ``Queue.take``
+    and ``Map.lock``, are never failed this way.
     """
 
     INVOCATION_RETRY_PAUSE_MILLIS = ClientProperty("hazelcast.client.invocation.retry.pause.millis", 1000,
@@ -964,6 +1039,81 @@ class ClientProperties(object):
     in the given order.
     """
 
+    IO_WRITE_COALESCING_MAX_BYTES = ClientProperty("hazelcast.client.io.write.coalescing.max.bytes", 128000)
+    """
+    Maximum number of bytes taken from the outbound queue of a connection and written to the
+    socket with a single vectored send call.
+    """
+
+    IO_WRITE_COALESCING_MAX_MESSAGES = ClientProperty("hazelcast.client.io.write.coalescing.max.messages", 64)
+    """
+    Maximum number of queued messages written to the socket of a connection with a single
+    vectored send call. Setting it to ``1`` disables write coalescing.
+    """
+
+    IO_THREAD_COUNT = ClientProperty("hazelcast.client.io.thread.count", 1)
+    """
+    Number of threads that serve the I/O of the connections. Each connection is assigned
+    to one of the threads, which handles all of its reads, writes and the response
+    decoding. Timers are always run on a separate, dedicated thread.
+    """
+
+    MAX_CONCURRENT_INVOCATIONS = ClientProperty("hazelcast.client.max.concurrent.invocations", -1)
+    """
+    Maximum number of invocations that can be in flight at the same time. When the limit is reached,
+    new invocations wait for a free slot up to the backoff timeout given by the
+    ``hazelcast.client.invocation.backoff.timeout.millis`` property and fail with
+    :class:`~hazelcast.errors.HazelcastOverloadError` after that. The limit does not apply to the
+    internal, urgent invocations such as heartbeats. Non-positive values disable the limit.
+    """
+
+    INVOCATION_BACKOFF_TIMEOUT_MILLIS = ClientProperty("hazelcast.client.invocation.backoff.timeout.millis", -1,
+                                                       TimeUnit.MILLISECOND)
+    """
+    Maximum time in milliseconds an invocation waits for a free slot when the maximum number of concurrent
+    invocations is reached, or for the outbound queue of its connection to drain below the low water mark.
+    When it is not positive, the invocation fails with :class:`~hazelcast.errors.HazelcastOverloadError`
+    right away. Invocations made from the reactor threads, such as the ones made in the callbacks of futures,
+    never wait, since the slots are freed on those threads.
+    """
+
+    IO_WRITE_QUEUE_HIGH_WATER_MARK_BYTES = ClientProperty("hazelcast.client.io.write.queue.high.water.mark.bytes",
+                                                          -1)
+    """
+    Number of bytes waiting in the outbound queue of a connection after which the connection stops accepting
+    new invocations until the queue drains below the low water mark. Non-positive values disable the water marks.
+    """
+
+    IO_WRITE_QUEUE_LOW_WATER_MARK_BYTES = ClientProperty("hazelcast.client.io.write.queue.low.water.mark.bytes", -1)
+    """
+    Number of bytes waiting in the outbound queue of a connection below which a connection that reached the
+    high water mark accepts new invocations again. When it is not positive or not less than the high water mark,
+    half of the high water mark is used.
+    """
+
+    IO_MAX_FRAME_SIZE = ClientProperty("hazelcast.client.io.max.frame.size", -1)
+    """
+    Maximum size in bytes of the frames written to a connection in one piece. Messages larger than this, such as the
+    large ``put_all`` requests, are sent in fragments of about this size. The fragments are interleaved with the other
+    messages, so that those are not delayed until the large messages are written completely. Hence, the messages sent
+    after a large message may be received before it. Non-positive values disable the fragmentation.
+    """
+
+    RESPONSE_THREAD_COUNT = ClientProperty("hazelcast.client.response.thread.count", 0)
+    """
+    Number of threads that decode the responses of the invocations and run their callbacks. When it is not positive,
+    this is done on the reactor threads, which delays the reads of all the connections of a thread while a callback
+    runs. The response and all the callbacks of an invocation are run by the same thread, one after the other. The
+    responses of the invocations on the same partition are completed in the order they are received.
+    """
+
+    RESPONSE_INLINE_MAX_SIZE_BYTES = ClientProperty("hazelcast.client.response.inline.max.size.bytes", -1)
+    """
+    Responses up to this size are completed on the reactor threads, even when there are response threads, if there
+    are no callbacks waiting for them. Handing them over to the response threads costs more than decoding them.
+    Negative values disable it.
+    """
+
     def __init__(self, properties):
         self._properties = properties
 
@@ -997,6 +1147,20 @@ class ClientProperties(object):
             return value
         return value.lower() == "true"
 
+    def get_int(self, property):
+        """
+        Gets the value of the given property as integer. If the value of the given property is not a number,
+        throws ValueError.
+
+        :param property: (:class:`~hazelcast.config.ClientProperty`), Property to get value from
+        :return: (int), Value of the given property
+        """
+        value = self.get(property)
+        if isinstance(value, bool):
+            # bool is a subclass of int. Don't let booleans to be used as integers.
+            raise TypeError
+        return int(value)
+
     def get_seconds(self, property):
         """
         Gets the value of the given property in seconds. If the value of the given property is not a number,
@@ -1,27 +1,32 @@
+import itertools
 import logging
 import random
 import struct
 import sys
 import threading
 import time
-import io
 import uuid
-from collections import OrderedDict
+from collections import OrderedDict, deque
 
-from hazelcast.config import RECONNECT_MODE
+from hazelcast.config import RECONNECT_MODE, PROTOCOL
 from hazelcast.core import AddressHelper
 from hazelcast.errors import AuthenticationError, TargetDisconnectedError, HazelcastClientNotActiveError, \
     InvalidConfigurationError, ClientNotAllowedInClusterError, IllegalStateError, ClientOfflineError
 from hazelcast.future import ImmediateFuture, ImmediateExceptionFuture
 from hazelcast.invocation import Invocation
 from hazelcast.lifecycle import LifecycleState
-from hazelcast.protocol.client_message import SIZE_OF_FRAME_LENGTH_AND_FLAGS, Frame, InboundMessage, \
+from hazelcast.protocol.client_message import SIZE_OF_FRAME_LENGTH_AND_FLAGS, _IS_FINAL_FLAG, InboundMessage, \
     ClientMessageBuilder
 from hazelcast.protocol.codec import client_authentication_codec, client_ping_codec
 from hazelcast.util import AtomicInteger, calculate_version, UNKNOWN_VERSION, enum
 from hazelcast.version import CLIENT_TYPE, CLIENT_VERSION, SERIALIZATION_VERSION
 from hazelcast import six
 
+try:
+    import ssl
+except ImportError:
+    ssl = None
+
 
 class _WaitStrategy(object):
     logger = logging.getLogger("HazelcastClient.WaitStrategy")
@@ -545,21 +550,68 @@ class _HeartbeatManager(object):
 
 _frame_header = struct.Struct('<iH')
 
+# ids of the fragments of the outbound messages, shared by the connections
+_fragmentation_ids = itertools.count(1)
+
+_READ_BUFFER_SIZE = 128000
+
 
 class _Reader(object):
-    def __init__(self, builder):
-        self._buf = io.BytesIO()
+    """
+    Reads frames from a preallocated buffer that the socket receives into
+    directly.
+
+    Frames are recorded in the messages as offsets into the buffer, so the
+    buffer is never overwritten. Once it is full, the complete frames are
+    consumed, a new buffer is allocated, and only the bytes of the partially
+    received frame are copied into it. The old buffer is released with the
+    last frame that uses it.
+    """
+
+    def __init__(self, builder, buffer_size=_READ_BUFFER_SIZE):
+        self.buffer_size = buffer_size
         self._builder = builder
+        self._buf = bytearray(buffer_size)
+        self._view = memoryview(self._buf)
         self._bytes_read = 0
         self._bytes_written = 0
         self._frame_size = 0
         self._frame_flags = 0
         self._message = None
+        # messages consumed before reallocating the buffer, not processed yet
+        self._completed_messages = deque()
+
+    def get_buffer(self):
+        """
+        Returns a writable view over the free space of the buffer
+        to be filled with ``recv_into``. :func:`advance` must be
+        called with the number of bytes written to it.
+
+        :return: (memoryview), free space of the buffer.
+        """
+        if self._frame_size == 0 and self.length >= SIZE_OF_FRAME_LENGTH_AND_FLAGS:
+            # Learn the size of the pending frame, so that the
+            # new buffer can be allocated large enough to hold it.
+            self._read_frame_size_and_flags()
+
+        free = len(self._buf) - self._bytes_written
+        if free == 0 or (self._frame_size != 0 and free < self._remaining_frame_bytes()):
+            # Move the pending frame to a new buffer while it is still
+            # small, so that it does not cross the buffer boundary.
+            self._allocate(self.buffer_size)
+        return self._view[self._bytes_written:]
+
+    def advance(self, n):
+        self._bytes_written += n
 
     def read(self, data):
-        self._buf.seek(self._bytes_written)
-        self._buf.write(data)
-        self._bytes_written += len(data)
+        n = len(data)
+        if n > len(self._buf) - self._bytes_written:
+            self._allocate(n)
+
+        offset = self._bytes_written
+        self._view[offset:offset + n] = data
+        self._bytes_written += n
 
     def process(self):
         message = self._read_message()
@@ -568,53 +620,70 @@ class _Reader(object):
             message = self._read_message()
 
     def _read_message(self):
+        if self._completed_messages:
+            return self._completed_messages.popleft()
+        return self._read_message_from_buffer()
+
+    def _read_message_from_buffer(self):
         while True:
             if self._read_frame():
-                if self._message.end_frame.is_final_frame():
+                if self._frame_flags & _IS_FINAL_FLAG:
                     msg = self._message
-                    self._reset()
+                    self._message = None
                     return msg
             else:
                 return None
 
     def _read_frame(self):
-        n = self.length
-        if n < SIZE_OF_FRAME_LENGTH_AND_FLAGS:
-            # we don't have even the frame length and flags ready
-            return False
-
         if self._frame_size == 0:
+            if self.length < SIZE_OF_FRAME_LENGTH_AND_FLAGS:
+                # we don't have even the frame length and flags ready
+                return False
+
             self._read_frame_size_and_flags()
 
-        if n < self._frame_size:
+        size = self._frame_size - SIZE_OF_FRAME_LENGTH_AND_FLAGS
+        if self.length < size:
             return False
 
-        self._buf.seek(self._bytes_read)
-        size = self._frame_size - SIZE_OF_FRAME_LENGTH_AND_FLAGS
-        data = self._buf.read(size)
+        start = self._bytes_read
         self._bytes_read += size
         self._frame_size = 0
         # No need to reset flags since it will be overwritten on the next read_frame_size_and_flags call
-        frame = Frame(data, self._frame_flags)
         if not self._message:
-            self._message = InboundMessage(frame)
-        else:
-            self._message.add_frame(frame)
+            self._message = InboundMessage()
+        self._message.append_frame(self._buf, start, size, self._frame_flags)
         return True
 
     def _read_frame_size_and_flags(self):
-        self._buf.seek(self._bytes_read)
-        header_data = self._buf.read(SIZE_OF_FRAME_LENGTH_AND_FLAGS)
-        self._frame_size, self._frame_flags = _frame_header.unpack_from(header_data, 0)
+        self._frame_size, self._frame_flags = _frame_header.unpack_from(self._buf, self._bytes_read)
         self._bytes_read += SIZE_OF_FRAME_LENGTH_AND_FLAGS
 
-    def _reset(self):
-        if self._bytes_written == self._bytes_read:
-            self._buf.seek(0)
-            self._buf.truncate()
-            self._bytes_written = 0
-            self._bytes_read = 0
-        self._message = None
+    def _remaining_frame_bytes(self):
+        # Bytes of the current frame which are not received yet.
+        # The frame size and flags are already consumed.
+        return self._frame_size - SIZE_OF_FRAME_LENGTH_AND_FLAGS - self.length
+
+    def _allocate(self, extra):
+        # Consume the complete frames first, so that they are not copied
+        completed_messages = self._completed_messages
+        message = self._read_message_from_buffer()
+        while message:
+            completed_messages.append(message)
+            message = self._read_message_from_buffer()
+
+        pending = self.length
+        needed = pending + extra
+        if self._frame_size != 0:
+            needed = max(needed, self._frame_size - SIZE_OF_FRAME_LENGTH_AND_FLAGS)
+
+        buf = bytearray(max(self.buffer_size, needed))
+        view = memoryview(buf)
+        view[:pending] = self._view[self._bytes_read:self._bytes_written]
+        self._buf = buf
+        self._view = view
+        self._bytes_read = 0
+        self._bytes_written = pending
 
     @property
     def length(self):
@@ -626,7 +695,8 @@ class Connection(object):
     Connection object which stores connection related information and operations.
     """
 
-    def __init__(self, connection_manager, connection_id, message_callback, logger_extras=None):
+    def __init__(self, connection_manager, connection_id, message_callback, logger_extras=None,
+                 write_high_water_mark=-1, write_low_water_mark=-1, max_frame_size=-1):
         self.remote_address = None
         self.remote_uuid = None
         self.connected_address = None
@@ -645,6 +715,25 @@ class Connection(object):
         self._builder = ClientMessageBuilder(message_callback)
         self._reader = _Reader(self._builder)
 
+        if write_high_water_mark > 0 and not 0 < write_low_water_mark < write_high_water_mark:
+            write_low_water_mark = write_high_water_mark // 2
+        self._write_high_water_mark = write_high_water_mark
+        self._write_low_water_mark = write_low_water_mark
+        self._write_queue_full = False
+        self._pending_write_bytes = 0
+        self._write_condition = threading.Condition()
+        self._max_frame_size = max_frame_size
+        # deque of the fragments of each message that is sent in fragments
+        self._fragmented_messages = deque()
+
+    @property
+    def pending_write_bytes(self):
+        """
+        Number of bytes waiting to be written to the socket. It is only tracked when the
+        write queue water marks are enabled.
+        """
+        return self._pending_write_bytes
+
     def send_message(self, message):
         """
         Sends a message to this connection.
@@ -655,9 +744,46 @@ class Connection(object):
         if not self.live:
             return False
 
-        self._write(message.buf)
+        max_frame_size = self._max_frame_size
+        if max_frame_size > 0 and message.size() > max_frame_size:
+            fragments = message.get_fragments(max_frame_size, next(_fragmentation_ids))
+            if len(fragments) > 1:
+                if self._write_high_water_mark > 0:
+                    self._on_write_queued(sum(len(buf) for fragment in fragments for buf in fragment))
+                # the fragments are written in between the other messages
+                self._fragmented_messages.append(deque(fragments))
+                self._write([])
+                return True
+
+        # large payloads are not part of the message buffer,
+        # the message is written as a sequence of buffers
+        buffers = message.get_buffers()
+        if self._write_high_water_mark > 0:
+            self._on_write_queued(message.size())
+
+        self._write(buffers)
         return True
 
+    def wait_until_writable(self, timeout):
+        """
+        Waits until the outbound queue of this connection drains below the low water mark,
+        if it has reached the high water mark.
+
+        :param timeout: (float), maximum time to wait in seconds. Non-positive values do not wait at all.
+        :return: (bool), ``True`` if the connection accepts new messages, ``False`` otherwise.
+        """
+        if not self._write_queue_full:
+            return True
+
+        end = time.time() + timeout
+        with self._write_condition:
+            while self._write_queue_full and self.live:
+                remaining = end - time.time()
+                if remaining <= 0:
+                    return False
+                self._write_condition.wait(remaining)
+            return True
+
     def close(self, reason, cause):
         """
         Closes the connection.
@@ -669,6 +795,11 @@ class Connection(object):
             return
 
         self.live = False
+        if self._write_high_water_mark > 0:
+            with self._write_condition:
+                # wake up the waiters, they will find out that the connection is closed
+                self._write_condition.notify_all()
+
         self._log_close(reason, cause)
         try:
             self._inner_close()
@@ -690,10 +821,47 @@ class Connection(object):
         else:
             self.logger.debug(msg % (self, r), extra=self._logger_extras)
 
+    def _on_write_queued(self, size):
+        # Should be called for the bytes queued for writing, only
+        # when the water marks are enabled.
+        with self._write_condition:
+            self._pending_write_bytes += size
+            if self._pending_write_bytes >= self._write_high_water_mark:
+                self._write_queue_full = True
+
+    def _on_write_sent(self, size):
+        # Should be called by the implementations for the bytes
+        # written to the socket.
+        if self._write_high_water_mark <= 0:
+            return
+
+        with self._write_condition:
+            self._pending_write_bytes -= size
+            if self._write_queue_full and self._pending_write_bytes <= self._write_low_water_mark:
+                self._write_queue_full = False
+                self._write_condition.notify_all()
+
+    def _next_fragment(self):
+        # Returns the buffers of the next fragment to write, taking turns between
+        # the fragmented messages, or None if there is none. Should be called by
+        # the implementations from the thread that writes to the socket.
+        fragmented_messages = self._fragmented_messages
+        try:
+            fragments = fragmented_messages.popleft()
+        except IndexError:
+            return None
+
+        fragment = fragments.popleft()
+        if fragments:
+            fragmented_messages.append(fragments)
+        return fragment
+
     def _inner_close(self):
         raise NotImplementedError()
 
-    def _write(self, buf):
+    def _write(self, buffers):
+        # Should queue the buffers of a message together,
+        # so that they are not interleaved with the other messages.
         raise NotImplementedError()
 
     def __eq__(self, other):
@@ -706,6 +874,50 @@ class Connection(object):
         return self._id
 
 
+def create_ssl_context(ssl_config):
+    """
+    Creates an SSL context for the client connections from the given configuration.
+
+    :param ssl_config: (SSLConfig), the SSL configuration of the client.
+    :return: (ssl.SSLContext), the SSL context.
+    """
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_SSLv23)
+
+    protocol = ssl_config.protocol
+
+    # Use only the configured protocol
+    try:
+        if protocol != PROTOCOL.SSLv2:
+            ssl_context.options |= ssl.OP_NO_SSLv2
+        if protocol != PROTOCOL.SSLv3 and protocol != PROTOCOL.SSL:
+            ssl_context.options |= ssl.OP_NO_SSLv3
+        if protocol != PROTOCOL.TLSv1:
+            ssl_context.options |= ssl.OP_NO_TLSv1
+        if protocol != PROTOCOL.TLSv1_1:
+            ssl_context.options |= ssl.OP_NO_TLSv1_1
+        if protocol != PROTOCOL.TLSv1_2 and protocol != PROTOCOL.TLS:
+            ssl_context.options |= ssl.OP_NO_TLSv1_2
+        if protocol != PROTOCOL.TLSv1_3:
+            ssl_context.options |= ssl.OP_NO_TLSv1_3
+    except AttributeError:
+        pass
+
+    ssl_context.verify_mode = ssl.CERT_REQUIRED
+
+    if ssl_config.cafile:
+        ssl_context.load_verify_locations(ssl_config.cafile)
+    else:
+        ssl_context.load_default_certs()
+
+    if ssl_config.certfile:
+        ssl_context.load_cert_chain(ssl_config.certfile, ssl_config.keyfile, ssl_config.password)
+
+    if ssl_config.ciphers:
+        ssl_context.set_ciphers(ssl_config.ciphers)
+
+    return ssl_context
+
+
 class DefaultAddressProvider(object):
     """
     Provides initial addresses for client to find and connect to a node.
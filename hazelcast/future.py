@@ -5,22 +5,37 @@ import threading
 from hazelcast.util import AtomicInteger
 from hazelcast import six
 
+try:
+    import asyncio
+except ImportError:
+    # Python 2 does not ship with the asyncio module.
+    # Futures are not awaitable in that case.
+    asyncio = None
+
 NONE_RESULT = object()
 
 
+# Guards only the lazy creation of the locks of the futures.
+_lock_creation_lock = threading.Lock()
+
+
 class Future(object):
     """
     Future is used for representing an asynchronous computation result.
     """
-    _result = None
-    _exception = None
-    _traceback = None
+    __slots__ = ("_result", "_exception", "_traceback", "_done", "_callbacks", "_lock", "_waiter")
     _threading_locals = threading.local()
     logger = logging.getLogger("HazelcastClient.Future")
 
     def __init__(self):
-        self._callbacks = []
-        self._event = _Event()
+        self._result = None
+        self._exception = None
+        self._traceback = None
+        self._done = False
+        self._callbacks = None  # created when the first callback is added
+        # created when a callback is added or a thread has to wait before the completion
+        self._lock = None
+        self._waiter = None  # created when the first thread has to wait for the result
 
     def set_result(self, result):
         """
@@ -29,11 +44,9 @@ class Future(object):
         :param result: Result of the Future.
         """
         if result is None:
-            self._result = NONE_RESULT
-        else:
-            self._result = result
-        self._event.set()
-        self._invoke_callbacks()
+            result = NONE_RESULT
+        self._result = result
+        self._complete()
 
     def set_exception(self, exception, traceback=None):
         """
@@ -46,8 +59,33 @@ class Future(object):
             raise RuntimeError("Exception must be of BaseException type")
         self._exception = exception
         self._traceback = traceback
-        self._event.set()
-        self._invoke_callbacks()
+        self._complete()
+
+    def _complete(self):
+        # Should be called after setting the result or the exception.
+        # The threads adding callbacks or waiting create the lock before
+        # checking whether the future is done, so if there is no lock
+        # yet, the ones that come later will find the future done.
+        self._done = True
+        lock = self._lock
+        if lock is None:
+            return
+        with lock:
+            if self._waiter is not None:
+                self._waiter.notify_all()
+            callbacks = self._callbacks
+            self._callbacks = None
+        if callbacks:
+            self._invoke_callbacks(callbacks)
+
+    def _get_lock(self):
+        lock = self._lock
+        if lock is None:
+            with _lock_creation_lock:
+                lock = self._lock
+                if lock is None:
+                    lock = self._lock = threading.Lock()
+        return lock
 
     def result(self):
         """
@@ -55,8 +93,8 @@ class Future(object):
 
         :return: Result of the Future.
         """
-        self._reactor_check()
-        self._event.wait()
+        if not self._done:
+            self._wait()
         if self._exception:
             six.reraise(self._exception.__class__, self._exception, self._traceback)
         if self._result == NONE_RESULT:
@@ -64,6 +102,18 @@ class Future(object):
         else:
             return self._result
 
+    def _wait(self):
+        self._reactor_check()
+        lock = self._get_lock()
+        with lock:
+            if self._done:
+                return
+            waiter = self._waiter
+            if waiter is None:
+                waiter = self._waiter = threading.Condition(lock)
+            while not self._done:
+                waiter.wait()
+
     def _reactor_check(self):
         if not self.done() and hasattr(self._threading_locals, 'is_reactor_thread'):
             raise RuntimeError(
@@ -82,7 +132,7 @@ class Future(object):
 
         :return: (bool), ``true`` if the result is computed, ``false`` otherwise.
         """
-        return self._event.is_set()
+        return self._done
 
     def running(self):
         """
@@ -90,38 +140,40 @@ class Future(object):
 
         :return: (bool), ``true`` if the  result is being computed, ``false`` otherwise.
         """
-        return not self.done()
+        return not self._done
 
     def exception(self):
         """
         Throws exception.
         :return: (Exception), exception of this Future.
         """
-        self._reactor_check()
-        self._event.wait()
+        if not self._done:
+            self._wait()
         return self._exception
 
     def traceback(self):
         """
         Traceback function for the Future.
         """
-        self._reactor_check()
-        self._event.wait()
+        if not self._done:
+            self._wait()
         return self._traceback
 
     def add_done_callback(self, callback):
-        run_callback = False
-        with self._event.condition:
-            if self.done():
-                run_callback = True
-            else:
-                self._callbacks.append(callback)
+        if not self._done:
+            with self._get_lock():
+                if not self._done:
+                    callbacks = self._callbacks
+                    if callbacks is None:
+                        self._callbacks = [callback]
+                    else:
+                        callbacks.append(callback)
+                    return
 
-        if run_callback:
-            self._invoke_cb(callback)
+        self._invoke_cb(callback)
 
-    def _invoke_callbacks(self):
-        for callback in self._callbacks:
+    def _invoke_callbacks(self, callbacks):
+        for callback in callbacks:
             self._invoke_cb(callback)
 
     def _invoke_cb(self, callback):
@@ -149,31 +201,41 @@ class Future(object):
         self.add_done_callback(callback)
         return future
 
+    def __await__(self):
+        """
+        Makes the Future awaitable from the asyncio coroutines.
 
-class _Event(object):
-    _flag = False
+        The result is passed to the event loop of the awaiting coroutine
+        without blocking any thread.
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
 
-    def __init__(self):
-        self.condition = threading.Condition(threading.Lock())
+        def callback(f):
+            loop.call_soon_threadsafe(_copy_future_state, f, future)
+
+        self.add_done_callback(callback)
+        return future.__await__()
 
-    def set(self):
-        with self.condition:
-            self._flag = True
-            self.condition.notify_all()
 
-    def is_set(self):
-        return self._flag
+def _copy_future_state(source, destination):
+    if destination.cancelled():
+        return
 
-    def wait(self):
-        with self.condition:
-            if not self._flag:
-                self.condition.wait()
-            return self._flag
+    exception = source.exception()
+    if exception:
+        destination.set_exception(exception)
+    else:
+        destination.set_result(source.result())
 
 
 class ImmediateFuture(Future):
+    __slots__ = ()
+
     def __init__(self, result):
+        Future.__init__(self)
         self._result = result
+        self._done = True
 
     def set_exception(self, exception):
         raise NotImplementedError()
@@ -201,9 +263,13 @@ class ImmediateFuture(Future):
 
 
 class ImmediateExceptionFuture(Future):
+    __slots__ = ()
+
     def __init__(self, exception, traceback=None):
+        Future.__init__(self)
         self._exception = exception
         self._traceback = traceback
+        self._done = True
 
     def set_exception(self, exception, traceback=None):
         raise NotImplementedError()
@@ -1,6 +1,24 @@
 import math
+import struct
 from hazelcast.six.moves import range
 
+try:
+    import numpy
+
+    NUMPY_ENABLED = True
+except ImportError:
+    NUMPY_ENABLED = False
+
+_DEFAULT_SEED = 0x01000193
+
+_C1 = 0xcc9e2d51
+_C2 = 0x1b873593
+
+# Below this many keys, the overhead of building the
+# arrays outweighs the gain of the vectorized hashing.
+_NUMPY_BATCH_THRESHOLD = 32
+
+
 def _fmix(h):
     h ^= h >> 16
     h = (h * 0x85ebca6b) & 0xFFFFFFFF
@@ -10,7 +28,7 @@ def _fmix(h):
     return h
 
 
-def murmur_hash3_x86_32(data, offset, size, seed=0x01000193):
+def murmur_hash3_x86_32(data, offset, size, seed=_DEFAULT_SEED):
     """
     murmur3 hash function to determine partition
 
@@ -20,23 +38,16 @@ def murmur_hash3_x86_32(data, offset, size, seed=0x01000193):
     :param seed: murmur hash seed hazelcast uses 0x01000193
     :return: (int32), calculated hash value.
     """
-    key = bytearray(data[offset: offset + size])
-    length = len(key)
-    nblocks = int(length / 4)
+    nblocks = size >> 2
 
     h1 = seed
 
-    c1 = 0xcc9e2d51
-    c2 = 0x1b873593
+    c1 = _C1
+    c2 = _C2
 
     # body
-    for block_start in range(0, nblocks * 4, 4):
-        # ??? big endian?
-        k1 = key[block_start + 3] << 24 | \
-             key[block_start + 2] << 16 | \
-             key[block_start + 1] << 8 | \
-             key[block_start + 0]
-
+    blocks = struct.unpack_from("<%dI" % nblocks, data, offset) if nblocks else ()
+    for k1 in blocks:
         k1 = c1 * k1 & 0xFFFFFFFF
         k1 = (k1 << 15 | k1 >> 17) & 0xFFFFFFFF  # inlined ROTL32
         k1 = (c2 * k1) & 0xFFFFFFFF
@@ -46,29 +57,123 @@ def murmur_hash3_x86_32(data, offset, size, seed=0x01000193):
         h1 = (h1 * 5 + 0xe6546b64) & 0xFFFFFFFF
 
     # tail
-    tail_index = nblocks * 4
-    k1 = 0
-    tail_size = length & 3
-
-    if tail_size >= 3:
-        k1 ^= key[tail_index + 2] << 16
-    if tail_size >= 2:
-        k1 ^= key[tail_index + 1] << 8
-    if tail_size >= 1:
-        k1 ^= key[tail_index + 0]
+    tail_index = offset + nblocks * 4
+    tail_size = size & 3
 
     if tail_size != 0:
+        tail = bytearray(data[tail_index: tail_index + tail_size])
+        k1 = 0
+        if tail_size >= 3:
+            k1 ^= tail[2] << 16
+        if tail_size >= 2:
+            k1 ^= tail[1] << 8
+        k1 ^= tail[0]
+
         k1 = (k1 * c1) & 0xFFFFFFFF
         k1 = (k1 << 15 | k1 >> 17) & 0xFFFFFFFF  # _ROTL32
         k1 = (k1 * c2) & 0xFFFFFFFF
         h1 ^= k1
 
-    result = _fmix(h1 ^ length)
+    result = _fmix(h1 ^ size)
     return -(result & 0x80000000) | (result & 0x7FFFFFFF)
 
 
+def murmur_hash3_x86_32_batch(buffers, offset, seed=_DEFAULT_SEED):
+    """
+    Calculates the murmur3 hashes of many byte arrays at once. Gives the same results with
+    :func:`murmur_hash3_x86_32`, but uses NumPy to hash the byte arrays of the same
+    length together when it is installed.
+
+    :param buffers: (list), input byte arrays.
+    :param offset: (long), offset of the hashed part in each byte array. The rest of the array is hashed.
+    :param seed: murmur hash seed hazelcast uses 0x01000193
+    :return: (list), calculated int32 hash values in the order of the byte arrays.
+    """
+    if not NUMPY_ENABLED or len(buffers) < _NUMPY_BATCH_THRESHOLD:
+        return [murmur_hash3_x86_32(buf, offset, len(buf) - offset, seed) for buf in buffers]
+
+    groups = {}
+    for index, buf in enumerate(buffers):
+        size = len(buf) - offset
+        try:
+            groups[size].append(index)
+        except KeyError:
+            groups[size] = [index]
+
+    hashes = [0] * len(buffers)
+    for size, indexes in groups.items():
+        keys = b"".join(bytes(buffers[index][offset:]) for index in indexes)
+        group_hashes = _murmur_hash3_x86_32_same_size(keys, len(indexes), size, seed)
+        for index, h in zip(indexes, group_hashes.tolist()):
+            hashes[index] = h
+
+    return hashes
+
+
+def _murmur_hash3_x86_32_same_size(keys, count, size, seed):
+    # Hashes the concatenation of count keys of the given size,
+    # processing the same block of all keys in one step.
+    uint32 = numpy.uint32
+    keys = numpy.frombuffer(keys, dtype=numpy.uint8).reshape(count, size)
+    nblocks = size >> 2
+
+    h1 = numpy.full(count, seed, dtype=uint32)
+    c1 = uint32(_C1)
+    c2 = uint32(_C2)
+
+    # body
+    blocks = keys[:, :nblocks * 4].copy().view("<u4")
+    for block in range(nblocks):
+        k1 = blocks[:, block] * c1
+        k1 = (k1 << uint32(15)) | (k1 >> uint32(17))
+        k1 *= c2
+
+        h1 ^= k1
+        h1 = (h1 << uint32(13)) | (h1 >> uint32(19))
+        h1 = h1 * uint32(5) + uint32(0xe6546b64)
+
+    # tail
+    tail_index = nblocks * 4
+    tail_size = size & 3
+
+    if tail_size != 0:
+        k1 = numpy.zeros(count, dtype=uint32)
+        if tail_size >= 3:
+            k1 ^= keys[:, tail_index + 2].astype(uint32) << uint32(16)
+        if tail_size >= 2:
+            k1 ^= keys[:, tail_index + 1].astype(uint32) << uint32(8)
+        k1 ^= keys[:, tail_index].astype(uint32)
+
+        k1 *= c1
+        k1 = (k1 << uint32(15)) | (k1 >> uint32(17))
+        k1 *= c2
+        h1 ^= k1
+
+    h1 ^= uint32(size)
+    h1 ^= h1 >> uint32(16)
+    h1 *= uint32(0x85ebca6b)
+    h1 ^= h1 >> uint32(13)
+    h1 *= uint32(0xc2b2ae35)
+    h1 ^= h1 >> uint32(16)
+    return h1.view(numpy.int32)
+
+
 def hash_to_index(hash, length):
     if hash == 0x80000000:
         return 0
     else:
         return int(abs(math.fmod(hash, length)))
+
+
+def hash_to_index_batch(hashes, length):
+    """
+    Maps many hashes to indexes at once. Gives the same results with :func:`hash_to_index`.
+
+    :param hashes: (list), int32 hash values.
+    :param length: (int), number of indexes.
+    :return: (list), indexes of the hashes.
+    """
+    if not NUMPY_ENABLED or len(hashes) < _NUMPY_BATCH_THRESHOLD:
+        return [hash_to_index(h, length) for h in hashes]
+
+    return (numpy.abs(numpy.array(hashes, dtype=numpy.int64)) % length).tolist()
@@ -1,25 +1,32 @@
+import heapq
 import logging
+import threading
 import time
 import functools
+from collections import deque
 
 from hazelcast.errors import create_error_from_message, HazelcastInstanceNotActiveError, is_retryable_error, \
     HazelcastTimeoutError, TargetDisconnectedError, HazelcastClientNotActiveError, TargetNotMemberError, \
-    EXCEPTION_MESSAGE_TYPE
+    HazelcastOverloadError, EXCEPTION_MESSAGE_TYPE
 from hazelcast.future import Future
 from hazelcast.util import AtomicInteger
 from hazelcast import six
 
 
+_TIMEOUT_SWEEP_PERIOD = 1.0
+
+
 def _no_op_response_handler(_):
     pass
 
 
 class Invocation(object):
     __slots__ = ("request", "timeout", "partition_id", "uuid", "connection", "event_handler",
-                 "future", "sent_connection", "urgent", "response_handler")
+                 "future", "sent_connection", "urgent", "response_handler", "wait_timeout")
 
     def __init__(self, request, partition_id=-1, uuid=None, connection=None,
-                 event_handler=None, urgent=False, timeout=None, response_handler=_no_op_response_handler):
+                 event_handler=None, urgent=False, timeout=None, response_handler=_no_op_response_handler,
+                 wait_timeout=None):
         self.request = request
         self.partition_id = partition_id
         self.uuid = uuid
@@ -31,6 +38,9 @@ class Invocation(object):
         self.timeout = None
         self.sent_connection = None
         self.response_handler = response_handler
+        # Time in seconds the member may hold the request before responding, such as the timeout
+        # of a blocking poll. Negative values mean indefinitely, None means it responds right away.
+        self.wait_timeout = wait_timeout
 
     def set_response(self, response):
         try:
@@ -43,15 +53,131 @@ class Invocation(object):
         self.future.set_exception(exception, traceback)
 
 
+class _ResponseThread(object):
+    """
+    Runs the tasks submitted to it in the order they are submitted, in a dedicated thread.
+    """
+    _thread = None
+    _is_live = False
+    logger = logging.getLogger("HazelcastClient.InvocationService")
+
+    def __init__(self, index, logger_extras):
+        self._index = index
+        self._logger_extras = logger_extras
+        self._tasks = deque()
+        self._condition = threading.Condition(threading.Lock())
+        self.max_queue_depth = 0
+        self.completed_count = 0
+
+    @property
+    def queue_depth(self):
+        return len(self._tasks)
+
+    def start(self):
+        self._is_live = True
+        self._thread = threading.Thread(target=self._run, name="hazelcast-response-%s" % self._index)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def shutdown(self):
+        with self._condition:
+            self._is_live = False
+            self._condition.notify()
+
+    def execute(self, task, args):
+        tasks = self._tasks
+        with self._condition:
+            tasks.append((task, args))
+            depth = len(tasks)
+            if depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+            if depth == 1:
+                self._condition.notify()
+
+    def _run(self):
+        # Blocking on a future here may wait for a response that is queued
+        # behind the current task, so the thread is treated like a reactor thread.
+        Future._threading_locals.is_reactor_thread = True
+        tasks = self._tasks
+        condition = self._condition
+        while True:
+            with condition:
+                while not tasks:
+                    if not self._is_live:
+                        return
+                    condition.wait()
+                task, args = tasks.popleft()
+
+            try:
+                task(*args)
+            except:
+                self.logger.exception("Error in response thread", extra=self._logger_extras)
+            self.completed_count += 1
+
+
+class _ResponseExecutor(object):
+    """
+    Completes the invocations on a fixed number of threads, instead of the reactor threads.
+    Tasks with the same key are run by the same thread, in the order they are submitted.
+    """
+
+    def __init__(self, thread_count, logger_extras):
+        self._threads = [_ResponseThread(i, logger_extras) for i in range(thread_count)]
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+
+    def shutdown(self):
+        # The queued tasks are run before the threads exit
+        for thread in self._threads:
+            thread.shutdown()
+
+    def execute(self, key, task, *args):
+        threads = self._threads
+        threads[key % len(threads)].execute(task, args)
+
+    def get_statistics(self):
+        """
+        Returns the statistics of the response threads.
+
+        :return: (Dict), Dictionary that stores the number of threads, the number of tasks waiting in their queues
+            in total, the largest queue depth of a thread so far and the number of completed tasks.
+        """
+        threads = self._threads
+        return {
+            "thread_count": len(threads),
+            "queue_depth": sum(thread.queue_depth for thread in threads),
+            "max_queue_depth": max(thread.max_queue_depth for thread in threads),
+            "completed": sum(thread.completed_count for thread in threads),
+        }
+
+
 class InvocationService(object):
     logger = logging.getLogger("HazelcastClient.InvocationService")
 
     def __init__(self, client, reactor, logger_extras):
         config = client.config
         if config.network.smart_routing:
-            self.invoke = self._invoke_smart
+            self._do_invoke = self._invoke_smart
         else:
-            self.invoke = self._invoke_non_smart
+            self._do_invoke = self._invoke_non_smart
+
+        properties = client.properties
+        self._max_concurrent_invocations = properties.get_int(properties.MAX_CONCURRENT_INVOCATIONS)
+        self._backoff_timeout = properties.get_seconds(properties.INVOCATION_BACKOFF_TIMEOUT_MILLIS)
+        response_thread_count = properties.get_int(properties.RESPONSE_THREAD_COUNT)
+        self._response_executor = None
+        if response_thread_count > 0:
+            self._response_executor = _ResponseExecutor(response_thread_count, logger_extras)
+        self._inline_response_max_size = properties.get_int(properties.RESPONSE_INLINE_MAX_SIZE_BYTES)
+        self._inline_response_count = 0
+        self._invocation_count = 0
+        self._invocation_count_condition = threading.Condition()
+        if self._max_concurrent_invocations > 0:
+            self.invoke = self._invoke_with_backpressure
+        else:
+            self.invoke = self._do_invoke
 
         self._client = client
         self._reactor = reactor
@@ -61,6 +187,10 @@ class InvocationService(object):
         self._listener_service = None
         self._check_invocation_allowed_fn = None
         self._pending = {}
+        self._deadlines = []
+        self._deadlines_lock = threading.Lock()
+        self._timed_out_invocation_count = 0
+        self._timeout_sweep_timer = None
         self._next_correlation_id = AtomicInteger(1)
         self._is_redo_operation = config.network.redo_operation
         self._invocation_timeout = self._init_invocation_timeout()
@@ -72,11 +202,14 @@ class InvocationService(object):
         self._connection_manager = connection_manager
         self._listener_service = listener_service
         self._check_invocation_allowed_fn = connection_manager.check_invocation_allowed
+        self._timeout_sweep_timer = self._reactor.add_timer(_TIMEOUT_SWEEP_PERIOD, self._sweep_timeouts)
+        if self._response_executor:
+            self._response_executor.start()
 
     def handle_client_message(self, message):
         correlation_id = message.get_correlation_id()
 
-        if message.start_frame.has_event_flag():
+        if message.has_event_flag():
             self._listener_service.handle_client_message(message, correlation_id)
             return
 
@@ -85,16 +218,131 @@ class InvocationService(object):
             self.logger.warning("Got message with unknown correlation id: %s", message, extra=self._logger_extras)
             return
 
+        executor = self._response_executor
+        if executor is None:
+            self._handle_response(invocation, message)
+        elif message.size() <= self._inline_response_max_size and not invocation.future._callbacks:
+            self._inline_response_count += 1
+            self._handle_response(invocation, message)
+        else:
+            # Responses of the same partition are completed in the order they are received
+            partition_id = invocation.partition_id
+            key = partition_id if partition_id != -1 else correlation_id
+            executor.execute(key, self._handle_response, invocation, message)
+
+    def _handle_response(self, invocation, message):
         if message.get_message_type() == EXCEPTION_MESSAGE_TYPE:
             error = create_error_from_message(message)
             return self._handle_exception(invocation, error)
 
         invocation.set_response(message)
 
+    def get_statistics(self):
+        """
+        Returns the statistics of the invocations.
+
+        :return: (Dict), Dictionary that stores the number of pending invocations waiting for
+            their responses and the number of invocations that have timed out so far.
+        """
+        return {
+            "pending": len(self._pending),
+            "timed_out": self._timed_out_invocation_count,
+        }
+
+    def get_response_statistics(self):
+        """
+        Returns the statistics of the response threads, which complete the invocations.
+
+        :return: (Dict), Dictionary that stores the number of responses completed on the reactor threads while there
+            are response threads, along with the statistics of the response threads. The latter are not included
+            when there are no response threads.
+        """
+        stats = {"inline": self._inline_response_count}
+        if self._response_executor:
+            stats.update(self._response_executor.get_statistics())
+        return stats
+
     def shutdown(self):
         self._shutdown = True
+        if self._timeout_sweep_timer:
+            self._timeout_sweep_timer.cancel()
         for invocation in list(six.itervalues(self._pending)):
             self._handle_exception(invocation, HazelcastClientNotActiveError())
+        if self._response_executor:
+            self._response_executor.shutdown()
+
+    def _invoke_with_backpressure(self, invocation):
+        if not invocation.urgent:
+            if not self._acquire_invocation_slot():
+                invocation.set_exception(HazelcastOverloadError("Maximum number of concurrent invocations (%s) "
+                                                                "is reached" % self._max_concurrent_invocations))
+                return
+
+            invocation.future.add_done_callback(self._release_invocation_slot)
+
+        self._do_invoke(invocation)
+
+    def _acquire_invocation_slot(self):
+        condition = self._invocation_count_condition
+        with condition:
+            if self._invocation_count < self._max_concurrent_invocations:
+                self._invocation_count += 1
+                return True
+
+            end = time.time() + self._get_backoff_timeout()
+            while self._invocation_count >= self._max_concurrent_invocations:
+                remaining = end - time.time()
+                if remaining <= 0:
+                    return False
+                condition.wait(remaining)
+
+            self._invocation_count += 1
+            return True
+
+    def _release_invocation_slot(self, _):
+        condition = self._invocation_count_condition
+        with condition:
+            self._invocation_count -= 1
+            condition.notify()
+
+    def _get_backoff_timeout(self):
+        # The slots are freed and the write queues are drained on the reactor
+        # threads. Waiting on them would deadlock, so they fail fast.
+        if hasattr(Future._threading_locals, "is_reactor_thread"):
+            return 0
+        return self._backoff_timeout
+
+    def _sweep_timeouts(self):
+        if self._shutdown:
+            return
+
+        now = time.time()
+        expired = []
+        deadlines = self._deadlines
+        with self._deadlines_lock:
+            while deadlines and deadlines[0][0] <= now:
+                expired.append(heapq.heappop(deadlines)[1])
+
+            # The entries of the completed invocations are removed lazily.
+            # Rebuild the index when they start to dominate it.
+            if len(deadlines) > 2 * len(self._pending) + 1024:
+                deadlines[:] = [entry for entry in deadlines if entry[1] in self._pending]
+                heapq.heapify(deadlines)
+
+        for correlation_id in expired:
+            invocation = self._pending.pop(correlation_id, None)
+            if not invocation:
+                continue
+
+            if invocation.event_handler:
+                self._listener_service.remove_event_handler(correlation_id)
+
+            self._timed_out_invocation_count += 1
+            invocation.set_exception(HazelcastTimeoutError("Request timed out because no response is received "
+                                                           "for %s seconds: %s" % (self._invocation_timeout,
+                                                                                    invocation.request)))
+
+        self._timeout_sweep_timer = self._reactor.add_timer(_TIMEOUT_SWEEP_PERIOD, self._sweep_timeouts)
 
     def _invoke_on_partition_owner(self, invocation, partition_id):
         owner_uuid = self._partition_service.get_partition_owner(partition_id)
@@ -181,11 +429,21 @@ class InvocationService(object):
         if self._shutdown:
             raise HazelcastClientNotActiveError()
 
+        if not invocation.urgent and not connection.wait_until_writable(self._get_backoff_timeout()):
+            raise HazelcastOverloadError("Outbound queue of %s has reached the high water mark" % connection)
+
         correlation_id = self._next_correlation_id.get_and_increment()
         message = invocation.request
         message.set_correlation_id(correlation_id)
         message.set_partition_id(invocation.partition_id)
         self._pending[correlation_id] = invocation
+        # Blocking invocations are given the time they may wait on the member on top of
+        # the invocation timeout, the ones that may wait indefinitely never time out.
+        wait_timeout = invocation.wait_timeout
+        if wait_timeout is None or wait_timeout >= 0:
+            deadline = invocation.timeout + (wait_timeout or 0)
+            with self._deadlines_lock:
+                heapq.heappush(self._deadlines, (deadline, correlation_id))
 
         if invocation.event_handler:
             self._listener_service.add_event_handler(correlation_id, invocation.event_handler)
@@ -193,6 +451,7 @@ class InvocationService(object):
         self.logger.debug("Sending %s to %s", message, connection, extra=self._logger_extras)
 
         if not connection.send_message(message):
+            self._pending.pop(correlation_id, None)
             if invocation.event_handler:
                 self._listener_service.remove_event_handler(correlation_id)
             return False
@@ -221,7 +480,7 @@ class InvocationService(object):
             self._pending.pop(invocation.request.get_correlation_id(), None)
             return
 
-        invoke_func = functools.partial(self.invoke, invocation)
+        invoke_func = functools.partial(self._do_invoke, invocation)
         self._reactor.add_timer(self._invocation_retry_pause, invoke_func)
 
     def _should_retry(self, invocation, error):
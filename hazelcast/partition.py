@@ -1,7 +1,8 @@
 import logging
 
 from hazelcast.errors import ClientOfflineError
-from hazelcast.hash import hash_to_index
+from hazelcast.hash import hash_to_index, hash_to_index_batch, murmur_hash3_x86_32_batch
+from hazelcast.serialization.data import DATA_OFFSET
 
 
 class _PartitionTable(object):
@@ -48,6 +49,19 @@ class PartitionService(object):
         """
         return self._service.get_partition_id(key_data)
 
+    def get_partition_ids(self, key_data_list):
+        """
+        Returns the partition ids for many key datas at once. It is faster than calling
+        :func:`get_partition_id` for each key data, especially when NumPy is installed.
+
+        :param key_data_list: The key datas.
+        :type key_data_list: list[:class:`~hazelcast.serialization.data.Data`]
+
+        :return: The partition ids in the order of the key datas.
+        :rtype: list[int]
+        """
+        return self._service.get_partition_ids(key_data_list)
+
     def get_partition_count(self):
         """
         Returns partition count of the connected cluster.
@@ -101,6 +115,28 @@ class _InternalPartitionService(object):
 
         return hash_to_index(key.get_partition_hash(), count)
 
+    def get_partition_ids(self, keys):
+        count = self.partition_count
+        if count == 0:
+            raise ClientOfflineError()
+
+        hashes = []
+        unhashed_indexes = []
+        unhashed_buffers = []
+        for key in keys:
+            if key.is_partition_hash_computed():
+                hashes.append(key.get_partition_hash())
+            else:
+                unhashed_indexes.append(len(hashes))
+                unhashed_buffers.append(key.to_bytes())
+                hashes.append(0)
+
+        if unhashed_buffers:
+            for index, h in zip(unhashed_indexes, murmur_hash3_x86_32_batch(unhashed_buffers, DATA_OFFSET)):
+                hashes[index] = h
+
+        return hash_to_index_batch(hashes, count)
+
     def check_and_set_partition_count(self, partition_count):
         """
         :param partition_count: (int)
@@ -2,12 +2,22 @@ import uuid
 
 from hazelcast import six
 from hazelcast.protocol.client_message import NULL_FRAME_BUF, BEGIN_FRAME_BUF, END_FRAME_BUF, \
-    SIZE_OF_FRAME_LENGTH_AND_FLAGS, _IS_FINAL_FLAG, NULL_FINAL_FRAME_BUF, END_FINAL_FRAME_BUF
+    SIZE_OF_FRAME_LENGTH_AND_FLAGS, _IS_FINAL_FLAG, NULL_FINAL_FRAME_BUF, END_FINAL_FRAME_BUF, \
+    MIN_EXTERNAL_PAYLOAD_SIZE, OutboundBuffer, _BEGIN_DATA_STRUCTURE_FLAG, _END_DATA_STRUCTURE_FLAG, _IS_NULL_FLAG
 from hazelcast.serialization import LONG_SIZE_IN_BYTES, UUID_SIZE_IN_BYTES, LE_INT, LE_LONG, BOOLEAN_SIZE_IN_BYTES, \
     INT_SIZE_IN_BYTES, LE_ULONG, LE_UINT16, LE_INT8, UUID_MSB_SHIFT, UUID_LSB_MASK
 from hazelcast.serialization.data import Data
 
 
+def _extend_payload(buf, payload):
+    # Large payloads are referenced by the message instead of being copied,
+    # unless they are encoded into an intermediate buffer of a custom codec.
+    if len(payload) >= MIN_EXTERNAL_PAYLOAD_SIZE and isinstance(buf, OutboundBuffer):
+        buf.add_payload(payload)
+    else:
+        buf.extend(payload)
+
+
 class CodecUtil(object):
     @staticmethod
     def fast_forward_to_end_frame(msg):
@@ -15,10 +25,11 @@ class CodecUtil(object):
         # in the beginning of the decode method
         num_expected_end_frames = 1
         while num_expected_end_frames != 0:
-            frame = msg.next_frame()
-            if frame.is_end_frame():
+            flags = msg.peek_next_frame_flags()
+            msg.skip_frame()
+            if flags & _END_DATA_STRUCTURE_FLAG:
                 num_expected_end_frames -= 1
-            elif frame.is_begin_frame():
+            elif flags & _BEGIN_DATA_STRUCTURE_FLAG:
                 num_expected_end_frames += 1
 
     @staticmethod
@@ -40,7 +51,7 @@ class CodecUtil(object):
 
     @staticmethod
     def next_frame_is_data_structure_end_frame(msg):
-        return msg.peek_next_frame().is_end_frame()
+        return msg.peek_next_frame_flags() & _END_DATA_STRUCTURE_FLAG != 0
 
     @staticmethod
     def next_frame_is_null_frame(msg):
@@ -48,9 +59,9 @@ class CodecUtil(object):
         If it is, this method consumes the iterator
         by calling msg.next_frame once to skip the NULL_FRAME.
         """
-        is_null = msg.peek_next_frame().is_null_frame()
+        is_null = msg.peek_next_frame_flags() & _IS_NULL_FLAG != 0
         if is_null:
-            msg.next_frame()
+            msg.skip_frame()
         return is_null
 
 
@@ -62,27 +73,32 @@ class ByteArrayCodec(object):
         if is_final:
             LE_UINT16.pack_into(header, INT_SIZE_IN_BYTES, _IS_FINAL_FLAG)
         buf.extend(header)
-        buf.extend(value)
+        _extend_payload(buf, value)
 
     @staticmethod
     def decode(msg):
-        return msg.next_frame().buf
+        return msg.next_frame().buf.tobytes()
 
 
 class DataCodec(object):
     @staticmethod
     def encode(buf, value, is_final=False):
-        value_bytes = value.to_bytes()
         header = bytearray(SIZE_OF_FRAME_LENGTH_AND_FLAGS)
-        LE_INT.pack_into(header, 0, SIZE_OF_FRAME_LENGTH_AND_FLAGS + len(value_bytes))
+        LE_INT.pack_into(header, 0, SIZE_OF_FRAME_LENGTH_AND_FLAGS + value.total_size())
         if is_final:
             LE_UINT16.pack_into(header, INT_SIZE_IN_BYTES, _IS_FINAL_FLAG)
         buf.extend(header)
-        buf.extend(value_bytes)
+        if value.has_payloads():
+            # the payloads referenced by the data are referenced by the message as well
+            for value_buffer in value.get_buffers():
+                _extend_payload(buf, value_buffer)
+        else:
+            _extend_payload(buf, value.to_bytes())
 
     @staticmethod
     def decode(msg):
-        return Data(msg.next_frame().buf)
+        # Data outlives the message, copy it out of the read buffer
+        return Data(msg.next_frame_content())
 
     @staticmethod
     def encode_nullable(buf, value, is_final=False):
@@ -127,13 +143,13 @@ class EntryListCodec(object):
     @staticmethod
     def decode(msg, key_decoder, value_decoder):
         result = []
-        msg.next_frame()
-        while not CodecUtil.next_frame_is_data_structure_end_frame(msg):
+        msg.skip_frame()
+        while not msg.peek_next_frame_flags() & _END_DATA_STRUCTURE_FLAG:
             key = key_decoder(msg)
             value = value_decoder(msg)
             result.append((key, value))
 
-        msg.next_frame()
+        msg.skip_frame()
         return result
 
     @staticmethod
@@ -254,8 +270,9 @@ class FixSizedTypesCodec(object):
 
         msb_offset = offset + BOOLEAN_SIZE_IN_BYTES
         lsb_offset = msb_offset + LONG_SIZE_IN_BYTES
-        b = buf[lsb_offset - 1:msb_offset - 1:-1] + buf[lsb_offset + LONG_SIZE_IN_BYTES - 1:lsb_offset - 1:-1]
-        return uuid.UUID(bytes=bytes(b))
+        msb = LE_ULONG.unpack_from(buf, msb_offset)[0]
+        lsb = LE_ULONG.unpack_from(buf, lsb_offset)[0]
+        return uuid.UUID(int=(msb << UUID_MSB_SHIFT) | lsb)
 
 
 class ListIntegerCodec(object):
@@ -341,24 +358,24 @@ class ListMultiFrameCodec(object):
     @staticmethod
     def decode(msg, decoder):
         result = []
-        msg.next_frame()
-        while not CodecUtil.next_frame_is_data_structure_end_frame(msg):
+        msg.skip_frame()
+        while not msg.peek_next_frame_flags() & _END_DATA_STRUCTURE_FLAG:
             result.append(decoder(msg))
 
-        msg.next_frame()
+        msg.skip_frame()
         return result
 
     @staticmethod
     def decode_contains_nullable(msg, decoder):
         result = []
-        msg.next_frame()
-        while not CodecUtil.next_frame_is_data_structure_end_frame(msg):
+        msg.skip_frame()
+        while not msg.peek_next_frame_flags() & _END_DATA_STRUCTURE_FLAG:
             if CodecUtil.next_frame_is_null_frame(msg):
                 result.append(None)
             else:
                 result.append(decoder(msg))
 
-        msg.next_frame()
+        msg.skip_frame()
         return result
 
     @staticmethod
@@ -440,13 +457,13 @@ class MapCodec(object):
     @staticmethod
     def decode(msg, key_decoder, value_decoder):
         result = dict()
-        msg.next_frame()
-        while not CodecUtil.next_frame_is_data_structure_end_frame(msg):
+        msg.skip_frame()
+        while not msg.peek_next_frame_flags() & _END_DATA_STRUCTURE_FLAG:
             key = key_decoder(msg)
             value = value_decoder(msg)
             result[key] = value
 
-        msg.next_frame()
+        msg.skip_frame()
         return result
 
     @staticmethod
@@ -466,8 +483,8 @@ class StringCodec(object):
         if is_final:
             LE_UINT16.pack_into(header, INT_SIZE_IN_BYTES, _IS_FINAL_FLAG)
         buf.extend(header)
-        buf.extend(value_bytes)
+        _extend_payload(buf, value_bytes)
 
     @staticmethod
     def decode(msg):
-        return msg.next_frame().buf.decode("utf-8")
+        return msg.next_frame_content().decode("utf-8")
@@ -1,6 +1,9 @@
 import errno
 import socket
+import struct
+from array import array
 
+from hazelcast import six
 from hazelcast.serialization.bits import *
 
 SIZE_OF_FRAME_LENGTH_AND_FLAGS = INT_SIZE_IN_BYTES + SHORT_SIZE_IN_BYTES
@@ -29,11 +32,18 @@ _END_DATA_STRUCTURE_FLAG = 1 << 11
 _IS_NULL_FLAG = 1 << 10
 _IS_EVENT_FLAG = 1 << 9
 
+_FRAME_HEADER = struct.Struct("<iH")
+_FRAGMENTATION_FRAME_SIZE = SIZE_OF_FRAME_LENGTH_AND_FLAGS + LONG_SIZE_IN_BYTES
+
+# Payloads of at least this many bytes are not copied into the message buffer.
+# Below that, an extra buffer to send costs more than the copy.
+MIN_EXTERNAL_PAYLOAD_SIZE = 4096
+
 
 # For codecs
 def create_initial_buffer(size, message_type, is_final=False):
     size += SIZE_OF_FRAME_LENGTH_AND_FLAGS
-    buf = bytearray(size)
+    buf = OutboundBuffer(size)
     LE_INT.pack_into(buf, 0, size)
     flags = _UNFRAGMENTED_MESSAGE_FLAGS
     if is_final:
@@ -63,6 +73,29 @@ def create_initial_buffer_custom(size, is_begin_frame=False):
         return buf
 
 
+class OutboundBuffer(bytearray):
+    """
+    Buffer the codecs encode the outbound messages into. Large payloads, such as the serialized
+    keys and values, are not copied into it. Instead, they are referenced together with the offset
+    they belong to, and written to the socket as they are.
+    """
+    __slots__ = ("payloads",)
+
+    def __init__(self, source=0):
+        super(OutboundBuffer, self).__init__(source)
+        self.payloads = None  # list of (offset, payload)
+
+    def add_payload(self, payload):
+        """
+        Adds a payload to the message, after the bytes encoded so far.
+
+        :param payload: (bytes|bytearray), the payload. It must not be modified afterwards.
+        """
+        if self.payloads is None:
+            self.payloads = []
+        self.payloads.append((len(self), payload))
+
+
 class OutboundMessage(object):
     __slots__ = ("buf", "retryable")
 
@@ -70,6 +103,131 @@ class OutboundMessage(object):
         self.buf = buf
         self.retryable = retryable
 
+    def get_buffers(self):
+        """
+        Returns the buffers that make up the message, in order. The parts of the message buffer
+        between the external payloads are returned as views, without copying them.
+
+        :return: (list), the buffers of the message.
+        """
+        buf = self.buf
+        payloads = getattr(buf, "payloads", None)
+        if not payloads:
+            return [buf]
+
+        view = buf if six.PY2 else memoryview(buf)
+        buffers = []
+        start = 0
+        for offset, payload in payloads:
+            if offset > start:
+                buffers.append(view[start:offset])
+                start = offset
+            buffers.append(payload)
+        if start < len(buf):
+            buffers.append(view[start:])
+        return buffers
+
+    def size(self):
+        """
+        Returns the total size of the message in bytes.
+
+        :return: (int), size of the message.
+        """
+        buf = self.buf
+        payloads = getattr(buf, "payloads", None)
+        if not payloads:
+            return len(buf)
+        return len(buf) + sum(len(payload) for _, payload in payloads)
+
+    def get_fragments(self, max_frame_size, fragmentation_id):
+        """
+        Splits the message into fragments whose frames add up to at most ``max_frame_size`` bytes.
+        Each fragment starts with a fragmentation frame carrying the fragmentation id and the begin
+        or end fragment flag, and ends with a final frame. Frames are never split, a frame larger
+        than ``max_frame_size`` makes up a fragment on its own.
+
+        :param max_frame_size: (int), maximum size of the frames of a fragment in bytes.
+        :param fragmentation_id: (int), id shared by the fragments of the message.
+        :return: (list), the fragments, each of which is a list of buffers. If the message fits
+            into a single fragment, the only item is the buffers of the message itself.
+        """
+        buf = self.buf
+        payloads = getattr(buf, "payloads", None) or ()
+        payload_count = len(payloads)
+        # A frame may be made up of the bytes in the buffer and any number of payloads,
+        # each frame is kept as (position, end position, frame size, first payload, end payload)
+        groups = []
+        group = []
+        group_size = 0
+        pos = 0
+        payload_index = 0
+        end = len(buf)
+        while pos < end:
+            frame_size = _FRAME_HEADER.unpack_from(buf, pos)[0]
+            first_payload_index = payload_index
+            frame_end = pos + SIZE_OF_FRAME_LENGTH_AND_FLAGS
+            remaining = frame_size - SIZE_OF_FRAME_LENGTH_AND_FLAGS
+            while remaining > 0:
+                if payload_index < payload_count and payloads[payload_index][0] == frame_end:
+                    remaining -= len(payloads[payload_index][1])
+                    payload_index += 1
+                else:
+                    next_offset = payloads[payload_index][0] if payload_index < payload_count else end
+                    size = min(remaining, next_offset - frame_end)
+                    frame_end += size
+                    remaining -= size
+
+            if group and group_size + frame_size > max_frame_size:
+                groups.append(group)
+                group = []
+                group_size = 0
+            group.append((pos, frame_end, frame_size, first_payload_index, payload_index))
+            group_size += frame_size
+            pos = frame_end
+        groups.append(group)
+
+        if len(groups) == 1:
+            return [self.get_buffers()]
+
+        view = buf if six.PY2 else memoryview(buf)
+
+        def add_buffers(fragment, start, stop, first_payload_index, end_payload_index):
+            # the buffers of the bytes in between start and stop, along with the payloads in there
+            for payload_index in range(first_payload_index, end_payload_index):
+                offset, payload = payloads[payload_index]
+                if offset > start:
+                    fragment.append(view[start:offset])
+                    start = offset
+                fragment.append(payload)
+            if stop > start:
+                fragment.append(view[start:stop])
+
+        fragments = []
+        last_group = len(groups) - 1
+        for index, group in enumerate(groups):
+            flags = _DEFAULT_FLAGS
+            if index == 0:
+                flags = _BEGIN_FRAGMENT_FLAG
+            elif index == last_group:
+                flags = _END_FRAGMENT_FLAG
+            fragmentation_frame = bytearray(_FRAGMENTATION_FRAME_SIZE)
+            _FRAME_HEADER.pack_into(fragmentation_frame, 0, _FRAGMENTATION_FRAME_SIZE, flags)
+            LE_LONG.pack_into(fragmentation_frame, SIZE_OF_FRAME_LENGTH_AND_FLAGS, fragmentation_id)
+
+            fragment = [fragmentation_frame]
+            pos, frame_end, _, first_payload_index, end_payload_index = group[-1]
+            add_buffers(fragment, group[0][0], pos, group[0][3], first_payload_index)
+
+            # the last frame of a fragment is marked as final
+            header = bytearray(buf[pos:pos + SIZE_OF_FRAME_LENGTH_AND_FLAGS])
+            LE_UINT16.pack_into(header, INT_SIZE_IN_BYTES,
+                                LE_UINT16.unpack_from(header, INT_SIZE_IN_BYTES)[0] | _IS_FINAL_FLAG)
+            fragment.append(header)
+            add_buffers(fragment, pos + SIZE_OF_FRAME_LENGTH_AND_FLAGS, frame_end, first_payload_index,
+                        end_payload_index)
+            fragments.append(fragment)
+        return fragments
+
     def set_correlation_id(self, correlation_id):
         LE_LONG.pack_into(self.buf, _OUTBOUND_MESSAGE_CORRELATION_ID_OFFSET, correlation_id)
 
@@ -80,7 +238,14 @@ class OutboundMessage(object):
         LE_INT.pack_into(self.buf, _OUTBOUND_MESSAGE_PARTITION_ID_OFFSET, partition_id)
 
     def copy(self):
-        return OutboundMessage(bytearray(self.buf), self.retryable)
+        buf = self.buf
+        payloads = getattr(buf, "payloads", None)
+        if payloads is None:
+            return OutboundMessage(bytearray(buf), self.retryable)
+        # the payloads are never modified, they can be shared
+        copy = OutboundBuffer(buf)
+        copy.payloads = list(payloads)
+        return OutboundMessage(copy, self.retryable)
 
     def __repr__(self):
         message_type = LE_INT.unpack_from(self.buf, _OUTBOUND_MESSAGE_MESSAGE_TYPE_OFFSET)[0]
@@ -131,48 +296,130 @@ class Frame(object):
 
 
 class InboundMessage(object):
-    __slots__ = ("start_frame", "end_frame", "_next_frame")
+    """
+    Received message. The frames are kept in flat arrays of the buffers they are in, their offsets, sizes and
+    flags, rather than as linked :class:`Frame` objects. The builtin codecs decode the frames from them with the
+    index based methods. :func:`next_frame` and :func:`peek_next_frame` return the frames as :class:`Frame`
+    views over the buffers, for the other codecs.
+    """
+    __slots__ = ("_buffers", "_offsets", "_sizes", "_flags", "_index")
+
+    def __init__(self, start_frame=None):
+        self._buffers = []
+        self._offsets = array("i")
+        self._sizes = array("i")
+        self._flags = array("H")
+        self._index = 0
+        if start_frame is not None:
+            self.add_frame(start_frame)
+
+    def append_frame(self, buf, offset, size, flags):
+        """
+        Adds a frame, which is the given part of the buffer. The buffer must not be modified afterwards.
+
+        :param buf: (bytearray|bytes), buffer the frame is in.
+        :param offset: (int), offset of the frame content in the buffer, after the length and flags.
+        :param size: (int), size of the frame content.
+        :param flags: (int), flags of the frame.
+        """
+        self._buffers.append(buf)
+        self._offsets.append(offset)
+        self._sizes.append(size)
+        self._flags.append(flags)
 
-    def __init__(self, start_frame):
-        self.start_frame = start_frame
-        self.end_frame = start_frame
-        self._next_frame = start_frame
+    def add_frame(self, frame):
+        buf = frame.buf
+        if isinstance(buf, memoryview):
+            buf = buf.tobytes()
+        self.append_frame(buf, 0, len(buf), frame.flags)
 
     def next_frame(self):
-        result = self._next_frame
-        if self._next_frame is not None:
-            self._next_frame = self._next_frame.next
-        return result
+        frame = self.peek_next_frame()
+        if frame is not None:
+            self._index += 1
+        return frame
 
     def has_next_frame(self):
-        return self._next_frame is not None
+        return self._index < len(self._flags)
 
     def peek_next_frame(self):
-        return self._next_frame
+        index = self._index
+        if index >= len(self._flags):
+            return None
+        return self._frame_at(index)
+
+    def skip_frame(self):
+        """
+        Skips the next frame.
+        """
+        self._index += 1
+
+    def peek_next_frame_flags(self):
+        """
+        Returns the flags of the next frame, without consuming it.
+
+        :return: (int), flags of the next frame.
+        """
+        return self._flags[self._index]
+
+    def next_frame_content(self):
+        """
+        Returns a copy of the content of the next frame and consumes it.
+
+        :return: (bytearray|bytes), content of the frame.
+        """
+        index = self._index
+        self._index = index + 1
+        offset = self._offsets[index]
+        return self._buffers[index][offset:offset + self._sizes[index]]
+
+    @property
+    def start_frame(self):
+        return self._frame_at(0)
+
+    @property
+    def end_frame(self):
+        return self._frame_at(len(self._flags) - 1)
+
+    def get_start_frame_flags(self):
+        return self._flags[0]
 
-    def add_frame(self, frame):
-        frame.next = None
-        # For inbound messages, we always had the start_frame and end_frame set
-        self.end_frame.next = frame
-        self.end_frame = frame
+    def has_event_flag(self):
+        return self._flags[0] & _IS_EVENT_FLAG == _IS_EVENT_FLAG
 
     def get_message_type(self):
-        return LE_INT.unpack_from(self.start_frame.buf, _MESSAGE_TYPE_OFFSET)[0]
+        return LE_INT.unpack_from(self._buffers[0], self._offsets[0] + _MESSAGE_TYPE_OFFSET)[0]
 
     def get_correlation_id(self):
-        return LE_LONG.unpack_from(self.start_frame.buf, _CORRELATION_ID_OFFSET)[0]
+        return LE_LONG.unpack_from(self._buffers[0], self._offsets[0] + _CORRELATION_ID_OFFSET)[0]
 
     def get_fragmentation_id(self):
-        return LE_LONG.unpack_from(self.start_frame.buf, _FRAGMENTATION_ID_OFFSET)[0]
+        return LE_LONG.unpack_from(self._buffers[0], self._offsets[0] + _FRAGMENTATION_ID_OFFSET)[0]
+
+    def size(self):
+        """
+        :return: (int), size of the message in bytes, as it is on the wire.
+        """
+        return sum(self._sizes) + len(self._flags) * SIZE_OF_FRAME_LENGTH_AND_FLAGS
 
     def merge(self, fragment):
         # should be called after calling drop_fragmentation_frame() on fragment
-        self.end_frame.next = fragment.start_frame
-        self.end_frame = fragment.end_frame
+        self._buffers.extend(fragment._buffers)
+        self._offsets.extend(fragment._offsets)
+        self._sizes.extend(fragment._sizes)
+        self._flags.extend(fragment._flags)
 
     def drop_fragmentation_frame(self):
-        self.start_frame = self.start_frame.next
-        self._next_frame = self.start_frame
+        del self._buffers[0]
+        del self._offsets[0]
+        del self._sizes[0]
+        del self._flags[0]
+        self._index = 0
+
+    def _frame_at(self, index):
+        offset = self._offsets[index]
+        buf = memoryview(self._buffers[index])[offset:offset + self._sizes[index]]
+        return Frame(buf, self._flags[index])
 
 
 NULL_FRAME_BUF = bytearray(SIZE_OF_FRAME_LENGTH_AND_FLAGS)
@@ -204,13 +451,13 @@ class ClientMessageBuilder(object):
         self._message_callback = message_callback
 
     def on_message(self, client_message):
-        if client_message.start_frame.has_unfragmented_message_flags():
+        flags = client_message.get_start_frame_flags()
+        if flags & _UNFRAGMENTED_MESSAGE_FLAGS == _UNFRAGMENTED_MESSAGE_FLAGS:
             self._message_callback(client_message)
         else:
-            fragmentation_frame = client_message.start_frame
             fragmentation_id = client_message.get_fragmentation_id()
             client_message.drop_fragmentation_frame()
-            if fragmentation_frame.has_begin_fragment_flag():
+            if flags & _BEGIN_FRAGMENT_FLAG:
                 self._fragmented_messages[fragmentation_id] = client_message
             else:
                 existing_message = self._fragmented_messages.get(fragmentation_id, None)
@@ -218,6 +465,6 @@ class ClientMessageBuilder(object):
                     raise socket.error(errno.EIO, "A message without the begin part is received.")
 
                 existing_message.merge(client_message)
-                if fragmentation_frame.has_end_fragment_flag():
+                if flags & _END_FRAGMENT_FLAG:
                     self._message_callback(existing_message)
                     del self._fragmented_messages[fragmentation_id]
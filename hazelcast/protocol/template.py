@@ -0,0 +1,76 @@
+import struct
+
+from hazelcast.protocol.builtin import StringCodec, DataCodec
+from hazelcast.protocol.client_message import OutboundMessage, OutboundBuffer, REQUEST_HEADER_SIZE, \
+    SIZE_OF_FRAME_LENGTH_AND_FLAGS, MIN_EXTERNAL_PAYLOAD_SIZE, _IS_FINAL_FLAG, create_initial_buffer
+
+_FRAME_HEADER = struct.Struct("<iH")
+
+
+class RequestTemplate(object):
+    """
+    Precompiled request of a codec whose parameters are a distributed object name, followed by a key and an
+    optional value. The initial frame and the name frame are encoded once. A request is built by copying them into
+    a buffer allocated at its final size, and patching the fixed size parameters and the key and value frames.
+    The requests are byte by byte the same as the ones of the ``encode_request`` function of the codec.
+    """
+    __slots__ = ("_prefix", "_prefix_size", "_fixed_fields", "_retryable")
+
+    def __init__(self, message_type, name, fixed_fields_format, retryable):
+        """
+        :param message_type: (int), request message type of the codec.
+        :param name: (str), name of the distributed object.
+        :param fixed_fields_format: (str), little endian struct format of the fixed size parameters of the initial frame.
+        :param retryable: (bool), whether the requests are retryable, as in the codec.
+        """
+        self._fixed_fields = struct.Struct(fixed_fields_format)
+        buf = create_initial_buffer(REQUEST_HEADER_SIZE + self._fixed_fields.size, message_type)
+        StringCodec.encode(buf, name)
+        self._prefix = bytes(buf)
+        self._prefix_size = len(buf)
+        self._retryable = retryable
+
+    def encode_request(self, key, value, *fixed_fields):
+        """
+        Encodes a request.
+
+        :param key: (:class:`~hazelcast.serialization.data.Data`), the key.
+        :param value: (:class:`~hazelcast.serialization.data.Data`), the value or ``None`` for the requests without one.
+        :param fixed_fields: values of the fixed size parameters, in the order of the codec.
+        :return: (:class:`~hazelcast.protocol.client_message.OutboundMessage`), the request.
+        """
+        key_size = key.total_size()
+        value_size = value.total_size() if value is not None else 0
+        if key_size >= MIN_EXTERNAL_PAYLOAD_SIZE or value_size >= MIN_EXTERNAL_PAYLOAD_SIZE:
+            return self._encode_with_external_payloads(key, value, fixed_fields)
+
+        key_bytes = key.to_bytes()
+        value_bytes = value.to_bytes() if value is not None else None
+
+        offset = self._prefix_size
+        size = offset + SIZE_OF_FRAME_LENGTH_AND_FLAGS + key_size
+        if value_bytes is not None:
+            size += SIZE_OF_FRAME_LENGTH_AND_FLAGS + value_size
+
+        buf = bytearray(size)
+        buf[:offset] = self._prefix
+        self._fixed_fields.pack_into(buf, REQUEST_HEADER_SIZE, *fixed_fields)
+        _FRAME_HEADER.pack_into(buf, offset, SIZE_OF_FRAME_LENGTH_AND_FLAGS + key_size,
+                                0 if value_bytes is not None else _IS_FINAL_FLAG)
+        offset += SIZE_OF_FRAME_LENGTH_AND_FLAGS
+        buf[offset:offset + key_size] = key_bytes
+        if value_bytes is not None:
+            offset += key_size
+            _FRAME_HEADER.pack_into(buf, offset, SIZE_OF_FRAME_LENGTH_AND_FLAGS + value_size, _IS_FINAL_FLAG)
+            offset += SIZE_OF_FRAME_LENGTH_AND_FLAGS
+            buf[offset:] = value_bytes
+        return OutboundMessage(buf, self._retryable)
+
+    def _encode_with_external_payloads(self, key, value, fixed_fields):
+        # Large payloads are referenced by the message, rather than copied into it
+        buf = OutboundBuffer(self._prefix)
+        self._fixed_fields.pack_into(buf, REQUEST_HEADER_SIZE, *fixed_fields)
+        DataCodec.encode(buf, key, value is None)
+        if value is not None:
+            DataCodec.encode(buf, value, True)
+        return OutboundMessage(buf, self._retryable)
@@ -25,7 +25,10 @@ class Proxy(object):
         self._partition_service = context.partition_service
         serialization_service = context.serialization_service
         self._to_object = serialization_service.to_object
+        self._to_lazy_object = serialization_service.to_lazy_object
         self._to_data = serialization_service.to_data
+        self._key_to_data = serialization_service.key_to_data
+        self._value_to_data = serialization_service.value_to_data
         listener_service = context.listener_service
         self._register_listener = listener_service.register_listener
         self._deregister_listener = listener_service.deregister_listener
@@ -47,24 +50,27 @@ class Proxy(object):
     def __repr__(self):
         return '%s(name="%s")' % (type(self).__name__, self.name)
 
-    def _invoke(self, request, response_handler=_no_op_response_handler):
-        invocation = Invocation(request, response_handler=response_handler)
+    def _invoke(self, request, response_handler=_no_op_response_handler, wait_timeout=None):
+        invocation = Invocation(request, response_handler=response_handler, wait_timeout=wait_timeout)
         self._invocation_service.invoke(invocation)
         return invocation.future
 
-    def _invoke_on_target(self, request, uuid, response_handler=_no_op_response_handler):
-        invocation = Invocation(request, uuid=uuid, response_handler=response_handler)
+    def _invoke_on_target(self, request, uuid, response_handler=_no_op_response_handler, wait_timeout=None):
+        invocation = Invocation(request, uuid=uuid, response_handler=response_handler, wait_timeout=wait_timeout)
         self._invocation_service.invoke(invocation)
         return invocation.future
 
-    def _invoke_on_key(self, request, key_data, response_handler=_no_op_response_handler):
+    def _invoke_on_key(self, request, key_data, response_handler=_no_op_response_handler, wait_timeout=None):
         partition_id = self._partition_service.get_partition_id(key_data)
-        invocation = Invocation(request, partition_id=partition_id, response_handler=response_handler)
+        invocation = Invocation(request, partition_id=partition_id, response_handler=response_handler,
+                                wait_timeout=wait_timeout)
         self._invocation_service.invoke(invocation)
         return invocation.future
 
-    def _invoke_on_partition(self, request, partition_id, response_handler=_no_op_response_handler):
-        invocation = Invocation(request, partition_id=partition_id, response_handler=response_handler)
+    def _invoke_on_partition(self, request, partition_id, response_handler=_no_op_response_handler,
+                             wait_timeout=None):
+        invocation = Invocation(request, partition_id=partition_id, response_handler=response_handler,
+                                wait_timeout=wait_timeout)
         self._invocation_service.invoke(invocation)
         return invocation.future
 
@@ -85,8 +91,9 @@ class PartitionSpecificProxy(Proxy):
         partition_key = context.serialization_service.to_data(string_partition_strategy(self.name))
         self._partition_id = context.partition_service.get_partition_id(partition_key)
 
-    def _invoke(self, request, response_handler=_no_op_response_handler):
-        invocation = Invocation(request, partition_id=self._partition_id, response_handler=response_handler)
+    def _invoke(self, request, response_handler=_no_op_response_handler, wait_timeout=None):
+        invocation = Invocation(request, partition_id=self._partition_id, response_handler=response_handler,
+                                wait_timeout=wait_timeout)
         self._invocation_service.invoke(invocation)
         return invocation.future
 
@@ -101,10 +108,13 @@ class TransactionalProxy(object):
         self._invocation_service = context.invocation_service
         serialization_service = context.serialization_service
         self._to_object = serialization_service.to_object
+        self._to_lazy_object = serialization_service.to_lazy_object
         self._to_data = serialization_service.to_data
+        self._key_to_data = serialization_service.key_to_data
 
-    def _invoke(self, request, response_handler=_no_op_response_handler):
-        invocation = Invocation(request, connection=self.transaction.connection, response_handler=response_handler)
+    def _invoke(self, request, response_handler=_no_op_response_handler, wait_timeout=None):
+        invocation = Invocation(request, connection=self.transaction.connection, response_handler=response_handler,
+                                wait_timeout=wait_timeout)
         self._invocation_service.invoke(invocation)
         return invocation.future
 
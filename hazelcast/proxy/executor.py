@@ -26,13 +26,13 @@ class Executor(Proxy):
         def handler(message):
             return self._to_object(executor_service_submit_to_partition_codec.decode_response(message))
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         task_data = self._to_data(task)
 
         partition_id = self._context.partition_service.get_partition_id(key_data)
         uuid = uuid4()
         request = executor_service_submit_to_partition_codec.encode_request(self.name, uuid, task_data)
-        return self._invoke_on_partition(request, partition_id, handler)
+        return self._invoke_on_partition(request, partition_id, handler, wait_timeout=-1)
 
     def execute_on_member(self, member, task):
         """
@@ -94,4 +94,4 @@ class Executor(Proxy):
             return self._to_object(executor_service_submit_to_member_codec.decode_response(message))
 
         request = executor_service_submit_to_member_codec.encode_request(self.name, uuid, task_data, member_uuid)
-        return self._invoke_on_target(request, member_uuid, handler)
+        return self._invoke_on_target(request, member_uuid, handler, wait_timeout=-1)
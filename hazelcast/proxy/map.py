@@ -16,6 +16,7 @@ from hazelcast.protocol.codec import map_add_entry_listener_codec, map_add_entry
     map_add_interceptor_codec, map_execute_on_all_keys_codec, map_execute_on_key_codec, map_execute_on_keys_codec, \
     map_execute_with_predicate_codec, map_add_near_cache_invalidation_listener_codec, map_add_index_codec, \
     map_set_ttl_codec
+from hazelcast.protocol.template import RequestTemplate
 from hazelcast.proxy.base import Proxy, EntryEvent, EntryEventType, get_entry_listener_flags, MAX_SIZE
 from hazelcast.util import check_not_none, thread_id, to_millis, ImmutableLazyDataList
 from hazelcast import six
@@ -58,6 +59,14 @@ class Map(Proxy):
     def __init__(self, service_name, name, context):
         super(Map, self).__init__(service_name, name, context)
         self._reference_id_generator = context.lock_reference_id_generator
+        # requests of the hot operations are built from templates holding the encoded name
+        self._get_template = RequestTemplate(map_get_codec._REQUEST_MESSAGE_TYPE, name, "<q", True)
+        self._put_template = RequestTemplate(map_put_codec._REQUEST_MESSAGE_TYPE, name, "<qq", False)
+        self._set_template = RequestTemplate(map_set_codec._REQUEST_MESSAGE_TYPE, name, "<qq", False)
+        self._remove_template = RequestTemplate(map_remove_codec._REQUEST_MESSAGE_TYPE, name, "<q", False)
+        self._contains_key_template = RequestTemplate(map_contains_key_codec._REQUEST_MESSAGE_TYPE, name, "<q", True)
+        # bound once, rather than on every get
+        self._get_response_handler = self._decode_get_response
 
     def add_entry_listener(self, include_value=False, key=None, predicate=None, added_func=None, removed_func=None,
                            updated_func=None, evicted_func=None, evict_all_func=None, clear_all_func=None,
@@ -88,12 +97,12 @@ class Map(Proxy):
 
         if key and predicate:
             codec = map_add_entry_listener_to_key_with_predicate_codec
-            key_data = self._to_data(key)
+            key_data = self._key_to_data(key)
             predicate_data = self._to_data(predicate)
             request = codec.encode_request(self.name, key_data, predicate_data, include_value, flags, self._is_smart)
         elif key and not predicate:
             codec = map_add_entry_listener_to_key_codec
-            key_data = self._to_data(key)
+            key_data = self._key_to_data(key)
             request = codec.encode_request(self.name, key_data, include_value, flags, self._is_smart)
         elif not key and predicate:
             codec = map_add_entry_listener_with_predicate_codec
@@ -199,7 +208,7 @@ class Map(Proxy):
         :return: (bool), ``true`` if this map contains an entry for the specified key.
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         return self._contains_key_internal(key_data)
 
     def contains_value(self, value):
@@ -210,7 +219,7 @@ class Map(Proxy):
         :return: (bool), ``true`` if this map contains an entry for the specified value.
         """
         check_not_none(value, "value can't be None")
-        value_data = self._to_data(value)
+        value_data = self._value_to_data(value)
 
         request = map_contains_value_codec.encode_request(self.name, value_data)
         return self._invoke(request, map_contains_value_codec.decode_response)
@@ -233,10 +242,10 @@ class Map(Proxy):
         :param key: (object), key of the mapping to be deleted.
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         return self._delete_internal(key_data)
 
-    def entry_set(self, predicate=None):
+    def entry_set(self, predicate=None, lazy_portables=False):
         """
         Returns a list clone of the mappings contained in this map.
 
@@ -244,19 +253,23 @@ class Map(Proxy):
         The list is NOT backed by the map, so changes to the map are NOT reflected in the list, and vice-versa.**
 
         :param predicate: (Predicate), predicate for the map to filter entries (optional).
+        :param lazy_portables: (bool), if ``true``, Portable keys and values are returned as
+            :class:`~hazelcast.serialization.portable.record.PortableRecord` objects which decode their fields
+            only when they are accessed (optional).
         :return: (Sequence), the list of key-value tuples in the map.
 
         .. seealso:: :class:`~hazelcast.serialization.predicate.Predicate` for more info about predicates.
         """
+        to_object = self._to_lazy_object if lazy_portables else self._to_object
         if predicate:
             def handler(message):
-                return ImmutableLazyDataList(map_entries_with_predicate_codec.decode_response(message), self._to_object)
+                return ImmutableLazyDataList(map_entries_with_predicate_codec.decode_response(message), to_object)
 
             predicate_data = self._to_data(predicate)
             request = map_entries_with_predicate_codec.encode_request(self.name, predicate_data)
         else:
             def handler(message):
-                return ImmutableLazyDataList(map_entry_set_codec.decode_response(message), self._to_object)
+                return ImmutableLazyDataList(map_entry_set_codec.decode_response(message), to_object)
 
             request = map_entry_set_codec.encode_request(self.name)
 
@@ -273,7 +286,7 @@ class Map(Proxy):
         :return: (bool), ``true`` if the key is evicted, ``false`` otherwise.
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         return self._evict_internal(key_data)
 
     def evict_all(self):
@@ -328,7 +341,7 @@ class Map(Proxy):
         :return: (object), result of entry process.
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         return self._execute_on_key_internal(key_data, entry_processor)
 
     def execute_on_keys(self, keys, entry_processor):
@@ -346,7 +359,7 @@ class Map(Proxy):
         key_list = []
         for key in keys:
             check_not_none(key, "key can't be None")
-            key_list.append(self._to_data(key))
+            key_list.append(self._key_to_data(key))
 
         if len(keys) == 0:
             return ImmediateFuture([])
@@ -377,7 +390,7 @@ class Map(Proxy):
         :param key: (object), the key to lock.
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
 
         request = map_force_unlock_codec.encode_request(self.name, key_data,
                                                         self._reference_id_generator.get_and_increment())
@@ -401,7 +414,7 @@ class Map(Proxy):
         :return: (object), the value for the specified key.
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         return self._get_internal(key_data)
 
     def get_all(self, keys):
@@ -425,10 +438,15 @@ class Map(Proxy):
         partition_service = self._context.partition_service
         partition_to_keys = {}
 
+        key_list = []
+        key_data_list = []
         for key in keys:
             check_not_none(key, "key can't be None")
-            key_data = self._to_data(key)
-            partition_id = partition_service.get_partition_id(key_data)
+            key_list.append(key)
+            key_data_list.append(self._key_to_data(key))
+
+        partition_ids = partition_service.get_partition_ids(key_data_list)
+        for key, key_data, partition_id in zip(key_list, key_data_list, partition_ids):
             try:
                 partition_to_keys[partition_id][key] = key_data
             except KeyError:
@@ -464,7 +482,7 @@ class Map(Proxy):
             entry_view.value = self._to_object(entry_view.value)
             return entry_view
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = map_get_entry_view_codec.encode_request(self.name, key_data, thread_id())
         return self._invoke_on_key(request, key_data, handler)
 
@@ -488,7 +506,7 @@ class Map(Proxy):
         :return: (bool), ``true`` if lock is acquired, ``false`` otherwise.
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
 
         request = map_is_locked_codec.encode_request(self.name, key_data)
         return self._invoke_on_key(request, key_data, map_is_locked_codec.decode_response)
@@ -559,12 +577,12 @@ class Map(Proxy):
         :param ttl: (int), time in seconds to wait before releasing the lock (optional).
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
 
         request = map_lock_codec.encode_request(self.name, key_data, thread_id(), to_millis(ttl),
                                                 self._reference_id_generator.get_and_increment())
         partition_id = self._context.partition_service.get_partition_id(key_data)
-        invocation = Invocation(request, partition_id=partition_id, timeout=MAX_SIZE)
+        invocation = Invocation(request, partition_id=partition_id, timeout=MAX_SIZE, wait_timeout=-1)
         self._invocation_service.invoke(invocation)
         return invocation.future
 
@@ -589,8 +607,8 @@ class Map(Proxy):
         """
         check_not_none(key, "key can't be None")
         check_not_none(value, "value can't be None")
-        key_data = self._to_data(key)
-        value_data = self._to_data(value)
+        key_data = self._key_to_data(key)
+        value_data = self._value_to_data(value)
         return self._put_internal(key_data, value_data, ttl)
 
     def put_all(self, map):
@@ -607,11 +625,14 @@ class Map(Proxy):
         partition_service = self._context.partition_service
         partition_map = {}
 
+        entries = []
         for key, value in six.iteritems(map):
             check_not_none(key, "key can't be None")
             check_not_none(value, "value can't be None")
-            entry = (self._to_data(key), self._to_data(value))
-            partition_id = partition_service.get_partition_id(entry[0])
+            entries.append((self._key_to_data(key), self._value_to_data(value)))
+
+        partition_ids = partition_service.get_partition_ids([entry[0] for entry in entries])
+        for entry, partition_id in zip(entries, partition_ids):
             try:
                 partition_map[partition_id].append(entry)
             except KeyError:
@@ -653,8 +674,8 @@ class Map(Proxy):
         check_not_none(key, "key can't be None")
         check_not_none(value, "value can't be None")
 
-        key_data = self._to_data(key)
-        value_data = self._to_data(value)
+        key_data = self._key_to_data(key)
+        value_data = self._value_to_data(value)
         return self._put_if_absent_internal(key_data, value_data, ttl)
 
     def put_transient(self, key, value, ttl=-1):
@@ -672,8 +693,8 @@ class Map(Proxy):
         check_not_none(key, "key can't be None")
         check_not_none(value, "value can't be None")
 
-        key_data = self._to_data(key)
-        value_data = self._to_data(value)
+        key_data = self._key_to_data(key)
+        value_data = self._value_to_data(value)
         return self._put_transient_internal(key_data, value_data, ttl)
 
     def remove(self, key):
@@ -688,7 +709,7 @@ class Map(Proxy):
         :return: (object), the previous value associated with key, or ``None`` if there was no mapping for key.
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         return self._remove_internal(key_data)
 
     def remove_if_same(self, key, value):
@@ -713,8 +734,8 @@ class Map(Proxy):
         check_not_none(key, "key can't be None")
         check_not_none(value, "value can't be None")
 
-        key_data = self._to_data(key)
-        value_data = self._to_data(value)
+        key_data = self._key_to_data(key)
+        value_data = self._value_to_data(value)
         return self._remove_if_same_internal_(key_data, value_data)
 
     def remove_entry_listener(self, registration_id):
@@ -751,8 +772,8 @@ class Map(Proxy):
         check_not_none(key, "key can't be None")
         check_not_none(value, "value can't be None")
 
-        key_data = self._to_data(key)
-        value_data = self._to_data(value)
+        key_data = self._key_to_data(key)
+        value_data = self._value_to_data(value)
 
         return self._replace_internal(key_data, value_data)
 
@@ -780,9 +801,9 @@ class Map(Proxy):
         check_not_none(old_value, "old_value can't be None")
         check_not_none(new_value, "new_value can't be None")
 
-        key_data = self._to_data(key)
-        old_value_data = self._to_data(old_value)
-        new_value_data = self._to_data(new_value)
+        key_data = self._key_to_data(key)
+        old_value_data = self._value_to_data(old_value)
+        new_value_data = self._value_to_data(new_value)
 
         return self._replace_if_same_internal(key_data, old_value_data, new_value_data)
 
@@ -801,8 +822,8 @@ class Map(Proxy):
         """
         check_not_none(key, "key can't be None")
         check_not_none(value, "value can't be None")
-        key_data = self._to_data(key)
-        value_data = self._to_data(value)
+        key_data = self._key_to_data(key)
+        value_data = self._value_to_data(value)
         return self._set_internal(key_data, value_data, ttl)
 
     def set_ttl(self, key, ttl):
@@ -816,7 +837,7 @@ class Map(Proxy):
         """
         check_not_none(key, "key can't be None")
         check_not_none(ttl, "ttl can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         return self._set_ttl_internal(key_data, ttl)
 
     def size(self):
@@ -847,13 +868,13 @@ class Map(Proxy):
         """
         check_not_none(key, "key can't be None")
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = map_try_lock_codec.encode_request(self.name, key_data, thread_id(),
                                                     to_millis(ttl), to_millis(timeout),
                                                     self._reference_id_generator.get_and_increment())
         partition_id = self._context.partition_service.get_partition_id(key_data)
         invocation = Invocation(request, partition_id=partition_id, timeout=MAX_SIZE,
-                                response_handler=map_try_lock_codec.decode_response)
+                                response_handler=map_try_lock_codec.decode_response, wait_timeout=timeout)
         self._invocation_service.invoke(invocation)
         return invocation.future
 
@@ -870,8 +891,8 @@ class Map(Proxy):
         check_not_none(key, "key can't be None")
         check_not_none(value, "value can't be None")
 
-        key_data = self._to_data(key)
-        value_data = self._to_data(value)
+        key_data = self._key_to_data(key)
+        value_data = self._value_to_data(value)
 
         return self._try_put_internal(key_data, value_data, timeout)
 
@@ -886,7 +907,7 @@ class Map(Proxy):
         """
         check_not_none(key, "key can't be None")
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         return self._try_remove_internal(key_data, timeout)
 
     def unlock(self, key):
@@ -898,12 +919,12 @@ class Map(Proxy):
         """
         check_not_none(key, "key can't be None")
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = map_unlock_codec.encode_request(self.name, key_data, thread_id(),
                                                   self._reference_id_generator.get_and_increment())
         return self._invoke_on_key(request, key_data)
 
-    def values(self, predicate=None):
+    def values(self, predicate=None, lazy_portables=False):
         """
         Returns a list clone of the values contained in this map or values of the entries which are filtered with
         the predicate if provided.
@@ -913,19 +934,23 @@ class Map(Proxy):
         vice-versa.**
 
         :param predicate: (Predicate), predicate to filter the entries (optional).
+        :param lazy_portables: (bool), if ``true``, Portable values are returned as
+            :class:`~hazelcast.serialization.portable.record.PortableRecord` objects which decode their fields
+            only when they are accessed (optional).
         :return: (Sequence), a list of clone of the values contained in this map.
 
         .. seealso:: :class:`~hazelcast.serialization.predicate.Predicate` for more info about predicates.
         """
+        to_object = self._to_lazy_object if lazy_portables else self._to_object
         if predicate:
             def handler(message):
-                return ImmutableLazyDataList(map_values_with_predicate_codec.decode_response(message), self._to_object)
+                return ImmutableLazyDataList(map_values_with_predicate_codec.decode_response(message), to_object)
 
             predicate_data = self._to_data(predicate)
             request = map_values_with_predicate_codec.encode_request(self.name, predicate_data)
         else:
             def handler(message):
-                return ImmutableLazyDataList(map_values_codec.decode_response(message), self._to_object)
+                return ImmutableLazyDataList(map_values_codec.decode_response(message), to_object)
 
             request = map_values_codec.encode_request(self.name)
 
@@ -933,15 +958,15 @@ class Map(Proxy):
 
     # internals
     def _contains_key_internal(self, key_data):
-        request = map_contains_key_codec.encode_request(self.name, key_data, thread_id())
+        request = self._contains_key_template.encode_request(key_data, None, thread_id())
         return self._invoke_on_key(request, key_data, map_contains_key_codec.decode_response)
 
     def _get_internal(self, key_data):
-        def handler(message):
-            return self._to_object(map_get_codec.decode_response(message))
+        request = self._get_template.encode_request(key_data, None, thread_id())
+        return self._invoke_on_key(request, key_data, self._get_response_handler)
 
-        request = map_get_codec.encode_request(self.name, key_data, thread_id())
-        return self._invoke_on_key(request, key_data, handler)
+    def _decode_get_response(self, message):
+        return self._to_object(map_get_codec.decode_response(message))
 
     def _get_all_internal(self, partition_to_keys, futures=None):
         if futures is None:
@@ -964,7 +989,7 @@ class Map(Proxy):
         def handler(message):
             return self._to_object(map_remove_codec.decode_response(message))
 
-        request = map_remove_codec.encode_request(self.name, key_data, thread_id())
+        request = self._remove_template.encode_request(key_data, None, thread_id())
         return self._invoke_on_key(request, key_data, handler)
 
     def _remove_if_same_internal_(self, key_data, value_data):
@@ -979,11 +1004,11 @@ class Map(Proxy):
         def handler(message):
             return self._to_object(map_put_codec.decode_response(message))
 
-        request = map_put_codec.encode_request(self.name, key_data, value_data, thread_id(), to_millis(ttl))
+        request = self._put_template.encode_request(key_data, value_data, thread_id(), to_millis(ttl))
         return self._invoke_on_key(request, key_data, handler)
 
     def _set_internal(self, key_data, value_data, ttl):
-        request = map_set_codec.encode_request(self.name, key_data, value_data, thread_id(), to_millis(ttl))
+        request = self._set_template.encode_request(key_data, value_data, thread_id(), to_millis(ttl))
         return self._invoke_on_key(request, key_data)
 
     def _set_ttl_internal(self, key_data, ttl):
@@ -992,11 +1017,11 @@ class Map(Proxy):
 
     def _try_remove_internal(self, key_data, timeout):
         request = map_try_remove_codec.encode_request(self.name, key_data, thread_id(), to_millis(timeout))
-        return self._invoke_on_key(request, key_data, map_try_remove_codec.decode_response)
+        return self._invoke_on_key(request, key_data, map_try_remove_codec.decode_response, wait_timeout=timeout)
 
     def _try_put_internal(self, key_data, value_data, timeout):
         request = map_try_put_codec.encode_request(self.name, key_data, value_data, thread_id(), to_millis(timeout))
-        return self._invoke_on_key(request, key_data, map_try_put_codec.decode_response)
+        return self._invoke_on_key(request, key_data, map_try_put_codec.decode_response, wait_timeout=timeout)
 
     def _put_transient_internal(self, key_data, value_data, ttl):
         request = map_put_transient_codec.encode_request(self.name, key_data, value_data, thread_id(), to_millis(ttl))
@@ -1115,12 +1140,14 @@ class MapFeatNearCache(Map):
             value = self._near_cache[key_data]
             return ImmediateFuture(value)
         except KeyError:
-            future = super(MapFeatNearCache, self)._get_internal(key_data)
-            return future.continue_with(self._update_cache, key_data)
-
-    def _update_cache(self, f, key_data):
-        self._near_cache.__setitem__(key_data, f.result())
-        return f.result()
+            # The value is cached by the response handler, rather than by a continuation of the invocation future
+            request = self._get_template.encode_request(key_data, None, thread_id())
+            return self._invoke_on_key(request, key_data, lambda message: self._update_cache(key_data, message))
+
+    def _update_cache(self, key_data, message):
+        value = self._decode_get_response(message)
+        self._near_cache.__setitem__(key_data, value)
+        return value
 
     def _get_all_internal(self, partition_to_keys, futures=None):
         if futures is None:
@@ -30,7 +30,7 @@ class MultiMap(Proxy):
         """
         if key:
             codec = multi_map_add_entry_listener_to_key_codec
-            key_data = self._to_data(key)
+            key_data = self._key_to_data(key)
             request = codec.encode_request(self.name, key_data, include_value, False)
         else:
             codec = multi_map_add_entry_listener_codec
@@ -62,7 +62,7 @@ class MultiMap(Proxy):
         :return: (bool), ``true`` if this multimap contains an entry for the specified key.
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         
         request = multi_map_contains_key_codec.encode_request(self.name, key_data, thread_id())
         return self._invoke_on_key(request, key_data, multi_map_contains_key_codec.decode_response)
@@ -89,7 +89,7 @@ class MultiMap(Proxy):
         """
         check_not_none(key, "key can't be None")
         check_not_none(value, "value can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         value_data = self._to_data(value)
         
         request = multi_map_contains_entry_codec.encode_request(self.name, key_data, value_data, thread_id())
@@ -137,7 +137,7 @@ class MultiMap(Proxy):
         def handler(message):
             return ImmutableLazyDataList(multi_map_get_codec.decode_response(message), self._to_object)
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = multi_map_get_codec.encode_request(self.name, key_data, thread_id())
         return self._invoke_on_key(request, key_data, handler)
 
@@ -152,7 +152,7 @@ class MultiMap(Proxy):
         :return: (bool), ``true`` if lock is acquired, false otherwise.
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
 
         request = multi_map_is_locked_codec.encode_request(self.name, key_data)
         return self._invoke_on_key(request, key_data, multi_map_is_locked_codec.decode_response)
@@ -168,7 +168,7 @@ class MultiMap(Proxy):
         :param key: (object), the key to lock.
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = multi_map_force_unlock_codec.encode_request(self.name, key_data,
                                                               self._reference_id_generator.get_and_increment())
         return self._invoke_on_key(request, key_data)
@@ -207,10 +207,10 @@ class MultiMap(Proxy):
         :param lease_time: (int), time in seconds to wait before releasing the lock (optional).
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = multi_map_lock_codec.encode_request(self.name, key_data, thread_id(), to_millis(lease_time),
                                                       self._reference_id_generator.get_and_increment())
-        return self._invoke_on_key(request, key_data)
+        return self._invoke_on_key(request, key_data, wait_timeout=-1)
 
     def remove(self, key, value):
         """
@@ -225,7 +225,7 @@ class MultiMap(Proxy):
         """
         check_not_none(key, "key can't be None")
         check_not_none(key, "value can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         value_data = self._to_data(value)
         request = multi_map_remove_entry_codec.encode_request(self.name, key_data, value_data, thread_id())
         return self._invoke_on_key(request, key_data, multi_map_remove_entry_codec.decode_response)
@@ -249,7 +249,7 @@ class MultiMap(Proxy):
         def handler(message):
             return ImmutableLazyDataList(multi_map_remove_codec.decode_response(message), self._to_object)
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = multi_map_remove_codec.encode_request(self.name, key_data, thread_id())
         return self._invoke_on_key(request, key_data, handler)
 
@@ -267,7 +267,7 @@ class MultiMap(Proxy):
         """
         check_not_none(key, "key can't be None")
         check_not_none(value, "value can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         value_data = self._to_data(value)
         request = multi_map_put_codec.encode_request(self.name, key_data, value_data, thread_id())
         return self._invoke_on_key(request, key_data, multi_map_put_codec.decode_response)
@@ -301,7 +301,7 @@ class MultiMap(Proxy):
         :return: (int), the number of values that match the given key in the multimap.
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = multi_map_value_count_codec.encode_request(self.name, key_data, thread_id())
         return self._invoke_on_key(request, key_data, multi_map_value_count_codec.decode_response)
 
@@ -339,11 +339,12 @@ class MultiMap(Proxy):
         :return: (bool), ``true`` if the lock was acquired and otherwise, false.
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = multi_map_try_lock_codec.encode_request(self.name, key_data, thread_id(),
                                                           to_millis(lease_time), to_millis(timeout),
                                                           self._reference_id_generator.get_and_increment())
-        return self._invoke_on_key(request, key_data, multi_map_try_lock_codec.decode_response)
+        return self._invoke_on_key(request, key_data, multi_map_try_lock_codec.decode_response,
+                                   wait_timeout=timeout)
 
     def unlock(self, key):
         """
@@ -355,7 +356,7 @@ class MultiMap(Proxy):
         :param key: (object), the key to lock.
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = multi_map_unlock_codec.encode_request(self.name, key_data, thread_id(),
                                                         self._reference_id_generator.get_and_increment())
         return self._invoke_on_key(request, key_data)
\ No newline at end of file
@@ -185,7 +185,7 @@ class Queue(PartitionSpecificProxy):
         check_not_none(item, "Value can't be None")
         element_data = self._to_data(item)
         request = queue_offer_codec.encode_request(self.name, element_data, to_millis(timeout))
-        return self._invoke(request, queue_offer_codec.decode_response)
+        return self._invoke(request, queue_offer_codec.decode_response, wait_timeout=timeout)
 
     def peek(self):
         """
@@ -213,7 +213,7 @@ class Queue(PartitionSpecificProxy):
             return self._to_object(queue_poll_codec.decode_response(message))
 
         request = queue_poll_codec.encode_request(self.name, to_millis(timeout))
-        return self._invoke(request, handler)
+        return self._invoke(request, handler, wait_timeout=timeout)
 
     def put(self, item):
         """
@@ -225,7 +225,7 @@ class Queue(PartitionSpecificProxy):
         check_not_none(item, "Value can't be None")
         element_data = self._to_data(item)
         request = queue_put_codec.encode_request(self.name, element_data)
-        return self._invoke(request)
+        return self._invoke(request, wait_timeout=-1)
 
     def remaining_capacity(self):
         """
@@ -309,4 +309,4 @@ class Queue(PartitionSpecificProxy):
             return self._to_object(queue_take_codec.decode_response(message))
 
         request = queue_take_codec.encode_request(self.name)
-        return self._invoke(request, handler)
+        return self._invoke(request, handler, wait_timeout=-1)
@@ -46,12 +46,12 @@ class ReplicatedMap(Proxy):
         """
         if key and predicate:
             codec = replicated_map_add_entry_listener_to_key_with_predicate_codec
-            key_data = self._to_data(key)
+            key_data = self._key_to_data(key)
             predicate_data = self._to_data(predicate)
             request = codec.encode_request(self.name, key_data, predicate_data, self._is_smart)
         elif key and not predicate:
             codec = replicated_map_add_entry_listener_to_key_codec
-            key_data = self._to_data(key)
+            key_data = self._key_to_data(key)
             request = codec.encode_request(self.name, key_data, self._is_smart)
         elif not key and predicate:
             codec = replicated_map_add_entry_listener_with_predicate_codec
@@ -99,7 +99,7 @@ class ReplicatedMap(Proxy):
         :return: (bool), ``true`` if this map contains an entry for the specified key.
         """
         check_not_none(key, "key can't be None")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = replicated_map_contains_key_codec.encode_request(self.name, key_data)
         return self._invoke_on_key(request, key_data, replicated_map_contains_key_codec.decode_response)
 
@@ -147,7 +147,7 @@ replicated_map_contains_value_codec.decode_response)
         def handler(message):
             return self._to_object(replicated_map_get_codec.decode_response(message))
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = replicated_map_get_codec.encode_request(self.name, key_data)
         return self._invoke_on_key(request, key_data, handler)
 
@@ -193,7 +193,7 @@ replicated_map_contains_value_codec.decode_response)
         def handler(message):
             return self._to_object(replicated_map_put_codec.decode_response(message))
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         value_data = self._to_data(value)
         request = replicated_map_put_codec.encode_request(self.name, key_data, value_data, to_millis(ttl))
         return self._invoke_on_key(request, key_data, handler)
@@ -209,7 +209,7 @@ replicated_map_contains_value_codec.decode_response)
         for key, value in six.iteritems(source):
             check_not_none(key, "key can't be None")
             check_not_none(value, "value can't be None")
-            entries.append((self._to_data(key), self._to_data(value)))
+            entries.append((self._key_to_data(key), self._to_data(value)))
 
         request = replicated_map_put_all_codec.encode_request(self.name, entries)
         return self._invoke(request)
@@ -230,7 +230,7 @@ replicated_map_contains_value_codec.decode_response)
         def handler(message):
             return self._to_object(replicated_map_remove_codec.decode_response(message))
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = replicated_map_remove_codec.encode_request(self.name, key_data)
         return self._invoke_on_key(request, key_data, handler)
 
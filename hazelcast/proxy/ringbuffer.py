@@ -158,7 +158,7 @@ class Ringbuffer(PartitionSpecificProxy):
             return self._to_object(ringbuffer_read_one_codec.decode_response(message))
 
         request = ringbuffer_read_one_codec.encode_request(self.name, sequence)
-        return self._invoke(request, handler)
+        return self._invoke(request, handler, wait_timeout=-1)
 
     def read_many(self, start_sequence, min_count, max_count):
         """
@@ -187,7 +187,7 @@ class Ringbuffer(PartitionSpecificProxy):
                 capacity = capacity.result()
                 check_true(min_count <= capacity, "min count: %d should be smaller or equal to capacity: %d"
                            % (min_count, capacity))
-                f = self._invoke(request, handler)
+                f = self._invoke(request, handler, wait_timeout=-1)
                 f.add_done_callback(set_result)
             except Exception as e:
                 future.set_exception(e)
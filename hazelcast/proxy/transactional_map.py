@@ -21,7 +21,7 @@ class TransactionalMap(TransactionalProxy):
         :return: (bool), ``true`` if this map contains an entry for the specified key, ``false`` otherwise.
         """
         check_not_none(key, "key can't be none")
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = transactional_map_contains_key_codec.encode_request(self.name, self.transaction.id, thread_id(),
                                                                       key_data)
         return self._invoke(request, transactional_map_contains_key_codec.decode_response)
@@ -38,7 +38,7 @@ class TransactionalMap(TransactionalProxy):
         def handler(message):
             return self._to_object(transactional_map_get_codec.decode_response(message))
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = transactional_map_get_codec.encode_request(self.name, self.transaction.id, thread_id(), key_data)
         return self._invoke(request, handler)
 
@@ -58,7 +58,7 @@ class TransactionalMap(TransactionalProxy):
         def handler(message):
             return self._to_object(transactional_map_get_for_update_codec.decode_response(message))
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = transactional_map_get_for_update_codec.encode_request(self.name, self.transaction.id, thread_id(),
                                                                         key_data)
         return self._invoke(request, handler)
@@ -99,7 +99,7 @@ class TransactionalMap(TransactionalProxy):
         def handler(message):
             return self._to_object(transactional_map_put_codec.decode_response(message))
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         value_data = self._to_data(value)
         request = transactional_map_put_codec.encode_request(self.name, self.transaction.id, thread_id(), key_data,
                                                              value_data, to_millis(ttl))
@@ -123,7 +123,7 @@ class TransactionalMap(TransactionalProxy):
         def handler(message):
             return self._to_object(transactional_map_put_if_absent_codec.decode_response(message))
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         value_data = self._to_data(value)
         request = transactional_map_put_if_absent_codec.encode_request(self.name, self.transaction.id, thread_id(),
                                                                        key_data, value_data)
@@ -142,7 +142,7 @@ class TransactionalMap(TransactionalProxy):
         check_not_none(key, "key can't be none")
         check_not_none(value, "value can't be none")
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         value_data = self._to_data(value)
         request = transactional_map_set_codec.encode_request(self.name, self.transaction.id,
                                                              thread_id(), key_data, value_data)
@@ -165,7 +165,7 @@ class TransactionalMap(TransactionalProxy):
         def handler(message):
             return self._to_object(transactional_map_replace_codec.decode_response(message))
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         value_data = self._to_data(value)
         request = transactional_map_replace_codec.encode_request(self.name, self.transaction.id, thread_id(),
                                                                  key_data, value_data)
@@ -188,7 +188,7 @@ class TransactionalMap(TransactionalProxy):
         check_not_none(old_value, "old_value can't be none")
         check_not_none(new_value, "new_value can't be none")
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         old_value_data = self._to_data(old_value)
         new_value_data = self._to_data(new_value)
         request = transactional_map_replace_if_same_codec.encode_request(self.name, self.transaction.id, thread_id(),
@@ -210,7 +210,7 @@ class TransactionalMap(TransactionalProxy):
         def handler(message):
             return self._to_object(transactional_map_remove_codec.decode_response(message))
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = transactional_map_remove_codec.encode_request(self.name, self.transaction.id, thread_id(), key_data)
         return self._invoke(request, handler)
 
@@ -230,7 +230,7 @@ class TransactionalMap(TransactionalProxy):
         check_not_none(key, "key can't be none")
         check_not_none(value, "value can't be none")
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         value_data = self._to_data(value)
         request = transactional_map_remove_if_same_codec.encode_request(self.name, self.transaction.id, thread_id(),
                                                                         key_data, value_data)
@@ -247,7 +247,7 @@ class TransactionalMap(TransactionalProxy):
         """
         check_not_none(key, "key can't be none")
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = transactional_map_delete_codec.encode_request(self.name, self.transaction.id, thread_id(), key_data)
         return self._invoke(request)
 
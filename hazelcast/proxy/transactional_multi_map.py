@@ -22,7 +22,7 @@ class TransactionalMultiMap(TransactionalProxy):
         check_not_none(key, "key can't be none")
         check_not_none(value, "value can't be none")
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         value_data = self._to_data(value)
         request = transactional_multi_map_put_codec.encode_request(self.name, self.transaction.id,
                                                                    thread_id(), key_data, value_data)
@@ -40,7 +40,7 @@ class TransactionalMultiMap(TransactionalProxy):
         def handler(message):
             return ImmutableLazyDataList(transactional_multi_map_get_codec.decode_response(message), self._to_object)
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = transactional_multi_map_get_codec.encode_request(self.name, self.transaction.id, thread_id(),
                                                                    key_data)
         return self._invoke(request, handler)
@@ -57,7 +57,7 @@ class TransactionalMultiMap(TransactionalProxy):
         check_not_none(key, "key can't be none")
         check_not_none(value, "value can't be none")
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         value_data = self._to_data(value)
         request = transactional_multi_map_remove_entry_codec.encode_request(self.name, self.transaction.id,
                                                                             thread_id(), key_data, value_data)
@@ -76,7 +76,7 @@ class TransactionalMultiMap(TransactionalProxy):
         def handler(message):
             return ImmutableLazyDataList(transactional_multi_map_remove_codec.decode_response(message), self._to_object)
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = transactional_multi_map_remove_codec.encode_request(self.name, self.transaction.id, thread_id(),
                                                                       key_data)
         return self._invoke(request, handler)
@@ -91,7 +91,7 @@ class TransactionalMultiMap(TransactionalProxy):
         """
         check_not_none(key, "key can't be none")
 
-        key_data = self._to_data(key)
+        key_data = self._key_to_data(key)
         request = transactional_multi_map_value_count_codec.encode_request(self.name, self.transaction.id, thread_id(),
                                                                            key_data)
         return self._invoke(request, transactional_multi_map_value_count_codec.decode_response)
@@ -21,7 +21,7 @@ class TransactionalQueue(TransactionalProxy):
         item_data = self._to_data(item)
         request = transactional_queue_offer_codec.encode_request(self.name, self.transaction.id, thread_id(),
                                                                  item_data, to_millis(timeout))
-        return self._invoke(request, transactional_queue_offer_codec.decode_response)
+        return self._invoke(request, transactional_queue_offer_codec.decode_response, wait_timeout=timeout)
 
     def take(self):
         """
@@ -33,7 +33,7 @@ class TransactionalQueue(TransactionalProxy):
             return self._to_object(transactional_queue_take_codec.decode_response(message))
 
         request = transactional_queue_take_codec.encode_request(self.name, self.transaction.id, thread_id())
-        return self._invoke(request, handler)
+        return self._invoke(request, handler, wait_timeout=-1)
 
     def poll(self, timeout=0):
         """
@@ -48,7 +48,7 @@ class TransactionalQueue(TransactionalProxy):
 
         request = transactional_queue_poll_codec.encode_request(self.name, self.transaction.id, thread_id(),
                                                                 to_millis(timeout))
-        return self._invoke(request, handler)
+        return self._invoke(request, handler, wait_timeout=timeout)
 
     def peek(self, timeout=0):
         """
@@ -63,7 +63,7 @@ class TransactionalQueue(TransactionalProxy):
 
         request = transactional_queue_peek_codec.encode_request(self.name, self.transaction.id, thread_id(),
                                                                 to_millis(timeout))
-        return self._invoke(request, handler)
+        return self._invoke(request, handler, wait_timeout=timeout)
 
     def size(self):
         """
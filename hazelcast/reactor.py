@@ -8,35 +8,317 @@ import threading
 import time
 
 from collections import deque
-from functools import total_ordering
 
 from hazelcast import six
-from hazelcast.config import PROTOCOL
-from hazelcast.connection import Connection
+from hazelcast.config import ClientProperties
+from hazelcast.connection import Connection, create_ssl_context
 from hazelcast.core import Address
 from hazelcast.errors import HazelcastError
 from hazelcast.future import Future
-from hazelcast.six.moves import queue
 
 try:
     import ssl
 except ImportError:
     ssl = None
 
+try:
+    import selectors
+except ImportError:
+    # Python 2 does not ship with the selectors module.
+    # Reactor falls back to the asyncore loop in that case.
+    selectors = None
+
 
 class AsyncoreReactor(object):
+    _timer_thread = None
+    _is_live = False
+    logger = logging.getLogger("HazelcastClient.AsyncoreReactor")
+
+    def __init__(self, properties, logger_extras):
+        self._logger_extras = logger_extras
+        self._write_max_bytes = properties.get_int(ClientProperties.IO_WRITE_COALESCING_MAX_BYTES)
+        self._write_max_messages = properties.get_int(ClientProperties.IO_WRITE_COALESCING_MAX_MESSAGES)
+        self._write_high_water_mark = properties.get_int(ClientProperties.IO_WRITE_QUEUE_HIGH_WATER_MARK_BYTES)
+        self._write_low_water_mark = properties.get_int(ClientProperties.IO_WRITE_QUEUE_LOW_WATER_MARK_BYTES)
+        self._max_frame_size = properties.get_int(ClientProperties.IO_MAX_FRAME_SIZE)
+        io_thread_count = max(properties.get_int(ClientProperties.IO_THREAD_COUNT), 1)
+        self._io_loops = [_IOLoop(i, logger_extras) for i in range(io_thread_count)]
+        self._timers = _TimingWheel(_TIMER_TICK_DURATION, _TIMER_WHEEL_SIZE)
+        self._timer_condition = threading.Condition(threading.Lock())
+        self._next_timer_check = None
+        self._scheduled_timers = 0
+        self._expired_timers = 0
+        self._canceled_timers = 0
+        self._total_timer_lateness = 0.0
+        self._max_timer_lateness = 0.0
+
+    def start(self):
+        self._is_live = True
+        for io_loop in self._io_loops:
+            io_loop.start()
+        self._timer_thread = threading.Thread(target=self._run_timers, name="hazelcast-reactor-timer")
+        self._timer_thread.daemon = True
+        self._timer_thread.start()
+
+    def _run_timers(self):
+        self.logger.debug("Starting Timer Thread", extra=self._logger_extras)
+        Future._threading_locals.is_reactor_thread = True
+        condition = self._timer_condition
+        while self._is_live:
+            with condition:
+                timeout = self._get_poll_timeout()
+                if timeout is None or timeout > 0:
+                    self._next_timer_check = None if timeout is None else time.time() + timeout
+                    condition.wait(timeout)
+                self._next_timer_check = None
+
+            if not self._is_live:
+                break
+
+            self._check_timers()
+        self.logger.debug("Timer Thread exited. %s" % self._timers.count, extra=self._logger_extras)
+        self._cleanup_all_timers()
+
+    def _get_poll_timeout(self):
+        deadline = self._timers.next_deadline()
+        if deadline is None:
+            # No timers, block until a timer is added
+            return None
+        return max(deadline - time.time(), 0)
+
+    def _check_timers(self):
+        now = time.time()
+        with self._timer_condition:
+            expired = self._timers.expire(now)
+
+        for timer in expired:
+            if timer.canceled:
+                continue
+
+            lateness = now - timer.end
+            self._expired_timers += 1
+            self._total_timer_lateness += lateness
+            if lateness > self._max_timer_lateness:
+                self._max_timer_lateness = lateness
+
+            try:
+                timer.timer_ended_cb()
+            except:
+                self.logger.exception("Error in Timer Thread", extra=self._logger_extras)
+
+    def add_timer_absolute(self, timeout, callback):
+        timer = Timer(timeout, callback, self._cleanup_timer)
+        with self._timer_condition:
+            self._timers.add(timer)
+            self._scheduled_timers += 1
+            # Wake up the timer thread only if it sleeps past the new timer
+            next_check = self._next_timer_check
+            if next_check is None or timeout < next_check:
+                self._timer_condition.notify()
+        return timer
+
+    def add_timer(self, delay, callback):
+        return self.add_timer_absolute(delay + time.time(), callback)
+
+    def get_timer_statistics(self):
+        """
+        Returns the statistics of the timers.
+
+        :return: (Dict), Dictionary that stores the number of pending, scheduled, expired and
+            canceled timers along with the average and maximum lateness of the expired timers in seconds.
+        """
+        expired = self._expired_timers
+        return {
+            "pending": self._timers.count,
+            "scheduled": self._scheduled_timers,
+            "expired": expired,
+            "canceled": self._canceled_timers,
+            "average_lateness": self._total_timer_lateness / expired if expired else 0.0,
+            "max_lateness": self._max_timer_lateness,
+        }
+
+    def shutdown(self):
+        if not self._is_live:
+            return
+
+        self._is_live = False
+
+        with self._timer_condition:
+            self._timer_condition.notify()
+
+        current_thread = threading.current_thread()
+        for io_loop in self._io_loops:
+            io_loop.stop(current_thread)
+
+        if self._timer_thread is not current_thread:
+            self._timer_thread.join()
+
+        for io_loop in self._io_loops:
+            io_loop.close()
+
+    def connection_factory(self, connection_manager, connection_id, address, network_config, message_callback):
+        # In the smart client mode, there is a connection per member. Assigning
+        # each new connection to the least loaded thread spreads the members
+        # evenly across the threads. A connection never moves to another thread,
+        # which preserves the order of its reads and writes.
+        io_loop = min(self._io_loops, key=lambda l: l.connection_count())
+        return AsyncoreConnection(io_loop.map, io_loop.wake_up, connection_manager, connection_id, address,
+                                  network_config, message_callback, self._write_max_bytes,
+                                  self._write_max_messages, self._write_high_water_mark,
+                                  self._write_low_water_mark, self._max_frame_size, self._logger_extras)
+
+    def _cleanup_timer(self, timer):
+        with self._timer_condition:
+            if self._timers.remove(timer):
+                self._canceled_timers += 1
+
+    def _cleanup_all_timers(self):
+        with self._timer_condition:
+            timers = self._timers.clear()
+
+        for timer in timers:
+            timer.timer_ended_cb()
+
+
+# Timers are bucketed into the slots of the wheel with this resolution, in seconds
+_TIMER_TICK_DURATION = 0.01
+
+# Number of the slots of the wheel, must be a power of two.
+# Covers 5.12 seconds ahead with a single rotation.
+_TIMER_WHEEL_SIZE = 512
+
+
+class _TimingWheel(object):
+    """
+    Hashed timing wheel, which adds and removes timers in constant time.
+
+    Each slot of the wheel is a set of timers whose deadlines fall into the same tick,
+    modulo the size of the wheel. Timers which are more than a rotation ahead share the
+    slots with the nearer ones and they are skipped until their deadlines pass.
+
+    It is not thread-safe, callers should synchronize the access.
+    """
+
+    def __init__(self, tick_duration, wheel_size):
+        self._tick_duration = tick_duration
+        self._mask = wheel_size - 1
+        self._slots = [set() for _ in range(wheel_size)]
+        self._start = time.time()
+        self._current_tick = 0
+        self.count = 0
+
+    def add(self, timer):
+        # Timers whose deadlines are already passed go to the current slot
+        tick = max(self._tick_of(timer.end), self._current_tick)
+        timer.tick = tick
+        self._slots[tick & self._mask].add(timer)
+        self.count += 1
+
+    def remove(self, timer):
+        """
+        :return: (bool), ``True`` if the timer was in the wheel, ``False`` if it is expired or removed before.
+        """
+        slot = self._slots[timer.tick & self._mask]
+        if timer not in slot:
+            return False
+        slot.remove(timer)
+        self.count -= 1
+        return True
+
+    def expire(self, now):
+        """
+        Removes the timers whose deadlines are passed.
+
+        :return: (list), the expired timers in the order of their deadlines.
+        """
+        expired = []
+        if self.count == 0:
+            self._current_tick = max(self._tick_of(now), self._current_tick)
+            return expired
+
+        slots = self._slots
+        mask = self._mask
+        now_tick = self._tick_of(now)
+        # Every slot needs to be visited once at most, even if more than
+        # a rotation is passed since the last call.
+        end_tick = min(now_tick, self._current_tick + mask)
+        for tick in range(self._current_tick, end_tick + 1):
+            slot = slots[tick & mask]
+            if not slot:
+                continue
+
+            due = [timer for timer in slot if timer.end <= now]
+            for timer in due:
+                slot.remove(timer)
+            expired.extend(due)
+
+        # The current tick is kept, since the timers of its
+        # slot with deadlines later than now are not expired yet.
+        self._current_tick = max(now_tick, self._current_tick)
+        self.count -= len(expired)
+        expired.sort(key=lambda timer: timer.end)
+        return expired
+
+    def next_deadline(self):
+        """
+        :return: (float), the earliest deadline among the timers, or ``None`` if there are no timers.
+        """
+        if self.count == 0:
+            return None
+
+        slots = self._slots
+        mask = self._mask
+        for tick in range(self._current_tick, self._current_tick + mask + 1):
+            slot = slots[tick & mask]
+            if not slot:
+                continue
+
+            deadlines = [timer.end for timer in slot if timer.tick == tick]
+            if deadlines:
+                return min(deadlines)
+
+        # All the timers are more than a rotation ahead
+        return min(timer.end for slot in slots for timer in slot)
+
+    def clear(self):
+        """
+        Removes all the timers.
+
+        :return: (list), the removed timers in the order of their deadlines.
+        """
+        timers = [timer for slot in self._slots for timer in slot]
+        for slot in self._slots:
+            slot.clear()
+        self.count = 0
+        timers.sort(key=lambda timer: timer.end)
+        return timers
+
+    def _tick_of(self, t):
+        return int((t - self._start) // self._tick_duration)
+
+
+class _IOLoop(object):
+    """
+    Serves the I/O events of the connections assigned to it in a dedicated thread.
+    """
     _thread = None
     _is_live = False
     logger = logging.getLogger("HazelcastClient.AsyncoreReactor")
 
-    def __init__(self, logger_extras):
+    def __init__(self, index, logger_extras):
+        self._index = index
         self._logger_extras = logger_extras
-        self._timers = queue.PriorityQueue()
-        self._map = {}
+        self.map = {}
+        self._waker = None
+        self._selector = None
+        self._registered = {}  # fd:(dispatcher, events)
 
     def start(self):
         self._is_live = True
-        self._thread = threading.Thread(target=self._loop, name="hazelcast-reactor")
+        self._waker = _Waker(self.map)
+        if selectors:
+            self._selector = selectors.DefaultSelector()
+        self._thread = threading.Thread(target=self._loop, name="hazelcast-reactor-io-%s" % self._index)
         self._thread.daemon = True
         self._thread.start()
 
@@ -45,8 +327,7 @@ class AsyncoreReactor(object):
         Future._threading_locals.is_reactor_thread = True
         while self._is_live:
             try:
-                asyncore.loop(count=1, timeout=0.01, map=self._map)
-                self._check_timers()
+                self._poll()
             except select.error as err:
                 # TODO: parse error type to catch only error "9"
                 self.logger.warning("Connection closed by server", extra=self._logger_extras)
@@ -55,43 +336,84 @@ class AsyncoreReactor(object):
                 self.logger.exception("Error in Reactor Thread", extra=self._logger_extras)
                 # TODO: shutdown client
                 return
-        self.logger.debug("Reactor Thread exited. %s" % self._timers.qsize(), extra=self._logger_extras)
-        self._cleanup_all_timers()
+        self.logger.debug("Reactor Thread exited.", extra=self._logger_extras)
 
-    def _check_timers(self):
-        now = time.time()
-        while not self._timers.empty():
-            try:
-                timer = self._timers.queue[0][1]
-            except IndexError:
-                return
+    def _poll(self):
+        # Blocks until an I/O event or a wake up, timers are run by another thread
+        if not self._selector:
+            asyncore.loop(count=1, timeout=None, map=self.map)
+            return
 
-            if timer.check_timer(now):
+        self._update_registrations()
+        for key, events in self._selector.select(None):
+            dispatcher = key.data
+            if events & selectors.EVENT_READ:
+                asyncore.read(dispatcher)
+            if events & selectors.EVENT_WRITE and self.map.get(key.fd, None) is dispatcher:
+                asyncore.write(dispatcher)
+
+    def _update_registrations(self):
+        # Interest sets are derived from readable() and writable() of the dispatchers,
+        # just like the asyncore loop does, but the selector is only modified when
+        # the interest set of a dispatcher changes.
+        selector = self._selector
+        registered = self._registered
+        dispatchers = self.map
+
+        for fd in [fd for fd in registered if fd not in dispatchers]:
+            self._unregister(fd)
+
+        for fd, dispatcher in list(dispatchers.items()):
+            events = 0
+            if dispatcher.readable():
+                events |= selectors.EVENT_READ
+            if dispatcher.writable() and not dispatcher.accepting:
+                events |= selectors.EVENT_WRITE
+
+            current = registered.get(fd, None)
+            if current is not None:
+                if current[0] is dispatcher and current[1] == events:
+                    continue
+                self._unregister(fd)
+
+            if events:
                 try:
-                    self._timers.get_nowait()
-                except queue.Empty:
+                    selector.register(fd, events, dispatcher)
+                    registered[fd] = (dispatcher, events)
+                except (ValueError, KeyError, OSError, IOError):
+                    # The dispatcher might be closed by another thread in the meantime.
                     pass
-            else:
-                return
-
-    def add_timer_absolute(self, timeout, callback):
-        timer = Timer(timeout, callback, self._cleanup_timer)
-        self._timers.put_nowait((timer.end, timer))
-        return timer
-
-    def add_timer(self, delay, callback):
-        return self.add_timer_absolute(delay + time.time(), callback)
 
-    def shutdown(self):
-        if not self._is_live:
-            return
+    def _unregister(self, fd):
+        del self._registered[fd]
+        try:
+            self._selector.unregister(fd)
+        except (ValueError, KeyError, OSError, IOError):
+            pass
 
+    def connection_count(self):
+        # The waker is also in the map
+        return max(len(self.map) - 1, 0)
+
+    def wake_up(self):
+        """
+        Wakes up the thread if it is blocked waiting for I/O events so that
+        the changes in the interest sets are taken into account.
+        It is a no-op when called from the thread itself.
+        """
+        waker = self._waker
+        if waker and self._thread is not threading.current_thread():
+            waker.wake()
+
+    def stop(self, current_thread):
         self._is_live = False
-
-        if self._thread is not threading.current_thread():
+        if self._thread is not current_thread:
+            self._waker.wake()
             self._thread.join()
 
-        for connection in list(self._map.values()):
+    def close(self):
+        self._waker.close()
+        for connection in list(self.map.values()):
             try:
                 connection.close(None, HazelcastError("Client is shutting down"))
             except OSError as connection:
@@ -99,42 +421,117 @@ class AsyncoreReactor(object):
                     pass
                 else:
                     raise
-        self._map.clear()
+        self.map.clear()
+        if self._selector:
+            self._selector.close()
+            self._registered.clear()
 
-    def connection_factory(self, connection_manager, connection_id, address, network_config, message_callback):
-        return AsyncoreConnection(self._map, connection_manager, connection_id, address,
-                                  network_config, message_callback, self._logger_extras)
 
-    def _cleanup_timer(self, timer):
+_WAKER_BUFFER_SIZE = 1024
+
+
+def _create_socket_pair():
+    try:
+        return socket.socketpair()
+    except (AttributeError, OSError):
+        # socketpair is not available on Windows for Python 2.
+        # Emulate it with a loopback connection.
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
-            self._timers.queue.remove((timer.end, timer))
-        except ValueError:
+            listener.bind(("127.0.0.1", 0))
+            listener.listen(1)
+            first = socket.create_connection(listener.getsockname())
+            second, _ = listener.accept()
+            return first, second
+        finally:
+            listener.close()
+
+
+class _Waker(asyncore.dispatcher):
+    """
+    Dispatcher over one end of a socket pair, used by the other threads
+    to wake up the reactor thread blocked on the selector.
+    """
+
+    def __init__(self, dispatcher_map):
+        asyncore.dispatcher.__init__(self, map=dispatcher_map)
+        self._lock = threading.Lock()
+        self._pending = False
+        self._writer, reader = _create_socket_pair()
+        self._writer.setblocking(False)
+        reader.setblocking(False)
+        self.set_socket(reader)
+
+    def wake(self):
+        with self._lock:
+            if self._pending:
+                return
+            self._pending = True
+
+        try:
+            self._writer.send(b"x")
+        except socket.error:
+            # The buffer is full, which means the reactor is already going to wake up.
             pass
 
-    def _cleanup_all_timers(self):
-        while not self._timers.empty():
+    def handle_read(self):
+        # Drain the socket before clearing the flag. Otherwise the byte of
+        # a wake-up requested in between could be drained with the flag
+        # left set, and the later wake-ups would not write anything.
+        while True:
             try:
-                _, timer = self._timers.get_nowait()
-                timer.timer_ended_cb()
-            except queue.Empty:
-                return
+                if not self.recv(_WAKER_BUFFER_SIZE):
+                    break
+            except socket.error:
+                break
+
+        with self._lock:
+            self._pending = False
+
+    def handle_close(self):
+        self.close()
+
+    def writable(self):
+        return False
+
+    def readable(self):
+        return True
+
+    def close(self):
+        asyncore.dispatcher.close(self)
+        self._writer.close()
 
 
 _BUFFER_SIZE = 128000
 
+# Upper bound for the number of buffers passed to a single sendmsg call.
+# POSIX guarantees at least 16, Linux and most of the other platforms support 1024.
+_IOV_MAX = 1024
+
+_PROTOCOL_BYTES = b"CP2"
+
 
 class AsyncoreConnection(Connection, asyncore.dispatcher):
     sent_protocol_bytes = False
     read_buffer_size = _BUFFER_SIZE
 
-    def __init__(self, dispatcher_map, connection_manager, connection_id, address,
-                 network_config, message_callback, logger_extras):
+    def __init__(self, dispatcher_map, wake_up, connection_manager, connection_id, address,
+                 network_config, message_callback, write_max_bytes, write_max_messages,
+                 write_high_water_mark, write_low_water_mark, max_frame_size, logger_extras):
         asyncore.dispatcher.__init__(self, map=dispatcher_map)
-        Connection.__init__(self, connection_manager, connection_id, message_callback, logger_extras)
+        Connection.__init__(self, connection_manager, connection_id, message_callback, logger_extras,
+                            write_high_water_mark, write_low_water_mark, max_frame_size)
         self.connected_address = address
+        self._wake_up = wake_up
+        self._write_max_bytes = max(write_max_bytes, 1)
+        self._write_max_messages = min(max(write_max_messages, 1), _IOV_MAX)
+        self.flush_count = 0
+        self.flushed_message_count = 0
 
         self._write_lock = threading.Lock()
-        self._write_queue = deque()
+        self._write_queue = deque()  # deque of the buffer lists of the messages
+        self._unsent = deque()  # buffers that a send could not write completely, written first
+        self._fragment_turn = False
         self.create_socket(socket.AF_INET, socket.SOCK_STREAM)
 
         timeout = network_config.connection_timeout
@@ -152,6 +549,7 @@ class AsyncoreConnection(Connection, asyncore.dispatcher):
         for socket_option in network_config.socket_options:
             if socket_option.option is socket.SO_RCVBUF:
                 self.read_buffer_size = socket_option.value
+                self._reader.buffer_size = socket_option.value
 
             self.socket.setsockopt(socket_option.level, socket_option.option, socket_option.value)
 
@@ -159,48 +557,21 @@ class AsyncoreConnection(Connection, asyncore.dispatcher):
 
         ssl_config = network_config.ssl
         if ssl and ssl_config.enabled:
-            ssl_context = ssl.SSLContext(ssl.PROTOCOL_SSLv23)
-
-            protocol = ssl_config.protocol
-
-            # Use only the configured protocol
-            try:
-                if protocol != PROTOCOL.SSLv2:
-                    ssl_context.options |= ssl.OP_NO_SSLv2
-                if protocol != PROTOCOL.SSLv3 and protocol != PROTOCOL.SSL:
-                    ssl_context.options |= ssl.OP_NO_SSLv3
-                if protocol != PROTOCOL.TLSv1:
-                    ssl_context.options |= ssl.OP_NO_TLSv1
-                if protocol != PROTOCOL.TLSv1_1:
-                    ssl_context.options |= ssl.OP_NO_TLSv1_1
-                if protocol != PROTOCOL.TLSv1_2 and protocol != PROTOCOL.TLS:
-                    ssl_context.options |= ssl.OP_NO_TLSv1_2
-                if protocol != PROTOCOL.TLSv1_3:
-                    ssl_context.options |= ssl.OP_NO_TLSv1_3
-            except AttributeError:
-                pass
-
-            ssl_context.verify_mode = ssl.CERT_REQUIRED
-
-            if ssl_config.cafile:
-                ssl_context.load_verify_locations(ssl_config.cafile)
-            else:
-                ssl_context.load_default_certs()
-
-            if ssl_config.certfile:
-                ssl_context.load_cert_chain(ssl_config.certfile, ssl_config.keyfile, ssl_config.password)
-
-            if ssl_config.ciphers:
-                ssl_context.set_ciphers(ssl_config.ciphers)
-
+            ssl_context = create_ssl_context(ssl_config)
             self.socket = ssl_context.wrap_socket(self.socket)
 
+        # SSL sockets do not support vectored sends
+        self._vectored_send = hasattr(self.socket, "sendmsg") and not (ssl and ssl_config.enabled)
+
         # the socket should be non-blocking from now on
         self.socket.settimeout(0)
 
         self.local_address = Address(*self.socket.getsockname())
 
-        self._write_queue.append(b"CP2")
+        self._write_queue.append((_PROTOCOL_BYTES,))
+        if self._write_high_water_mark > 0:
+            self._on_write_queued(len(_PROTOCOL_BYTES))
+        self._wake_up()
 
     def handle_connect(self):
         self.start_time = time.time()
@@ -209,10 +580,26 @@ class AsyncoreConnection(Connection, asyncore.dispatcher):
     def handle_read(self):
         reader = self._reader
         while True:
-            data = self.recv(self.read_buffer_size)
-            reader.read(data)
+            buf = reader.get_buffer()
+            try:
+                n = self.socket.recv_into(buf)
+            except socket.error as e:
+                if e.args[0] == errno.EWOULDBLOCK:
+                    break
+                elif e.args[0] in asyncore._DISCONNECTED:
+                    self.handle_close()
+                    return
+                raise
+
+            if n == 0:
+                # a closed connection is indicated by signaling
+                # a read condition, and having recv_into() return 0.
+                self.handle_close()
+                return
+
+            reader.advance(n)
             self.last_read_time = time.time()
-            if len(data) < self.read_buffer_size:
+            if n < len(buf):
                 break
 
         if reader.length:
@@ -220,15 +607,7 @@ class AsyncoreConnection(Connection, asyncore.dispatcher):
 
     def handle_write(self):
         with self._write_lock:
-            try:
-                data = self._write_queue.popleft()
-            except IndexError:
-                return
-            sent = self.send(data)
-            self.last_write_time = time.time()
-            self.sent_protocol_bytes = True
-            if sent < len(data):
-                self._write_queue.appendleft(data[sent:])
+            self._flush()
 
     def handle_close(self):
         self.logger.warning("Connection closed by server", extra=self._logger_extras)
@@ -246,22 +625,109 @@ class AsyncoreConnection(Connection, asyncore.dispatcher):
     def readable(self):
         return self.live and self.sent_protocol_bytes
 
-    def _write(self, buf):
-        # if write queue is empty, send the data right away, otherwise add to queue
-        if len(self._write_queue) == 0 and self._write_lock.acquire(False):
+    def _write(self, buffers):
+        if buffers:
+            self._write_queue.append(buffers)
+        # if the connection is established and no one is flushing the queue,
+        # send the data right away along with the other queued messages,
+        # otherwise let the reactor do it
+        if self.connected and self._write_lock.acquire(False):
             try:
-                sent = self.send(buf)
-                self.last_write_time = time.time()
-                if sent < len(buf):
-                    self.logger.info("Adding to queue", extra=self._logger_extras)
-                    self._write_queue.appendleft(buf[sent:])
+                self._flush()
             finally:
                 self._write_lock.release()
-        else:
-            self._write_queue.append(buf)
+
+            if not self._write_queue and not self._fragmented_messages and not self._unsent:
+                return
+
+        self._wake_up()
+
+    def _flush(self):
+        # Should be called while holding the write lock.
+        # Drains the queue up to the configured limits and writes
+        # the drained buffers with a single send call.
+        write_queue = self._write_queue
+        unsent = self._unsent
+        buffers = list(unsent)
+        unsent.clear()
+        total = sum(len(buf) for buf in buffers)
+        messages = 0
+        max_bytes = self._write_max_bytes
+        max_messages = self._write_max_messages
+        while total < max_bytes and messages < max_messages:
+            # the fragments of the large messages take turns with the queued
+            # messages, so that a steady load of messages does not starve them
+            message_buffers = self._next_fragment() if self._fragment_turn else None
+            self._fragment_turn = not self._fragment_turn
+            if message_buffers is None:
+                try:
+                    message_buffers = write_queue.popleft()
+                except IndexError:
+                    message_buffers = self._next_fragment()
+                    if message_buffers is None:
+                        break
+            buffers.extend(message_buffers)
+            for buf in message_buffers:
+                total += len(buf)
+            messages += 1
+
+        if not buffers:
+            return
+
+        try:
+            sent = self._send_buffers(buffers)
+        except:
+            # keep the buffers in order, they are written if the connection survives the error
+            unsent.extend(buffers)
+            raise
+        self.last_write_time = time.time()
+        self.sent_protocol_bytes = True
+        self.flush_count += 1
+        self.flushed_message_count += messages
+        self._on_write_sent(sent)
+
+        if sent < total:
+            # keep the unsent parts, preserving the order
+            index = 0
+            while sent >= len(buffers[index]):
+                sent -= len(buffers[index])
+                index += 1
+
+            unsent.append(_remaining(buffers[index], sent))
+            unsent.extend(buffers[index + 1:])
+
+    def _send_buffers(self, buffers):
+        if len(buffers) == 1:
+            return self.send(buffers[0])
+
+        if not self._vectored_send:
+            # bytes.join of Python 2 does not accept bytearrays
+            return self.send(bytearray().join(buffers))
+
+        try:
+            # messages may consist of several buffers, the ones over
+            # the limit are kept as unsent and written on the next flush
+            return self.socket.sendmsg(buffers[:_IOV_MAX])
+        except socket.error as e:
+            if e.args[0] == errno.EWOULDBLOCK:
+                return 0
+            elif e.args[0] in asyncore._DISCONNECTED:
+                self.handle_close()
+                return 0
+            raise
+
+    @property
+    def messages_per_flush(self):
+        """
+        Average number of messages written to the socket with a single send call.
+        """
+        flush_count = self.flush_count
+        if flush_count == 0:
+            return 0.0
+        return float(self.flushed_message_count) / flush_count
 
     def writable(self):
-        return len(self._write_queue) > 0
+        return len(self._write_queue) > 0 or len(self._fragmented_messages) > 0 or len(self._unsent) > 0
 
     def _inner_close(self):
         asyncore.dispatcher.close(self)
@@ -273,35 +739,24 @@ class AsyncoreConnection(Connection, asyncore.dispatcher):
         return self.__repr__()
 
 
-@total_ordering
+def _remaining(buf, sent):
+    # The unsent part of a partially sent buffer. The large payloads
+    # of the messages are not copied, a view to the rest is returned.
+    if six.PY2:
+        return buf[sent:]
+    return memoryview(buf)[sent:]
+
+
 class Timer(object):
-    __slots__ = ("end", "timer_ended_cb", "timer_canceled_cb", "canceled")
+    __slots__ = ("end", "tick", "timer_ended_cb", "timer_canceled_cb", "canceled")
 
     def __init__(self, end, timer_ended_cb, timer_canceled_cb):
         self.end = end
+        self.tick = 0
         self.timer_ended_cb = timer_ended_cb
         self.timer_canceled_cb = timer_canceled_cb
         self.canceled = False
 
-    def __eq__(self, other):
-        return self.end == other.end
-
-    def __ne__(self, other):
-        return not (self == other)
-
-    def __lt__(self, other):
-        return self.end < other.end
-
     def cancel(self):
         self.canceled = True
         self.timer_canceled_cb(self)
-
-    def check_timer(self, now):
-        if self.canceled:
-            return True
-
-        if now >= self.end:
-            self.timer_ended_cb()
-            return True
-
-        return False
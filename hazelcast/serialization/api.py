@@ -789,6 +789,15 @@ class PortableReader(object):
         """
         raise NotImplementedError()
 
+    def read_all(self, obj=None):
+        """
+        Reads all the fields of the portable at once. It is faster than reading the fields one by one.
+
+        :param obj: (object), if given, the fields are set as the attributes of it with the same names.
+        :return: (dict|object), dictionary of the field names and values, or the given object.
+        """
+        raise NotImplementedError()
+
     def get_raw_data_input(self):
         """
         After reading portable fields, one can read remaining fields in old fashioned way consecutively from the end of
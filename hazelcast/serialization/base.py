@@ -1,20 +1,44 @@
 import sys
+import threading
+from collections import OrderedDict
 from threading import RLock
 
 from hazelcast.config import INTEGER_TYPE
+from hazelcast.hash import murmur_hash3_x86_32
 from hazelcast.serialization.api import *
+from hazelcast.serialization.compression import decompress
 from hazelcast.serialization.data import *
+from hazelcast.serialization.data import _join_payloads
 from hazelcast.errors import HazelcastInstanceNotActiveError, HazelcastSerializationError
 from hazelcast.serialization.input import _ObjectDataInput
 from hazelcast.serialization.output import _ObjectDataOutput
+from hazelcast.serialization.portable.record import PortableRecord
 from hazelcast.serialization.serializer import *
 from hazelcast import six
 
 
+_EMPTY_BUFFER = bytearray()
+
+
 def empty_partitioning_strategy(key):
     return None
 
 
+def default_partition_strategy(key):
+    if hasattr(key, "get_partition_key"):
+        return key.get_partition_key()
+    return None
+
+
+# Built-in immutable types that are common as keys. Their instances
+# never have a partition key, so the default strategy can be skipped.
+_BUILTIN_KEY_TYPES = frozenset((str, bytes, float, bool) + six.integer_types + (six.text_type,))
+
+# Types of the keys that can be memoized by the key data cache. Floats are
+# left out since 0.0 and -0.0 are equal but serialized differently.
+_CACHEABLE_KEY_TYPES = _BUILTIN_KEY_TYPES - frozenset((float,))
+
+
 def handle_exception(e, traceback):
     if isinstance(e, MemoryError):
         # TODO
@@ -34,13 +58,111 @@ def index_for_default_type(type_id):
     return -type_id
 
 
+# Serialization may nest, for example while serializing the partitioning
+# key, so a thread may need more than one object at a time.
+_MAX_POOLED_PER_THREAD = 4
+
+
+class _ThreadLocalPool(object):
+    """
+    Pool of reusable objects kept per thread, so that taking
+    and giving back the objects needs no locking.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._local = threading.local()
+
+    def take(self):
+        try:
+            return self._local.items.pop()
+        except IndexError:
+            return self._factory()
+        except AttributeError:
+            self._local.items = []
+            return self._factory()
+
+    def give_back(self, item):
+        # The thread has taken an item before, so its list exists
+        items = self._local.items
+        if len(items) < _MAX_POOLED_PER_THREAD:
+            items.append(item)
+
+
+class KeyDataCache(object):
+    """
+    Size-bounded LRU cache from immutable keys to their serialized form. The cached
+    Data objects carry their partition hash, so looking up the partition of a hot key
+    needs neither the serialization nor the murmur hash again.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # dict of (type, key):Data
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_serialize(self, key, serialize):
+        """
+        Returns the cached Data of the key, serializing and caching it on a miss.
+
+        :param key: (object), the key, one of the built-in immutable types.
+        :param serialize: (function), function in the form of lambda key:Data, used on a miss.
+        :return: (:class:`~hazelcast.serialization.data.Data`), the serialized key.
+        """
+        # Keyed by type too, since 1, 1.0 and True are equal
+        cache_key = (type(key), key)
+        with self._lock:
+            data = self._entries.pop(cache_key, None)
+            if data is not None:
+                # Move to the most recently used end
+                self._entries[cache_key] = data
+                self._hits += 1
+                return data
+            self._misses += 1
+
+        data = serialize(key)
+        with self._lock:
+            self._entries[cache_key] = data
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_statistics(self):
+        """
+        Returns the statistics of the cache.
+        :return: (Dict), Dictionary that stores statistics related to this cache.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "owned_entry_count": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+
 class BaseSerializationService(object):
-    def __init__(self, version, global_partition_strategy, output_buffer_size, is_big_endian, int_type):
+    def __init__(self, version, global_partition_strategy, output_buffer_size, is_big_endian, int_type,
+                 max_pooled_buffer_size=0, key_cache_max_size=0, compressor=None):
         self._registry = SerializerRegistry(int_type)
         self._version = version
         self._global_partition_strategy = global_partition_strategy
         self._output_buffer_size = output_buffer_size
         self._is_big_endian = is_big_endian
+        self._max_pooled_buffer_size = max_pooled_buffer_size
+        self._output_pool = _ThreadLocalPool(self._create_data_output)
+        self._input_pool = _ThreadLocalPool(self._create_empty_data_input)
+        self.key_cache = KeyDataCache(key_cache_max_size) if key_cache_max_size > 0 else None
+        self.compressor = compressor
         self._active = True
 
     def to_data(self, obj, partitioning_strategy=None):
@@ -50,26 +172,94 @@ class BaseSerializationService(object):
         :param partitioning_strategy: function in the form of lambda key:partitioning_key
         :return: Data object
         """
+        return self._to_data(obj, partitioning_strategy, None)
+
+    def value_to_data(self, value):
+        """
+        Serialize the input value, which is stored by the member as it is, such as a map value.
+        Large values are compressed when the compression is enabled. The other objects sent to
+        the members, such as predicates and entry processors, must be serialized with
+        :func:`to_data`, since the members cannot read the compressed form.
+        :param value: input value
+        :return: Data object
+        """
+        return self._to_data(value, None, self.compressor)
+
+    def _to_data(self, obj, partitioning_strategy, compressor):
         if obj is None:
             return None
 
         if isinstance(obj, Data):
             return obj
 
-        out = self._create_data_output()
         try:
             serializer = self._registry.serializer_for(obj)
             partitioning_hash = self._calculate_partitioning_hash(obj, partitioning_strategy)
+        except:
+            handle_exception(sys.exc_info()[1], sys.exc_info()[2])
+        buff, payloads = self._serialize(obj, serializer, partitioning_hash)
+        if compressor is not None:
+            if payloads is not None:
+                buff = _join_payloads(buff, payloads)
+                payloads = None
+            buff = compressor.compress(type(obj), buff)
+        return Data(buff, payloads=payloads)
+
+    def to_data_and_partition_hash(self, obj, partitioning_strategy=None):
+        """
+        Serialize the input object and compute the partition hash of the result in one step.
+        Keys of built-in immutable types skip the partitioning strategy and the partition
+        hash lookup in the serialized form.
+        :param obj: input object, must not be None
+        :param partitioning_strategy: function in the form of lambda key:partitioning_key
+        :return: (tuple), the Data object and its partition hash
+        """
+        if isinstance(obj, Data):
+            return obj, obj.get_partition_hash()
+
+        if partitioning_strategy is None and type(obj) in _BUILTIN_KEY_TYPES \
+                and self._global_partition_strategy is default_partition_strategy:
+            try:
+                serializer = self._registry.serializer_for(obj)
+            except:
+                handle_exception(sys.exc_info()[1], sys.exc_info()[2])
+            buff, _ = self._serialize(obj, serializer, 0)
+            partition_hash = murmur_hash3_x86_32(buff, DATA_OFFSET, len(buff) - DATA_OFFSET)
+            return Data(buff, partition_hash, partition_hash), partition_hash
+
+        # keys are never compressed, their serialized form must not depend on the configuration
+        data = self._to_data(obj, partitioning_strategy, None)
+        return data, data.get_partition_hash()
+
+    def key_to_data(self, key):
+        """
+        Serialize the input key. When the key data cache is enabled, keys of built-in immutable
+        types are served from it together with their partition hash. Keys are never compressed.
+        :param key: input key
+        :return: Data object
+        """
+        cache = self.key_cache
+        if cache is None or type(key) not in _CACHEABLE_KEY_TYPES:
+            return self._to_data(key, None, None)
+        return cache.get_or_serialize(key, self._key_to_data_with_partition_hash)
 
+    def _key_to_data_with_partition_hash(self, key):
+        return self.to_data_and_partition_hash(key)[0]
+
+    def _serialize(self, obj, serializer, partitioning_hash):
+        out = self._output_pool.take()
+        try:
             out.write_int_big_endian(partitioning_hash)
             out.write_int_big_endian(serializer.get_type_id())
             serializer.write(out, obj)
-            return Data(out.to_byte_array())
+            return out.to_byte_array_and_payloads()
         except:
             handle_exception(sys.exc_info()[1], sys.exc_info()[2])
         finally:
-            pass
-            # return out to pool
+            # Do not retain the buffers grown by large objects
+            if out.buffer_size() <= self._max_pooled_buffer_size:
+                out.clear()
+                self._output_pool.give_back(out)
 
     def to_object(self, data):
         """
@@ -82,9 +272,18 @@ class BaseSerializationService(object):
         if is_null_data(data):
             return None
 
-        inp = self._create_data_input(data)
+        buff = data.to_bytes()
+        type_id = data.get_type()
+        if type_id == PYTHON_TYPE_COMPRESSED:
+            try:
+                buff = decompress(buff)
+            except:
+                handle_exception(sys.exc_info()[1], sys.exc_info()[2])
+            type_id = BE_INT.unpack_from(buff, TYPE_OFFSET)[0]
+
+        inp = self._input_pool.take()
+        inp.init(buff, DATA_OFFSET)
         try:
-            type_id = data.get_type()
             serializer = self._registry.serializer_by_type_id(type_id)
             if serializer is None:
                 if self._active:
@@ -95,8 +294,21 @@ class BaseSerializationService(object):
         except:
             handle_exception(sys.exc_info()[1], sys.exc_info()[2])
         finally:
-            pass
-            # return out to pool
+            # Do not keep the buffer alive through the pool
+            inp.init(_EMPTY_BUFFER, 0)
+            self._input_pool.give_back(inp)
+
+    def to_lazy_object(self, data):
+        """
+        Deserialize input data lazily. Portable data is returned as a
+        :class:`~hazelcast.serialization.portable.record.PortableRecord` which decodes
+        the fields on access, the rest is deserialized as in :func:`to_object`.
+        :param data: serialized input Data object
+        :return: Deserialized object or PortableRecord
+        """
+        if isinstance(data, Data) and data.is_portable():
+            return PortableRecord(data, self._registry._portable_serializer, self)
+        return self.to_object(data)
 
     def write_object(self, out, obj):
         if isinstance(obj, Data):
@@ -126,7 +338,7 @@ class BaseSerializationService(object):
         _ps = partitioning_strategy if partitioning_strategy is not None else self._global_partition_strategy
         pk = _ps(obj)
         if pk is not None and pk is not obj:
-            partitioning_key = self.to_data(pk, empty_partitioning_strategy)
+            partitioning_key = self._to_data(pk, empty_partitioning_strategy, None)
             partitioning_hash = 0 if partitioning_key is None else partitioning_key.get_partition_hash()
         return partitioning_hash
 
@@ -134,11 +346,16 @@ class BaseSerializationService(object):
         return _ObjectDataOutput(self._output_buffer_size, self, self._is_big_endian)
 
     def _create_data_input(self, data):
-        return _ObjectDataInput(data._buffer, DATA_OFFSET, self, self._is_big_endian)
+        return _ObjectDataInput(data.to_bytes(), DATA_OFFSET, self, self._is_big_endian)
+
+    def _create_empty_data_input(self):
+        return _ObjectDataInput(_EMPTY_BUFFER, 0, self, self._is_big_endian)
 
     def destroy(self):
         self._active = False
         self._registry.destroy()
+        if self.key_cache is not None:
+            self.key_cache.clear()
 
 
 class SerializerRegistry(object):
@@ -155,6 +372,15 @@ class SerializerRegistry(object):
         self._id_dic = {}  # dict of type_id:serializer
         self._type_dict = {}  # dict of class:serializer
 
+        # Arrays are dispatched on their item type
+        self._ndarray_type = None
+        self._ndarray_serializers = {}  # dict of (dtype kind, item size):serializer
+
+        # dict of class:serializer, filled on first use of a class and
+        # cleared whenever a registration changes. Integers are dispatched
+        # on their value in the VAR mode and are never put in it.
+        self._dispatch_cache = {}
+
         self._registration_lock = RLock()
         self.int_type = int_type
 
@@ -185,12 +411,31 @@ class SerializerRegistry(object):
         :param obj: input object
         :return: Serializer
         """
+        obj_type = type(obj)
+        if obj_type is self._ndarray_type:
+            dtype = obj.dtype
+            serializer = self._ndarray_serializers.get((dtype.kind, dtype.itemsize), None)
+            if serializer is not None:
+                return serializer
+            # the other arrays are left to the rest of the lookups
+            return self._find_serializer(obj_type, obj)
+
+        serializer = self._dispatch_cache.get(obj_type, None)
+        if serializer is not None:
+            return serializer
+
+        if obj_type in six.integer_types and self.int_type == INTEGER_TYPE.VAR:
+            return self.serializer_by_type_id(self._var_int_type_id(obj))
+
+        serializer = self._find_serializer(obj_type, obj)
+        self._dispatch_cache[obj_type] = serializer
+        return serializer
+
+    def _find_serializer(self, obj_type, obj):
         # 1-NULL serializer
         if obj is None:
             return self._null_serializer
 
-        obj_type = type(obj)
-
         # 2-Default serializers, DataSerializable, Portable, primitives, arrays, String, UUID
         # and some helper types(BigInteger etc)
         serializer = self.lookup_default_serializer(obj_type, obj)
@@ -234,21 +479,24 @@ class SerializerRegistry(object):
             elif self.int_type == INTEGER_TYPE.BIG_INT:
                 type_id = JAVA_DEFAULT_TYPE_BIG_INTEGER
             elif self.int_type == INTEGER_TYPE.VAR:
-                if MIN_BYTE <= obj <= MAX_BYTE:
-                    type_id = CONSTANT_TYPE_BYTE
-                elif MIN_SHORT <= obj <= MAX_SHORT:
-                    type_id = CONSTANT_TYPE_SHORT
-                elif MIN_INT <= obj <= MAX_INT:
-                    type_id = CONSTANT_TYPE_INTEGER
-                elif MIN_LONG <= obj <= MAX_LONG:
-                    type_id = CONSTANT_TYPE_LONG
-                else:
-                    type_id = JAVA_DEFAULT_TYPE_BIG_INTEGER
+                type_id = self._var_int_type_id(obj)
             if type_id:
                 return self.serializer_by_type_id(type_id)
 
         return self._constant_type_dict.get(obj_type, None)
 
+    @staticmethod
+    def _var_int_type_id(obj):
+        if MIN_BYTE <= obj <= MAX_BYTE:
+            return CONSTANT_TYPE_BYTE
+        elif MIN_SHORT <= obj <= MAX_SHORT:
+            return CONSTANT_TYPE_SHORT
+        elif MIN_INT <= obj <= MAX_INT:
+            return CONSTANT_TYPE_INTEGER
+        elif MIN_LONG <= obj <= MAX_LONG:
+            return CONSTANT_TYPE_LONG
+        return JAVA_DEFAULT_TYPE_BIG_INTEGER
+
     def lookup_custom_serializer(self, obj_type):
         serializer = self._type_dict.get(obj_type, None)
         if serializer is not None:
@@ -274,6 +522,19 @@ class SerializerRegistry(object):
         self._constant_type_ids[index_for_default_type(stream_serializer.get_type_id())] = stream_serializer
         if object_type is not None:
             self._constant_type_dict[object_type] = stream_serializer
+        self._dispatch_cache.clear()
+
+    def register_ndarray_serializers(self, ndarray_type, serializers):
+        """
+        Registers the serializers of the NumPy arrays, which also replace the
+        list based serializers of the primitive arrays on reads.
+        :param ndarray_type: the numpy.ndarray type
+        :param serializers: dict of (dtype kind, item size):serializer
+        """
+        for serializer in six.itervalues(serializers):
+            self.register_constant_serializer(serializer)
+        self._ndarray_serializers = serializers
+        self._ndarray_type = ndarray_type
 
     def safe_register_serializer(self, stream_serializer, obj_type=None):
         with self._registration_lock:
@@ -286,6 +547,8 @@ class SerializerRegistry(object):
                                      .format(current.__class__, obj_type))
                 else:
                     self._type_dict[obj_type] = stream_serializer
+                    if current is not stream_serializer:
+                        self._dispatch_cache.clear()
             serializer_type_id = stream_serializer.get_type_id()
             current = self._id_dic.get(serializer_type_id, None)
             if current is not None and current.__class__ != stream_serializer.__class__:
@@ -307,6 +570,7 @@ class SerializerRegistry(object):
         for serializer in list(self._constant_type_dict.values()):
             serializer.destroy()
         self._type_dict.clear()
+        self._dispatch_cache.clear()
         self._id_dic.clear()
         self._global_serializer = None
         self._constant_type_dict.clear()
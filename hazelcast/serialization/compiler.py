@@ -0,0 +1,418 @@
+"""
+Opt-in code generation of specialized serialization methods.
+
+The generated methods write exactly the same bytes as the hand-written ones, but consecutive fixed-size fields are
+packed and unpacked with a single precompiled ``struct.Struct`` instead of a method call per field.
+
+.. code-block:: python
+
+    @compile_identified_serializable([("id", FieldType.INT), ("age", FieldType.INT), ("name", FieldType.UTF)])
+    class Employee(IdentifiedDataSerializable):
+        ...
+
+    @compile_portable(ClassDefinitionBuilder(FACTORY_ID, CLASS_ID).add_int_field("id").add_utf_field("name").build())
+    class Customer(Portable):
+        ...
+"""
+import re
+import struct
+
+from hazelcast import six
+from hazelcast.errors import HazelcastSerializationError
+from hazelcast.serialization.bits import INT_SIZE_IN_BYTES, NULL_ARRAY_LENGTH
+from hazelcast.serialization.input import _ObjectDataInput
+from hazelcast.serialization.output import _ObjectDataOutput
+from hazelcast.serialization.portable.classdef import FieldType
+from hazelcast.serialization.portable.reader import _check_factory_and_class
+from hazelcast.serialization.portable.writer import _check_portable_attributes
+from hazelcast.six.moves import range
+
+# struct format characters of the fixed-size fields, for writing and reading
+_FIXED_FORMATS = {
+    FieldType.BYTE: ("B", "b"),
+    FieldType.BOOLEAN: ("?", "?"),
+    FieldType.SHORT: ("h", "h"),
+    FieldType.INT: ("i", "i"),
+    FieldType.LONG: ("q", "q"),
+    FieldType.FLOAT: ("f", "f"),
+    FieldType.DOUBLE: ("d", "d"),
+}
+
+# method name suffixes of the data output/input and the portable writer/reader
+_METHOD_SUFFIXES = {
+    FieldType.PORTABLE: "portable",
+    FieldType.BYTE: "byte",
+    FieldType.BOOLEAN: "boolean",
+    FieldType.CHAR: "char",
+    FieldType.SHORT: "short",
+    FieldType.INT: "int",
+    FieldType.LONG: "long",
+    FieldType.FLOAT: "float",
+    FieldType.DOUBLE: "double",
+    FieldType.UTF: "utf",
+    FieldType.PORTABLE_ARRAY: "portable_array",
+    FieldType.BYTE_ARRAY: "byte_array",
+    FieldType.BOOLEAN_ARRAY: "boolean_array",
+    FieldType.CHAR_ARRAY: "char_array",
+    FieldType.SHORT_ARRAY: "short_array",
+    FieldType.INT_ARRAY: "int_array",
+    FieldType.LONG_ARRAY: "long_array",
+    FieldType.FLOAT_ARRAY: "float_array",
+    FieldType.DOUBLE_ARRAY: "double_array",
+    FieldType.UTF_ARRAY: "utf_array",
+}
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# final offset and field count
+_PORTABLE_HEADER_SIZE = 2 * INT_SIZE_IN_BYTES
+
+
+def compile_identified_serializable(schema):
+    """
+    Class decorator that generates the ``write_data`` and ``read_data`` methods of an IdentifiedDataSerializable
+    from a field schema. The fields are written in the order of the schema, to the attributes of the same name.
+
+    :param schema: (list|:class:`~hazelcast.serialization.portable.classdef.ClassDefinition`), list of
+        (attribute name, :class:`~hazelcast.serialization.portable.classdef.FieldType`) pairs, or a class definition
+        whose fields are used in the order of their indexes.
+    :return: (function), the class decorator.
+    """
+    fields = _to_fields(schema)
+    for _, field_type in fields:
+        if field_type in (FieldType.PORTABLE, FieldType.PORTABLE_ARRAY):
+            raise ValueError("IdentifiedDataSerializable cannot have Portable fields")
+
+    namespace = _create_namespace()
+    source = _generate_write_data(fields, namespace) + _generate_read_data(fields, namespace)
+    six.exec_(source, namespace)
+
+    def decorator(cls):
+        cls.write_data = namespace["write_data"]
+        cls.read_data = namespace["read_data"]
+        return cls
+
+    return decorator
+
+
+def compile_portable(class_definition):
+    """
+    Class decorator that generates the ``write_portable`` and ``read_portable`` methods of a Portable from its class
+    definition. The fields are written in the order of their indexes, to the attributes of the same name.
+
+    The generated methods work with any portable writer and reader. In addition, the portable serializer writes and
+    reads the whole object with precompiled structs when the class definition registered for the class is equal to
+    the given one and the versions of the data and the class match.
+
+    :param class_definition: (:class:`~hazelcast.serialization.portable.classdef.ClassDefinition`), class definition
+        of the Portable.
+    :return: (function), the class decorator.
+    """
+    fields = _to_fields(class_definition)
+    namespace = _create_namespace()
+    source = _generate_write_portable(fields) + _generate_read_portable(fields) + \
+        _generate_fast_write_portable(class_definition, fields, namespace) + \
+        _generate_fast_read_portable(class_definition, fields, namespace)
+    six.exec_(source, namespace)
+
+    compiled = _CompiledPortable(class_definition, namespace["fast_write"], namespace["fast_read"])
+
+    def decorator(cls):
+        cls.write_portable = namespace["write_portable"]
+        cls.read_portable = namespace["read_portable"]
+        cls._compiled_portable = compiled
+        return cls
+
+    return decorator
+
+
+class _CompiledPortable(object):
+    """
+    Specialized writer and reader of a Portable, used by the portable serializer.
+    """
+
+    def __init__(self, class_definition, write, read):
+        self.class_definition = class_definition
+        self.write = write
+        self.read = read
+        self._matched = class_definition
+
+    def matches(self, class_definition):
+        """
+        :param class_definition: (:class:`~hazelcast.serialization.portable.classdef.ClassDefinition`), class
+            definition to check.
+        :return: (bool), ``True`` if the data described by the class definition can be handled, ``False`` otherwise.
+        """
+        if class_definition is self._matched:
+            return True
+        if class_definition == self.class_definition:
+            # the registered definition is usually a different but equal object
+            self._matched = class_definition
+            return True
+        return False
+
+
+def _to_fields(schema):
+    if hasattr(schema, "field_defs"):
+        fields = [(fd.field_name, fd.field_type)
+                  for fd in sorted(six.itervalues(schema.field_defs), key=lambda fd: fd.index)]
+    else:
+        fields = [(name, field_type) for name, field_type in schema]
+
+    for name, field_type in fields:
+        if not _IDENTIFIER.match(name):
+            raise ValueError("Field name is not a valid attribute name: {}".format(name))
+        if field_type not in _METHOD_SUFFIXES:
+            raise ValueError("Unknown field type: {}".format(field_type))
+    return fields
+
+
+def _create_namespace():
+    return {
+        "_ObjectDataOutput": _ObjectDataOutput,
+        "_ObjectDataInput": _ObjectDataInput,
+        "HazelcastSerializationError": HazelcastSerializationError,
+        "_write_portable_field": _write_portable_field,
+        "_write_portable_array_field": _write_portable_array_field,
+        "_read_portable_field": _read_portable_field,
+        "_read_portable_array_field": _read_portable_array_field,
+    }
+
+
+def _add_structs(namespace, name, fmt):
+    # Structs are indexed by the is_big_endian flag of the output or the input
+    namespace[name] = (struct.Struct("<" + fmt), struct.Struct(">" + fmt))
+
+
+def _group_fixed_runs(fields):
+    # Splits the fields into runs of consecutive fixed-size fields and single variable-size fields
+    runs = []
+    for name, field_type in fields:
+        if field_type in _FIXED_FORMATS and runs and runs[-1][0]:
+            runs[-1][1].append((name, field_type))
+        else:
+            runs.append((field_type in _FIXED_FORMATS, [(name, field_type)]))
+    return runs
+
+
+def _generate_write_data(fields, namespace):
+    lines = ["def write_data(self, out):",
+             "    if out.__class__ is not _ObjectDataOutput:"]
+    lines.extend("        out.write_%s(self.%s)" % (_METHOD_SUFFIXES[t], name) for name, t in fields)
+    lines.extend(["        return",
+                  "    be = out._is_big_endian"])
+
+    for i, (fixed, run) in enumerate(_group_fixed_runs(fields)):
+        if not fixed:
+            name, field_type = run[0]
+            lines.append("    out.write_%s(self.%s)" % (_METHOD_SUFFIXES[field_type], name))
+            continue
+
+        struct_name = "_W%d" % i
+        _add_structs(namespace, struct_name, "".join(_FIXED_FORMATS[t][0] for _, t in run))
+        size = namespace[struct_name][0].size
+        lines.extend(["    out._ensure_available(%d)" % size,
+                      "    %s[be].pack_into(out._buffer, out._pos, %s)" % (struct_name,
+                                                                          ", ".join("self." + n for n, _ in run)),
+                      "    out._pos += %d" % size])
+
+    return "\n".join(lines) + "\n\n"
+
+
+def _generate_read_data(fields, namespace):
+    lines = ["def read_data(self, inp):",
+             "    if inp.__class__ is not _ObjectDataInput:"]
+    lines.extend("        self.%s = inp.read_%s()" % (name, _METHOD_SUFFIXES[t]) for name, t in fields)
+    lines.extend(["        return",
+                  "    be = inp._is_big_endian"])
+
+    for i, (fixed, run) in enumerate(_group_fixed_runs(fields)):
+        if not fixed:
+            name, field_type = run[0]
+            lines.append("    self.%s = inp.read_%s()" % (name, _METHOD_SUFFIXES[field_type]))
+            continue
+
+        struct_name = "_R%d" % i
+        _add_structs(namespace, struct_name, "".join(_FIXED_FORMATS[t][1] for _, t in run))
+        size = namespace[struct_name][0].size
+        lines.extend(["    pos = inp._pos",
+                      "    if inp._size - pos < %d:" % size,
+                      "        raise EOFError(\"Cannot read %d bytes!\")" % size,
+                      "    %s, = %s[be].unpack_from(inp._buffer, pos)" % (", ".join("self." + n for n, _ in run),
+                                                                          struct_name),
+                      "    inp._pos = pos + %d" % size])
+
+    return "\n".join(lines) + "\n\n"
+
+
+def _generate_write_portable(fields):
+    lines = ["def write_portable(self, writer):"]
+    lines.extend("    writer.write_%s(%r, self.%s)" % (_METHOD_SUFFIXES[t], name, name) for name, t in fields)
+    if not fields:
+        lines.append("    pass")
+    return "\n".join(lines) + "\n\n"
+
+
+def _generate_read_portable(fields):
+    lines = ["def read_portable(self, reader):"]
+    lines.extend("    self.%s = reader.read_%s(%r)" % (name, _METHOD_SUFFIXES[t], name) for name, t in fields)
+    if not fields:
+        lines.append("    pass")
+    return "\n".join(lines) + "\n\n"
+
+
+def _generate_fast_write_portable(class_definition, fields, namespace):
+    # Mirrors DefaultPortableWriter. Each field starts with a header made of the length of the field name, the name
+    # and the field type. The headers are constant, so they are packed together with the following fixed-size values.
+    field_count = len(fields)
+    table_size = _PORTABLE_HEADER_SIZE + (field_count + 1) * INT_SIZE_IN_BYTES
+    lines = ["def fast_write(serializer, out, self):",
+             "    be = out._is_big_endian",
+             "    begin = out._pos",
+             "    out._ensure_available(%d)" % table_size,
+             "    out._pos = begin + %d" % table_size]
+
+    # formats and argument expressions of the next struct, and the offsets of the fields that start in it
+    formats = []
+    args = []
+    field_offsets = []
+    struct_count = [0]
+
+    def flush():
+        if not formats:
+            return
+        struct_name = "_W%d" % struct_count[0]
+        struct_count[0] += 1
+        _add_structs(namespace, struct_name, "".join(formats))
+        size = namespace[struct_name][0].size
+        lines.extend(["    pos = out._pos",
+                      "    out._ensure_available(%d)" % size,
+                      "    %s[be].pack_into(out._buffer, pos, %s)" % (struct_name, ", ".join(args)),
+                      "    out._pos = pos + %d" % size])
+        lines.extend("    p%d = pos + %d" % field_offset for field_offset in field_offsets)
+        del formats[:], args[:], field_offsets[:]
+
+    for index, (name, field_type) in enumerate(fields):
+        encoded_name = name.encode("utf-8")
+        namespace["_N%d" % index] = encoded_name
+        field_offsets.append((index, struct.calcsize("<" + "".join(formats))))
+        formats.append("h%dsB" % len(encoded_name))
+        args.extend((str(len(name)), "_N%d" % index, str(field_type)))
+
+        if field_type in _FIXED_FORMATS:
+            formats.append(_FIXED_FORMATS[field_type][0])
+            args.append("self." + name)
+            continue
+
+        flush()
+        if field_type == FieldType.PORTABLE:
+            namespace["_FD%d" % index] = class_definition.get_field(name)
+            lines.append("    _write_portable_field(serializer, out, _FD%d, self.%s)" % (index, name))
+        elif field_type == FieldType.PORTABLE_ARRAY:
+            namespace["_FD%d" % index] = class_definition.get_field(name)
+            lines.append("    _write_portable_array_field(serializer, out, _FD%d, self.%s)" % (index, name))
+        else:
+            lines.append("    out.write_%s(self.%s)" % (_METHOD_SUFFIXES[field_type], name))
+
+    flush()
+
+    _add_structs(namespace, "_TABLE", "ii" + "i" * (field_count + 1))
+    position_args = "".join("p%d, " % index for index in range(field_count))
+    lines.extend(["    _TABLE[be].pack_into(out._buffer, begin, out._pos, %d, %s0)" % (field_count, position_args)])
+    return "\n".join(lines) + "\n\n"
+
+
+def _generate_fast_read_portable(class_definition, fields, namespace):
+    # Mirrors DefaultPortableReader. The positions of the fields are read from the
+    # table, since the fields might have been written in any order by other clients.
+    field_count = len(fields)
+    _add_structs(namespace, "_TABLE_R", "ii" + "i" * field_count)
+    namespace["_CD"] = class_definition
+    table_size = namespace["_TABLE_R"][0].size
+
+    position_targets = "".join("p%d, " % index for index in range(field_count))
+    lines = ["def fast_read(serializer, inp, self):",
+             "    be = inp._is_big_endian",
+             "    buf = inp._buffer",
+             "    if inp._size - inp._pos < %d:" % table_size,
+             "        raise HazelcastSerializationError()",
+             "    final_pos, field_count, %s= _TABLE_R[be].unpack_from(buf, inp._pos)" % position_targets,
+             "    if field_count != %d:" % field_count,
+             "        raise ValueError(\"Field count({}) in stream does not match! {}\".format(field_count, _CD))"]
+
+    for index, (name, field_type) in enumerate(fields):
+        # name length + name + type
+        value_offset = 2 + len(name) + 1
+        if field_type in _FIXED_FORMATS:
+            struct_name = "_R%d" % index
+            _add_structs(namespace, struct_name, _FIXED_FORMATS[field_type][1])
+            lines.append("    self.%s, = %s[be].unpack_from(buf, p%d + %d)" % (name, struct_name, index, value_offset))
+        elif field_type == FieldType.PORTABLE:
+            namespace["_FD%d" % index] = class_definition.get_field(name)
+            lines.append("    self.%s = _read_portable_field(serializer, inp, _FD%d, p%d + %d)"
+                         % (name, index, index, value_offset))
+        elif field_type == FieldType.PORTABLE_ARRAY:
+            namespace["_FD%d" % index] = class_definition.get_field(name)
+            lines.append("    self.%s = _read_portable_array_field(serializer, inp, _FD%d, p%d + %d)"
+                         % (name, index, index, value_offset))
+        else:
+            lines.extend(["    inp._pos = p%d + %d" % (index, value_offset),
+                          "    self.%s = inp.read_%s()" % (name, _METHOD_SUFFIXES[field_type])])
+
+    lines.append("    inp._pos = final_pos")
+    return "\n".join(lines) + "\n\n"
+
+
+def _write_portable_field(serializer, out, fd, portable):
+    is_none = portable is None
+    out.write_boolean(is_none)
+    out.write_int(fd.factory_id)
+    out.write_int(fd.class_id)
+    if not is_none:
+        _check_portable_attributes(fd, portable)
+        serializer.write_internal(out, portable)
+
+
+def _write_portable_array_field(serializer, out, fd, values):
+    length = NULL_ARRAY_LENGTH if values is None else len(values)
+    out.write_int(length)
+    out.write_int(fd.factory_id)
+    out.write_int(fd.class_id)
+    if length > 0:
+        offset = out.position()
+        out.write_zero_bytes(length * INT_SIZE_IN_BYTES)
+        for i in range(length):
+            portable = values[i]
+            _check_portable_attributes(fd, portable)
+            out.write_int(out.position(), offset + i * INT_SIZE_IN_BYTES)
+            serializer.write_internal(out, portable)
+
+
+def _read_portable_field(serializer, inp, fd, position):
+    inp.set_position(position)
+    is_none = inp.read_boolean()
+    factory_id = inp.read_int()
+    class_id = inp.read_int()
+    _check_factory_and_class(fd, factory_id, class_id)
+    if is_none:
+        return None
+    return serializer.read_internal(inp, factory_id, class_id)
+
+
+def _read_portable_array_field(serializer, inp, fd, position):
+    inp.set_position(position)
+    length = inp.read_int()
+    factory_id = inp.read_int()
+    class_id = inp.read_int()
+    if length == NULL_ARRAY_LENGTH:
+        return None
+
+    _check_factory_and_class(fd, factory_id, class_id)
+
+    portables = [None] * length
+    if length > 0:
+        offset = inp.position()
+        for i in range(length):
+            inp.set_position(inp.read_int(offset + i * INT_SIZE_IN_BYTES))
+            portables[i] = serializer.read_internal(inp, factory_id, class_id)
+    return portables
@@ -0,0 +1,127 @@
+import threading
+import zlib
+
+from hazelcast import six
+from hazelcast.config import COMPRESSION_ALGORITHM
+from hazelcast.errors import HazelcastSerializationError
+from hazelcast.serialization.bits import BE_INT, BYTE_SIZE_IN_BYTES, INT_SIZE_IN_BYTES
+from hazelcast.serialization.data import PARTITION_HASH_OFFSET, TYPE_OFFSET, DATA_OFFSET
+from hazelcast.serialization.serialization_const import PYTHON_TYPE_COMPRESSED
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+# Layout of the compressed data, after the partition hash and the type id:
+# algorithm (1 byte), type id of the uncompressed data (4 bytes), compressed payload
+_ALGORITHM_OFFSET = DATA_OFFSET
+_ORIGINAL_TYPE_OFFSET = _ALGORITHM_OFFSET + BYTE_SIZE_IN_BYTES
+_COMPRESSED_PAYLOAD_OFFSET = _ORIGINAL_TYPE_OFFSET + INT_SIZE_IN_BYTES
+
+
+def _view(buff, offset):
+    # zlib of Python 2 does not accept memoryviews
+    if six.PY2:
+        return buffer(buff, offset)
+    return memoryview(buff)[offset:]
+
+
+def _compress_function(algorithm):
+    if algorithm == COMPRESSION_ALGORITHM.ZLIB:
+        return zlib.compress
+    if algorithm == COMPRESSION_ALGORITHM.LZMA:
+        if lzma is None:
+            raise ValueError("LZMA compression is not available in this Python version")
+        return lzma.compress
+    raise ValueError("Unknown compression algorithm: {}".format(algorithm))
+
+
+def decompress(buff):
+    """
+    Decompresses the buffer of a compressed Data.
+
+    :param buff: (bytearray), buffer of the Data with the compressed type id.
+    :return: (bytearray), buffer of the uncompressed Data.
+    """
+    algorithm = buff[_ALGORITHM_OFFSET]
+    payload = _view(buff, _COMPRESSED_PAYLOAD_OFFSET)
+    if algorithm == COMPRESSION_ALGORITHM.ZLIB:
+        payload = zlib.decompress(payload)
+    elif algorithm == COMPRESSION_ALGORITHM.LZMA and lzma is not None:
+        payload = lzma.decompress(payload)
+    else:
+        raise HazelcastSerializationError("Unsupported compression algorithm: {}".format(algorithm))
+
+    result = bytearray(DATA_OFFSET)
+    result[PARTITION_HASH_OFFSET:TYPE_OFFSET] = buff[PARTITION_HASH_OFFSET:TYPE_OFFSET]
+    result[TYPE_OFFSET:DATA_OFFSET] = buff[_ORIGINAL_TYPE_OFFSET:_COMPRESSED_PAYLOAD_OFFSET]
+    result.extend(payload)
+    return result
+
+
+class DataCompressor(object):
+    """
+    Compresses the serialized values whose payload is at least as large as the threshold.
+    The compressed values are written with their own type id, followed by the algorithm and the
+    type id of the uncompressed value, so they are readable alongside the uncompressed ones.
+    Values that do not get smaller are kept uncompressed.
+    """
+
+    def __init__(self, algorithm, threshold, policy):
+        self.algorithm = algorithm
+        self.threshold = threshold
+        self._compress = _compress_function(algorithm)
+        self._policy = dict(policy)  # dict of type:bool
+        self._lock = threading.Lock()
+        self._compressed_count = 0
+        self._incompressible_count = 0
+        self._original_bytes = 0
+        self._compressed_bytes = 0
+
+    def compress(self, obj_type, buff):
+        """
+        Compresses the buffer of a serialized object, if the policy and the threshold allow.
+
+        :param obj_type: (type), type of the serialized object.
+        :param buff: (bytearray), the serialized object.
+        :return: (bytearray), the compressed buffer or the given one.
+        """
+        payload_size = len(buff) - DATA_OFFSET
+        if payload_size < self.threshold or not self._policy.get(obj_type, True):
+            return buff
+
+        compressed_payload = self._compress(_view(buff, DATA_OFFSET))
+        compressed_size = _COMPRESSED_PAYLOAD_OFFSET + len(compressed_payload)
+        if compressed_size >= len(buff):
+            with self._lock:
+                self._incompressible_count += 1
+            return buff
+
+        result = bytearray(_COMPRESSED_PAYLOAD_OFFSET)
+        result[PARTITION_HASH_OFFSET:TYPE_OFFSET] = buff[PARTITION_HASH_OFFSET:TYPE_OFFSET]
+        BE_INT.pack_into(result, TYPE_OFFSET, PYTHON_TYPE_COMPRESSED)
+        result[_ALGORITHM_OFFSET] = self.algorithm
+        result[_ORIGINAL_TYPE_OFFSET:_COMPRESSED_PAYLOAD_OFFSET] = buff[TYPE_OFFSET:DATA_OFFSET]
+        result.extend(compressed_payload)
+        with self._lock:
+            self._compressed_count += 1
+            self._original_bytes += len(buff)
+            self._compressed_bytes += compressed_size
+        return result
+
+    def get_statistics(self):
+        """
+        Returns the statistics of the compression. The ratio is the total size of the
+        compressed values before the compression divided by the size after it.
+        :return: (Dict), Dictionary that stores statistics related to the compression.
+        """
+        with self._lock:
+            compressed_bytes = self._compressed_bytes
+            return {
+                "compressed_count": self._compressed_count,
+                "incompressible_count": self._incompressible_count,
+                "original_bytes": self._original_bytes,
+                "compressed_bytes": compressed_bytes,
+                "ratio": float(self._original_bytes) / compressed_bytes if compressed_bytes else 0.0,
+            }
@@ -1,3 +1,4 @@
+from hazelcast import six
 from hazelcast.hash import murmur_hash3_x86_32
 from hazelcast.serialization import BE_INT
 from hazelcast.serialization.serialization_const import *
@@ -9,13 +10,32 @@ DATA_OFFSET = 8
 HEAP_DATA_OVERHEAD = DATA_OFFSET
 
 
+def _join_payloads(buff, payloads):
+    # Inserts the payloads into the buffer at their offsets
+    result = bytearray()
+    start = 0
+    for offset, payload in payloads:
+        result += buff[start:offset]
+        result += payload
+        start = offset
+    result += buff[start:]
+    return result
+
+
 class Data(object):
     """
-    Data is basic unit of serialization. It stores binary form of an object serialized by serialization service
+    Data is basic unit of serialization. It stores binary form of an object serialized by serialization service.
+    The buffer must not be modified once the Data is created, since the hashes of it are computed once and cached.
     """
 
-    def __init__(self, buff=None):
+    __slots__ = ("_buffer", "_partition_hash", "_hash_code", "_payloads")
+
+    def __init__(self, buff=None, partition_hash=None, hash_code=None, payloads=None):
         self._buffer = buff
+        self._partition_hash = partition_hash
+        self._hash_code = hash_code
+        # list of (offset, payload) for the large buffers that are referenced rather than copied into the buffer
+        self._payloads = payloads
 
     def to_bytes(self):
         """
@@ -23,7 +43,42 @@ class Data(object):
 
         :return:  (byte array), byte array representation of internal binary format.
         """
-        return self._buffer
+        payloads = self._payloads
+        if payloads is None:
+            return self._buffer
+        return _join_payloads(self._buffer, payloads)
+
+    def get_buffers(self):
+        """
+        Returns the buffers that make up the internal binary format, in order. The payloads that are
+        referenced by this Data are returned as they are, the rest of it as views of the buffer.
+
+        :return: (list), the buffers.
+        """
+        buff = self._buffer
+        payloads = self._payloads
+        if payloads is None:
+            return [buff]
+
+        view = buff if six.PY2 else memoryview(buff)
+        buffers = []
+        start = 0
+        for offset, payload in payloads:
+            if offset > start:
+                buffers.append(view[start:offset])
+                start = offset
+            buffers.append(payload)
+        if start < len(buff):
+            buffers.append(view[start:])
+        return buffers
+
+    def has_payloads(self):
+        """
+        Determines whether this Data references payloads that are not copied into its buffer.
+
+        :return: (bool), ``true`` if the Data references payloads, ``false`` otherwise.
+        """
+        return self._payloads is not None
 
     def get_type(self):
         """
@@ -41,7 +96,12 @@ class Data(object):
 
         :return: (int), total size of Data in bytes.
         """
-        return len(self._buffer) if self._buffer is not None else 0
+        if self._buffer is None:
+            return 0
+        size = len(self._buffer)
+        if self._payloads is not None:
+            size += sum(len(payload) for _, payload in self._payloads)
+        return size
 
     def data_size(self):
         """
@@ -60,9 +120,14 @@ class Data(object):
 
         :return: partition hash
         """
-        if self.has_partition_hash():
-            return BE_INT.unpack_from(self._buffer, PARTITION_HASH_OFFSET)[0]
-        return self.hash_code()
+        partition_hash = self._partition_hash
+        if partition_hash is None:
+            if self.has_partition_hash():
+                partition_hash = BE_INT.unpack_from(self._buffer, PARTITION_HASH_OFFSET)[0]
+            else:
+                partition_hash = self.hash_code()
+            self._partition_hash = partition_hash
+        return partition_hash
 
     def is_portable(self):
         """
@@ -82,20 +147,44 @@ class Data(object):
                and len(self._buffer) >= HEAP_DATA_OVERHEAD \
                and BE_INT.unpack_from(self._buffer, PARTITION_HASH_OFFSET)[0] != 0
 
+    def is_partition_hash_computed(self):
+        """
+        Determines whether :func:`get_partition_hash` can return without hashing the internal data.
+
+        :return: (bool), ``true`` if the partition hash is cached or set explicitly, ``false`` otherwise.
+        """
+        return self._partition_hash is not None or self._hash_code is not None or self.has_partition_hash()
+
     def hash_code(self):
         """
         Returns the murmur hash of the internal data.
 
         :return: the murmur hash of the internal data.
         """
-        return murmur_hash3_x86_32(self._buffer, DATA_OFFSET, self.data_size())
+        hash_code = self._hash_code
+        if hash_code is None:
+            hash_code = murmur_hash3_x86_32(self.to_bytes(), DATA_OFFSET, self.data_size())
+            self._hash_code = hash_code
+        return hash_code
 
     def __hash__(self):
-        return self.hash_code()
+        hash_code = self._hash_code
+        if hash_code is None:
+            return self.hash_code()
+        return hash_code
 
     def __eq__(self, other):
-        return isinstance(other, Data) and self.total_size() == other.total_size() \
-               and self._buffer == other.to_bytes()
+        if self is other:
+            return True
+        if not isinstance(other, Data) or self.total_size() != other.total_size():
+            return False
+        # Unequal hashes prove unequal buffers without comparing them
+        if self._hash_code is not None and other._hash_code is not None and self._hash_code != other._hash_code:
+            return False
+        return self.to_bytes() == other.to_bytes()
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
 
     def __len__(self):
         return self.total_size()
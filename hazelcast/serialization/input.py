@@ -1,9 +1,16 @@
+import struct
+
 from hazelcast.serialization.api import *
 from hazelcast.serialization.bits import *
 from hazelcast.serialization.data import Data
 from hazelcast import six
 from hazelcast.six.moves import range
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class _ObjectDataInput(ObjectDataInput):
     def __init__(self, buff, offset=0, serialization_service=None, is_big_endian=True):
@@ -21,6 +28,7 @@ class _ObjectDataInput(ObjectDataInput):
         self._FMT_LONG = BE_LONG if self._is_big_endian else LE_LONG
         self._FMT_FLOAT = BE_FLOAT if self._is_big_endian else LE_FLOAT
         self._FMT_DOUBLE = BE_DOUBLE if self._is_big_endian else LE_DOUBLE
+        self._BYTE_ORDER = ">" if self._is_big_endian else "<"
 
     def read_into(self, buff, offset=None, length=None):
         _off = offset if offset is not None else 0
@@ -98,25 +106,50 @@ class _ObjectDataInput(ObjectDataInput):
         return result
 
     def read_boolean_array(self):
-        return self._read_array_fnc(self.read_boolean)
+        return self._read_primitive_array("?", BOOLEAN_SIZE_IN_BYTES)
 
     def read_char_array(self):
-        return self._read_array_fnc(self.read_char)
+        codes = self._read_primitive_array("H", CHAR_SIZE_IN_BYTES)
+        return [six.unichr(code) for code in codes] if codes is not None else None
 
     def read_int_array(self):
-        return self._read_array_fnc(self.read_int)
+        return self._read_primitive_array("i", INT_SIZE_IN_BYTES)
 
     def read_long_array(self):
-        return self._read_array_fnc(self.read_long)
+        return self._read_primitive_array("q", LONG_SIZE_IN_BYTES)
 
     def read_double_array(self):
-        return self._read_array_fnc(self.read_double)
+        return self._read_primitive_array("d", DOUBLE_SIZE_IN_BYTES)
 
     def read_float_array(self):
-        return self._read_array_fnc(self.read_float)
+        return self._read_primitive_array("f", FLOAT_SIZE_IN_BYTES)
 
     def read_short_array(self):
-        return self._read_array_fnc(self.read_short)
+        return self._read_primitive_array("h", SHORT_SIZE_IN_BYTES)
+
+    def read_ndarray(self, type_code):
+        """
+        Reads a primitive array as a one dimensional NumPy array. The array shares the memory of the
+        input buffer when the byte order of the stream is the native one, and is read-only then.
+        Otherwise, the items are copied into an array of the native byte order.
+
+        :param type_code: (str), struct format character of the items, one of ``?hiqfd``.
+        :return: (numpy.ndarray), the array.
+        """
+        length = self.read_int()
+        if length == NULL_ARRAY_LENGTH:
+            return None
+        dtype = numpy.dtype(self._BYTE_ORDER + type_code)
+        if length <= 0:
+            return numpy.empty(0, dtype.newbyteorder("="))
+        size = length * dtype.itemsize
+        self._check_available(self._pos, size)
+        array = numpy.frombuffer(self._buffer, dtype, length, self._pos)
+        self._pos += size
+        if dtype.isnative:
+            array.flags.writeable = False
+            return array
+        return array.astype(dtype.newbyteorder("="))
 
     def read_utf_array(self):
         return self._read_array_fnc(self.read_utf)
@@ -140,6 +173,17 @@ class _ObjectDataInput(ObjectDataInput):
     def size(self):
         return self._size
 
+    def init(self, buff, offset):
+        """
+        Points the input to a new buffer so that it can be reused.
+
+        :param buff: (bytearray), the buffer to read from.
+        :param offset: (int), the position to start reading from.
+        """
+        self._buffer = buff
+        self._pos = offset
+        self._size = len(buff)
+
     # HELPERS
     def _check_available(self, position, size):
         _position = self._pos if position is None else position
@@ -156,6 +200,19 @@ class _ObjectDataInput(ObjectDataInput):
             val = fmt.unpack_from(self._buffer, position)
         return val[0]
 
+    def _read_primitive_array(self, type_code, item_size):
+        # Unpacks the whole array at once
+        length = self.read_int()
+        if length == NULL_ARRAY_LENGTH:
+            return None
+        if length <= 0:
+            return []
+        size = length * item_size
+        self._check_available(self._pos, size)
+        values = struct.unpack_from("%s%d%s" % (self._BYTE_ORDER, length, type_code), self._buffer, self._pos)
+        self._pos += size
+        return list(values)
+
     def _read_array_fnc(self, read_item_fnc):
         length = self.read_int()
         if length == NULL_ARRAY_LENGTH:
@@ -1,7 +1,15 @@
+import struct
+
 from hazelcast.serialization.api import *
 from hazelcast.serialization.bits import *
+from hazelcast.serialization.data import _join_payloads
 from hazelcast.six.moves import range
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class _ObjectDataOutput(ObjectDataOutput):
     def __init__(self, init_size, serialization_service, is_big_endian=True):
@@ -10,6 +18,7 @@ class _ObjectDataOutput(ObjectDataOutput):
         self._service = serialization_service
         self._is_big_endian = is_big_endian
         self._pos = 0
+        self._payloads = None  # list of (position, payload) for the byte arrays written without copying
         # Local cache struct formats according to endianness
         self._FMT_INT = BE_INT if self._is_big_endian else LE_INT
         self._FMT_SHORT = BE_INT16 if self._is_big_endian else LE_INT16
@@ -17,6 +26,7 @@ class _ObjectDataOutput(ObjectDataOutput):
         self._FMT_LONG = BE_LONG if self._is_big_endian else LE_LONG
         self._FMT_FLOAT = BE_FLOAT if self._is_big_endian else LE_FLOAT
         self._FMT_DOUBLE = BE_DOUBLE if self._is_big_endian else LE_DOUBLE
+        self._BYTE_ORDER = ">" if self._is_big_endian else "<"
 
     def _write(self, val):
         self._ensure_available(BYTE_SIZE_IN_BYTES)
@@ -92,25 +102,28 @@ class _ObjectDataOutput(ObjectDataOutput):
             self.write_from(val)
 
     def write_boolean_array(self, val):
-        self._write_array_fnc(val, self.write_boolean)
+        self._write_primitive_array(val, "?", BOOLEAN_SIZE_IN_BYTES)
 
     def write_char_array(self, val):
-        self._write_array_fnc(val, self.write_char)
+        _len = len(val) if val is not None else NULL_ARRAY_LENGTH
+        self.write_int(_len)
+        if _len > 0:
+            self.write_from(u"".join(val).encode(self._CHAR_ENCODING))
 
     def write_int_array(self, val):
-        self._write_array_fnc(val, self.write_int)
+        self._write_primitive_array(val, "i", INT_SIZE_IN_BYTES)
 
     def write_long_array(self, val):
-        self._write_array_fnc(val, self.write_long)
+        self._write_primitive_array(val, "q", LONG_SIZE_IN_BYTES)
 
     def write_double_array(self, val):
-        self._write_array_fnc(val, self.write_double)
+        self._write_primitive_array(val, "d", DOUBLE_SIZE_IN_BYTES)
 
     def write_float_array(self, val):
-        self._write_array_fnc(val, self.write_float)
+        self._write_primitive_array(val, "f", FLOAT_SIZE_IN_BYTES)
 
     def write_short_array(self, val):
-        self._write_array_fnc(val, self.write_short)
+        self._write_primitive_array(val, "h", SHORT_SIZE_IN_BYTES)
 
     def write_utf_array(self, val):
         self._write_array_fnc(val, self.write_utf)
@@ -122,12 +135,53 @@ class _ObjectDataOutput(ObjectDataOutput):
         payload = data.to_bytes() if data is not None else None
         self.write_byte_array(payload)
 
+    def write_byte_array_payload(self, val):
+        """
+        Writes a byte array like :func:`write_byte_array`, without copying it into the output.
+        It is referenced by the serialized form, and written to the socket as it is.
+        Positions of the output do not account for it, it must not be used by the
+        serializers that record positions, such as the Portable one.
+
+        :param val: (bytes|bytearray|memoryview), the byte array. It must not be modified afterwards.
+        """
+        self.write_int(len(val))
+        if len(val) > 0:
+            if self._payloads is None:
+                self._payloads = []
+            self._payloads.append((self._pos, val))
+
     def to_byte_array(self):
-        if self._buffer is None or self._pos == 0:
+        if self._buffer is None or (self._pos == 0 and self._payloads is None):
             return bytearray()
-        new_buffer = bytearray(self._pos)
-        new_buffer[:] = self._buffer[:self._pos]
-        return new_buffer
+        if self._payloads is not None:
+            return _join_payloads(self._buffer[:self._pos], self._payloads)
+        return self._buffer[:self._pos]
+
+    def to_byte_array_and_payloads(self):
+        """
+        Returns the written bytes, except the byte arrays written with :func:`write_byte_array_payload`,
+        and the list of (offset, payload) pairs for those, or ``None`` if there are none.
+
+        :return: (tuple), the bytes and the payloads.
+        """
+        if self._buffer is None or self._pos == 0:
+            return bytearray(), None
+        return self._buffer[:self._pos], self._payloads
+
+    def buffer_size(self):
+        """
+        Returns the size of the underlying buffer, which may be larger than the written bytes.
+
+        :return: (int), size of the buffer.
+        """
+        return len(self._buffer) if self._buffer is not None else 0
+
+    def clear(self):
+        """
+        Resets the position so that the output can be reused. Keeps the underlying buffer.
+        """
+        self._pos = 0
+        self._payloads = None
 
     def is_big_endian(self):
         return self._is_big_endian
@@ -143,6 +197,27 @@ class _ObjectDataOutput(ObjectDataOutput):
             self._write(0)
 
     # HELPERS
+    def _write_primitive_array(self, val, type_code, item_size):
+        # Packs the whole array at once. type_code is the struct format
+        # character of the items, which NumPy understands as well.
+        _len = len(val) if val is not None else NULL_ARRAY_LENGTH
+        self.write_int(_len)
+        if _len <= 0:
+            return
+        size = _len * item_size
+        self._ensure_available(size)
+        if numpy is not None and isinstance(val, numpy.ndarray):
+            if val.ndim != 1:
+                raise ValueError("Only one dimensional arrays can be serialized, got {} dimensions".format(val.ndim))
+            dtype = numpy.dtype(self._BYTE_ORDER + type_code)
+            if val.dtype.kind == dtype.kind and val.dtype.itemsize == dtype.itemsize:
+                # only the byte order may differ, the conversion cannot lose anything
+                self._buffer[self._pos:self._pos + size] = val.astype(dtype, copy=False).tobytes()
+                self._pos += size
+                return
+        struct.pack_into("%s%d%s" % (self._BYTE_ORDER, _len, type_code), self._buffer, self._pos, *val)
+        self._pos += size
+
     def _write_array_fnc(self, val, item_write_fnc):
         _len = len(val) if val is not None else NULL_ARRAY_LENGTH
         self.write_int(_len)
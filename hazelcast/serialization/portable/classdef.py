@@ -110,6 +110,24 @@ class ClassDefinition(object):
         return id(self)//16
 
 
+class FieldTable(object):
+    """
+    Lookup table of the fields of a class definition. It is built once per class definition and shared by the
+    portable readers, so that a field is resolved with a single dictionary lookup.
+    """
+
+    def __init__(self, class_def):
+        self.class_def = class_def
+        self.field_count = class_def.get_field_count()
+        # field name: (field type, offset of the position in the field index table, offset of the value)
+        self.fields = {}
+        field_defs = sorted(six.itervalues(class_def.field_defs), key=lambda fd: fd.index)
+        for fd in field_defs:
+            # the value follows the length of the name, the name and the field type
+            self.fields[fd.field_name] = (fd.field_type, fd.index * 4, 2 + len(fd.field_name) + 1)
+        self.field_defs = tuple(field_defs)
+
+
 class ClassDefinitionBuilder(object):
     def __init__(self, factory_id, class_id, version=0):
         self.factory_id = factory_id
@@ -3,7 +3,8 @@ import threading
 from hazelcast import util
 from hazelcast.errors import HazelcastSerializationError
 from hazelcast.serialization import bits
-from hazelcast.serialization.portable.classdef import ClassDefinition, ClassDefinitionBuilder, FieldType, FieldDefinition
+from hazelcast.serialization.portable.classdef import ClassDefinition, ClassDefinitionBuilder, FieldType, \
+    FieldDefinition, FieldTable
 from hazelcast.serialization.portable.writer import ClassDefinitionWriter
 from hazelcast.six.moves import range
 
@@ -80,6 +81,17 @@ class PortableContext(object):
     def register_class_definition(self, class_definition):
         return self._get_class_def_context(class_definition.factory_id).register(class_definition)
 
+    def get_field_table(self, class_definition):
+        """
+        Returns the field lookup table of the class definition. The tables of the registered class definitions are
+        cached next to them.
+
+        :param class_definition: (:class:`~hazelcast.serialization.portable.classdef.ClassDefinition`), the class
+            definition.
+        :return: (:class:`~hazelcast.serialization.portable.classdef.FieldTable`), lookup table of the fields.
+        """
+        return self._get_class_def_context(class_definition.factory_id).get_field_table(class_definition)
+
     def lookup_or_register_class_definition(self, portable):
         fid = portable.get_factory_id()
         cid = portable.get_class_id()
@@ -105,6 +117,7 @@ class ClassDefinitionContext(object):
         self._portable_version = portable_version
         self._versioned_definitions = {}  # (class_id, version) : ClassDefinition
         self._current_class_versions = {}  # class_id:version
+        self._field_tables = {}  # (class_id, version) : FieldTable
         self._lock = threading.RLock()
 
     def get_class_version(self, class_id):
@@ -121,6 +134,16 @@ class ClassDefinitionContext(object):
     def lookup(self, class_id, version):
         return self._versioned_definitions.get((class_id, version), None)
 
+    def get_field_table(self, class_def):
+        combined_key = (class_def.class_id, class_def.version)
+        table = self._field_tables.get(combined_key, None)
+        if table is not None and table.class_def is class_def:
+            return table
+        table = FieldTable(class_def)
+        if self._versioned_definitions.get(combined_key, None) is class_def:
+            self._field_tables[combined_key] = table
+        return table
+
     def register(self, class_def):
         with self._lock:
             if class_def is None:
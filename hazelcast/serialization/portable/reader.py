@@ -2,14 +2,43 @@ from hazelcast.errors import HazelcastSerializationError
 from hazelcast.serialization import bits
 from hazelcast.serialization.api import PortableReader
 from hazelcast.serialization.portable.classdef import FieldType
+from hazelcast import six
 from hazelcast.six.moves import range
 
+# methods of the input that read the fields at a given position
+_POSITIONAL_READS = {
+    FieldType.BYTE: "read_byte",
+    FieldType.BOOLEAN: "read_boolean",
+    FieldType.CHAR: "read_char",
+    FieldType.SHORT: "read_short",
+    FieldType.INT: "read_int",
+    FieldType.LONG: "read_long",
+    FieldType.FLOAT: "read_float",
+    FieldType.DOUBLE: "read_double",
+}
+
+# methods of the input that read the fields at the current position
+_SEQUENTIAL_READS = {
+    FieldType.UTF: "read_utf",
+    FieldType.BYTE_ARRAY: "read_byte_array",
+    FieldType.BOOLEAN_ARRAY: "read_boolean_array",
+    FieldType.CHAR_ARRAY: "read_char_array",
+    FieldType.SHORT_ARRAY: "read_short_array",
+    FieldType.INT_ARRAY: "read_int_array",
+    FieldType.LONG_ARRAY: "read_long_array",
+    FieldType.FLOAT_ARRAY: "read_float_array",
+    FieldType.DOUBLE_ARRAY: "read_double_array",
+    FieldType.UTF_ARRAY: "read_utf_array",
+}
+
 
 class DefaultPortableReader(PortableReader):
     def __init__(self, portable_serializer, data_input, class_def):
         self._portable_serializer = portable_serializer
         self._in = data_input
         self._class_def = class_def
+        self._field_table = portable_serializer.get_field_table(class_def)
+        self._fields = self._field_table.fields
         try:
             # final position after portable is read
             self._final_pos = data_input.read_int()
@@ -81,24 +110,13 @@ class DefaultPortableReader(PortableReader):
     def read_portable(self, field_name):
         cur_pos = self._in.position()
         try:
-            fd = self._class_def.get_field(field_name)
+            fd = self._class_def.field_defs.get(field_name)
             if fd is None:
                 raise self._create_unknown_field_exception(field_name)
             if fd.field_type != FieldType.PORTABLE:
                 raise HazelcastSerializationError("Not a Portable field: {}".format(field_name))
 
-            pos = self._read_position_by_field_def(fd)
-            self._in.set_position(pos)
-
-            is_none = self._in.read_boolean()
-            factory_id = self._in.read_int()
-            class_id = self._in.read_int()
-
-            _check_factory_and_class(fd, factory_id, class_id)
-
-            if is_none:
-                return None
-            return self._portable_serializer.read_internal(self._in, factory_id, class_id)
+            return self._read_portable_at(fd, self._read_position_by_field_def(fd))
         finally:
             self._in.set_position(cur_pos)
 
@@ -187,31 +205,62 @@ class DefaultPortableReader(PortableReader):
     def read_portable_array(self, field_name):
         current_pos = self._in.position()
         try:
-            fd = self._class_def.get_field(field_name)
+            fd = self._class_def.field_defs.get(field_name)
             if fd is None:
                 raise self._create_unknown_field_exception(field_name)
             if fd.field_type != FieldType.PORTABLE_ARRAY:
                 raise HazelcastSerializationError("Not a portable array field: {}".format(field_name))
 
-            pos = self._read_position_by_field_def(fd)
-            self._in.set_position(pos)
+            return self._read_portable_array_at(fd, self._read_position_by_field_def(fd))
+        finally:
+            self._in.set_position(current_pos)
+
+    def read_all(self, obj=None):
+        """
+        Reads all the fields of the portable in a single pass over the field index table.
 
-            length = self._in.read_int()
-            factory_id = self._in.read_int()
-            class_id = self._in.read_int()
-            if length == bits.NULL_ARRAY_LENGTH:
-                return None
-
-            _check_factory_and_class(fd, factory_id, class_id)
-
-            portables = [None] * length
-            if length > 0:
-                offset = self._in.position()
-                for i in range(0, length):
-                    start = self._in.read_int(offset + i * bits.INT_SIZE_IN_BYTES)
-                    self._in.set_position(start)
-                    portables[i] = self._portable_serializer.read_internal(self._in, factory_id, class_id)
-            return portables
+        :param obj: (object), if given, the fields are set as the attributes of it with the same names.
+        :return: (dict|object), dictionary of the field names and values, or the given object.
+        """
+        if self._raw:
+            raise HazelcastSerializationError("Cannot read Portable fields after get_raw_data_input() is called!")
+        inp = self._in
+        offset = self._offset
+        fields = self._fields
+        values = {}
+        current_pos = inp.position()
+        try:
+            for fd in self._field_table.field_defs:
+                field_name = fd.field_name
+                field_type, index_offset, value_offset = fields[field_name]
+                pos = inp.read_int(offset + index_offset) + value_offset
+                values[field_name] = self._read_value_at(fd, field_type, pos)
+        finally:
+            inp.set_position(current_pos)
+
+        if obj is None:
+            return values
+        for field_name, value in six.iteritems(values):
+            setattr(obj, field_name, value)
+        return obj
+
+    def read_field(self, field_name):
+        """
+        Reads a top level field of the portable, whatever its type is.
+
+        :param field_name: (str), name of the field.
+        :return: (object), value of the field.
+        """
+        if self._raw:
+            raise HazelcastSerializationError("Cannot read Portable fields after get_raw_data_input() is called!")
+        fd = self._class_def.field_defs.get(field_name)
+        if fd is None:
+            raise self._create_unknown_field_exception(field_name)
+        field_type, index_offset, value_offset = self._fields[field_name]
+        current_pos = self._in.position()
+        try:
+            pos = self._in.read_int(self._offset + index_offset) + value_offset
+            return self._read_value_at(fd, field_type, pos)
         finally:
             self._in.set_position(current_pos)
 
@@ -228,12 +277,13 @@ class DefaultPortableReader(PortableReader):
     def _read_position(self, field_name, field_type):
         if self._raw:
             raise HazelcastSerializationError("Cannot read Portable fields after get_raw_data_input() is called!")
-        fd = self._class_def.get_field(field_name)
-        if fd is None:
+        try:
+            actual_type, index_offset, value_offset = self._fields[field_name]
+        except KeyError:
             return self._read_nested_position(field_name, field_type)
-        if fd.field_type != field_type:
+        if actual_type != field_type:
             raise HazelcastSerializationError("Not a '{}' field: {}".format(field_type, field_name))
-        return self._read_position_by_field_def(fd)
+        return self._in.read_int(self._offset + index_offset) + value_offset
 
     def _read_nested_position(self, field_name, field_type):
         field_names = field_name.split(".")
@@ -265,9 +315,50 @@ class DefaultPortableReader(PortableReader):
 
     def _read_position_by_field_def(self, fd):
         pos = self._in.read_int(self._offset + fd.index * bits.INT_SIZE_IN_BYTES)
-        _len = self._in.read_short(pos)
-        # name + len + type
-        return pos + bits.SHORT_SIZE_IN_BYTES + _len + 1
+        # name + len + type, the name is the same with the one in the class definition of the stream
+        return pos + bits.SHORT_SIZE_IN_BYTES + len(fd.field_name) + 1
+
+    def _read_value_at(self, fd, field_type, pos):
+        inp = self._in
+        if field_type in _POSITIONAL_READS:
+            return getattr(inp, _POSITIONAL_READS[field_type])(pos)
+        elif field_type == FieldType.PORTABLE:
+            return self._read_portable_at(fd, pos)
+        elif field_type == FieldType.PORTABLE_ARRAY:
+            return self._read_portable_array_at(fd, pos)
+        inp.set_position(pos)
+        return getattr(inp, _SEQUENTIAL_READS[field_type])()
+
+    def _read_portable_at(self, fd, pos):
+        self._in.set_position(pos)
+        is_none = self._in.read_boolean()
+        factory_id = self._in.read_int()
+        class_id = self._in.read_int()
+
+        _check_factory_and_class(fd, factory_id, class_id)
+
+        if is_none:
+            return None
+        return self._portable_serializer.read_internal(self._in, factory_id, class_id)
+
+    def _read_portable_array_at(self, fd, pos):
+        self._in.set_position(pos)
+        length = self._in.read_int()
+        factory_id = self._in.read_int()
+        class_id = self._in.read_int()
+        if length == bits.NULL_ARRAY_LENGTH:
+            return None
+
+        _check_factory_and_class(fd, factory_id, class_id)
+
+        portables = [None] * length
+        if length > 0:
+            offset = self._in.position()
+            for i in range(0, length):
+                start = self._in.read_int(offset + i * bits.INT_SIZE_IN_BYTES)
+                self._in.set_position(start)
+                portables[i] = self._portable_serializer.read_internal(self._in, factory_id, class_id)
+        return portables
 
 
 def _check_factory_and_class(field_def, factory_id, class_id):
@@ -280,7 +371,7 @@ def _check_factory_and_class(field_def, factory_id, class_id):
 class MorphingPortableReader(DefaultPortableReader):
 
     def read_short(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return 0
         elif fd.field_type == FieldType.SHORT:
@@ -291,7 +382,7 @@ class MorphingPortableReader(DefaultPortableReader):
             raise self.create_incompatible_class_change_error(fd, FieldType.SHORT)
 
     def read_int(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return 0
         elif fd.field_type == FieldType.INT:
@@ -306,7 +397,7 @@ class MorphingPortableReader(DefaultPortableReader):
             raise self.create_incompatible_class_change_error(fd, FieldType.INT)
 
     def read_long(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return 0
         elif fd.field_type == FieldType.LONG:
@@ -323,7 +414,7 @@ class MorphingPortableReader(DefaultPortableReader):
             raise self.create_incompatible_class_change_error(fd, FieldType.LONG)
 
     def read_float(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return 0
         elif fd.field_type == FieldType.FLOAT:
@@ -340,7 +431,7 @@ class MorphingPortableReader(DefaultPortableReader):
             raise self.create_incompatible_class_change_error(fd, FieldType.FLOAT)
 
     def read_double(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return 0.0
         elif fd.field_type == FieldType.DOUBLE:
@@ -361,105 +452,105 @@ class MorphingPortableReader(DefaultPortableReader):
             raise self.create_incompatible_class_change_error(fd, FieldType.DOUBLE)
 
     def read_byte(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return 0
         self.validate_type_compatibility(fd, FieldType.BYTE)
         return super(MorphingPortableReader, self).read_byte(field_name)
 
     def read_boolean(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return False
         self.validate_type_compatibility(fd, FieldType.BOOLEAN)
         return super(MorphingPortableReader, self).read_boolean(field_name)
 
     def read_char(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return 0
         self.validate_type_compatibility(fd, FieldType.CHAR)
         return super(MorphingPortableReader, self).read_char(field_name)
 
     def read_utf(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return None
         self.validate_type_compatibility(fd, FieldType.UTF)
         return super(MorphingPortableReader, self).read_utf(field_name)
 
     def read_utf_array(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return None
         self.validate_type_compatibility(fd, FieldType.UTF_ARRAY)
         return super(MorphingPortableReader, self).read_utf_array(field_name)
 
     def read_short_array(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return None
         self.validate_type_compatibility(fd, FieldType.SHORT_ARRAY)
         return super(MorphingPortableReader, self).read_short_array(field_name)
 
     def read_int_array(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return None
         self.validate_type_compatibility(fd, FieldType.INT_ARRAY)
         return super(MorphingPortableReader, self).read_int_array(field_name)
 
     def read_long_array(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return None
         self.validate_type_compatibility(fd, FieldType.LONG_ARRAY)
         return super(MorphingPortableReader, self).read_long_array(field_name)
 
     def read_float_array(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return None
         self.validate_type_compatibility(fd, FieldType.FLOAT_ARRAY)
         return super(MorphingPortableReader, self).read_float_array(field_name)
 
     def read_double_array(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return None
         self.validate_type_compatibility(fd, FieldType.DOUBLE_ARRAY)
         return super(MorphingPortableReader, self).read_double_array(field_name)
 
     def read_char_array(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return None
         self.validate_type_compatibility(fd, FieldType.CHAR_ARRAY)
         return super(MorphingPortableReader, self).read_char_array(field_name)
 
     def read_byte_array(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return None
         self.validate_type_compatibility(fd, FieldType.BYTE_ARRAY)
         return super(MorphingPortableReader, self).read_byte_array(field_name)
 
     def read_boolean_array(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return None
         self.validate_type_compatibility(fd, FieldType.BOOLEAN_ARRAY)
         return super(MorphingPortableReader, self).read_boolean_array(field_name)
 
     def read_portable(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return None
         self.validate_type_compatibility(fd, FieldType.PORTABLE)
         return super(MorphingPortableReader, self).read_portable(field_name)
 
     def read_portable_array(self, field_name):
-        fd = self._class_def.get_field(field_name)
+        fd = self._class_def.field_defs.get(field_name)
         if fd is None:
             return None
         self.validate_type_compatibility(fd, FieldType.PORTABLE_ARRAY)
@@ -0,0 +1,95 @@
+class PortableRecord(object):
+    """
+    Read-only view of a serialized :class:`~hazelcast.serialization.api.Portable`. It keeps the serialized
+    form and decodes a field only when it is accessed, either as an attribute or with :func:`get_field`.
+    Decoded fields are cached. The fields are the ones of the class definition the object is written with,
+    so the Portable factory of the class is not needed unless the object is materialized with :func:`to_object`.
+    Nested portables are fully deserialized when their field is accessed. Fields whose names clash with
+    the methods or properties of the record can be read with :func:`get_field` only.
+
+    A record is not thread-safe, it should not be shared by threads that access its fields concurrently.
+    """
+    __slots__ = ("_data", "_portable_serializer", "_serialization_service", "_reader", "_values")
+
+    def __init__(self, data, portable_serializer, serialization_service):
+        self._data = data
+        self._portable_serializer = portable_serializer
+        self._serialization_service = serialization_service
+        self._reader = None
+        self._values = {}
+
+    @property
+    def data(self):
+        """Serialized form of the portable."""
+        return self._data
+
+    @property
+    def class_definition(self):
+        """Class definition the portable is written with."""
+        return self._get_reader()._class_def
+
+    def get_field_names(self):
+        """
+        Returns the names of the fields of the portable.
+
+        :return: (set), names of the fields.
+        """
+        return self._get_reader().get_field_names()
+
+    def has_field(self, field_name):
+        """
+        Determines whether the portable has a field with the given name.
+
+        :param field_name: (str), name of the field.
+        :return: (bool), ``true`` if the field exists, ``false`` otherwise.
+        """
+        return self._get_reader().has_field(field_name)
+
+    def get_field(self, field_name):
+        """
+        Decodes and returns the value of the field with the given name.
+
+        :param field_name: (str), name of the field.
+        :return: (object), value of the field.
+        """
+        try:
+            return self._values[field_name]
+        except KeyError:
+            value = self._get_reader().read_field(field_name)
+            self._values[field_name] = value
+            return value
+
+    def to_object(self):
+        """
+        Fully deserializes the portable with its registered factory.
+
+        :return: (:class:`~hazelcast.serialization.api.Portable`), the deserialized object.
+        """
+        return self._serialization_service.to_object(self._data)
+
+    def _get_reader(self):
+        reader = self._reader
+        if reader is None:
+            inp = self._serialization_service._create_data_input(self._data)
+            reader = self._portable_serializer.create_default_reader(inp)
+            self._reader = reader
+        return reader
+
+    def __getattr__(self, name):
+        # only called for the names which are not slots or methods
+        if name.startswith("_") or not self.has_field(name):
+            raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+        return self.get_field(name)
+
+    def __eq__(self, other):
+        return isinstance(other, PortableRecord) and self._data == other._data
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._data)
+
+    def __repr__(self):
+        cd = self.class_definition
+        return "PortableRecord(factory_id={}, class_id={}, version={})".format(cd.factory_id, cd.class_id, cd.version)
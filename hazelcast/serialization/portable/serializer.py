@@ -1,6 +1,8 @@
 import hazelcast.util as util
 from hazelcast.errors import HazelcastSerializationError
 from hazelcast.serialization.api import StreamSerializer, Portable
+from hazelcast.serialization.input import _ObjectDataInput
+from hazelcast.serialization.output import _ObjectDataOutput
 from hazelcast.serialization.portable.reader import DefaultPortableReader, MorphingPortableReader
 from hazelcast.serialization.portable.writer import DefaultPortableWriter
 from hazelcast.serialization.serialization_const import CONSTANT_TYPE_PORTABLE
@@ -24,6 +26,11 @@ class PortableSerializer(StreamSerializer):
         cd = self._portable_context.lookup_or_register_class_definition(portable)
         out.write_int(cd.version)
 
+        compiled = getattr(portable, "_compiled_portable", None)
+        if compiled is not None and out.__class__ is _ObjectDataOutput and compiled.matches(cd):
+            compiled.write(self, out, portable)
+            return
+
         writer = DefaultPortableWriter(self, out, cd)
         portable.write_portable(writer)
         writer.end()
@@ -37,6 +44,15 @@ class PortableSerializer(StreamSerializer):
         version = inp.read_int()
         portable = self.create_new_portable_instance(factory_id, class_id)
         portable_version = self.find_portable_version(factory_id, class_id, portable)
+
+        compiled = getattr(portable, "_compiled_portable", None)
+        if compiled is not None and version == portable_version and inp.__class__ is _ObjectDataInput:
+            # same conditions with the default reader, for a class definition that is already known
+            cd = self._portable_context.lookup_class_definition(factory_id, class_id, version)
+            if cd is not None and compiled.matches(cd):
+                compiled.read(self, inp, portable)
+                return portable
+
         reader = self.create_reader(inp, factory_id, class_id, version, portable_version)
         portable.read_portable(reader)
         reader.end()
@@ -50,6 +66,9 @@ class PortableSerializer(StreamSerializer):
             self._portable_context.set_class_version(factory_id, class_id, current_version)
         return current_version
 
+    def get_field_table(self, class_def):
+        return self._portable_context.get_field_table(class_def)
+
     def create_new_portable_instance(self, factory_id, class_id):
         try:
             portable_factory = self._portable_factories[factory_id]
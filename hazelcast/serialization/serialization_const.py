@@ -40,3 +40,5 @@ JAVASCRIPT_JSON_SERIALIZATION_TYPE = -130
 
 JAVA_DEFAULT_TYPE_SERIALIZABLE = -100
 PYTHON_TYPE_PICKLE = -120
+PYTHON_TYPE_BINARY_PICKLE = -121
+PYTHON_TYPE_COMPRESSED = -122
@@ -8,6 +8,8 @@ from hazelcast.core import HazelcastJsonValue
 from hazelcast.serialization.bits import *
 from hazelcast.serialization.api import StreamSerializer
 from hazelcast.serialization.base import HazelcastSerializationError
+from hazelcast.serialization.data import DATA_OFFSET
+from hazelcast.serialization.output import _ObjectDataOutput
 from hazelcast.serialization.serialization_const import *
 from hazelcast.six.moves import range, cPickle
 
@@ -339,6 +341,47 @@ class LinkedListSerializer(BaseSerializer):
         return JAVA_DEFAULT_TYPE_LINKED_LIST
 
 
+# type id, struct format character and method of the output that writes the array
+_NDARRAY_FORMATS = {
+    ("b", 1): (CONSTANT_TYPE_BOOLEAN_ARRAY, "?", "write_boolean_array"),
+    ("i", 2): (CONSTANT_TYPE_SHORT_ARRAY, "h", "write_short_array"),
+    ("i", 4): (CONSTANT_TYPE_INTEGER_ARRAY, "i", "write_int_array"),
+    ("i", 8): (CONSTANT_TYPE_LONG_ARRAY, "q", "write_long_array"),
+    ("f", 4): (CONSTANT_TYPE_FLOAT_ARRAY, "f", "write_float_array"),
+    ("f", 8): (CONSTANT_TYPE_DOUBLE_ARRAY, "d", "write_double_array"),
+}
+
+
+class NumpyArraySerializer(BaseSerializer):
+    """
+    Serializes one dimensional NumPy arrays as the Java primitive arrays of the same item type,
+    and reads those arrays back as NumPy arrays.
+    """
+
+    def __init__(self, type_id, type_code, write_method):
+        self._type_id = type_id
+        self._type_code = type_code
+        self._write_method = write_method
+
+    def read(self, inp):
+        return inp.read_ndarray(self._type_code)
+
+    def write(self, out, obj):
+        getattr(out, self._write_method)(obj)
+
+    def get_type_id(self):
+        return self._type_id
+
+
+def create_numpy_array_serializers():
+    """
+    Creates the NumPy array serializers.
+
+    :return: (dict), dictionary of (dtype kind, item size):serializer pairs.
+    """
+    return dict((dtype, NumpyArraySerializer(*args)) for dtype, args in six.iteritems(_NDARRAY_FORMATS))
+
+
 class PythonObjectSerializer(BaseSerializer):
     def read(self, inp):
         str = inp.read_utf().encode()
@@ -351,6 +394,49 @@ class PythonObjectSerializer(BaseSerializer):
         return PYTHON_TYPE_PICKLE
 
 
+_PICKLE_PROTOCOL = cPickle.HIGHEST_PROTOCOL
+
+
+class BinaryPickleSerializer(BaseSerializer):
+    """
+    Pickles the objects with the highest protocol available and writes them as byte arrays.
+    With protocol 5 and above, the buffers of the objects that support out-of-band data,
+    such as NumPy arrays, are written after the pickle instead of being copied into it.
+    When the object is serialized on its own, the buffers are not copied at all, they are
+    referenced by the serialized form and written to the socket as they are.
+    """
+    def read(self, inp):
+        pickled = inp.read_byte_array()
+        buffer_count = inp.read_int()
+        if six.PY2:
+            return cPickle.loads(bytes(pickled))
+        if buffer_count == 0:
+            return cPickle.loads(pickled)
+        buffers = [inp.read_byte_array() for _ in range(buffer_count)]
+        return cPickle.loads(pickled, buffers=buffers)
+
+    def write(self, out, obj):
+        if _PICKLE_PROTOCOL < 5:
+            out.write_byte_array(cPickle.dumps(obj, _PICKLE_PROTOCOL))
+            out.write_int(0)
+            return
+
+        # The buffers of the nested objects are copied, since the
+        # serializers of their containers may rely on the positions.
+        write_buffer = out.write_byte_array
+        if out.__class__ is _ObjectDataOutput and out.position() == DATA_OFFSET:
+            write_buffer = out.write_byte_array_payload
+
+        buffers = []
+        out.write_byte_array(cPickle.dumps(obj, _PICKLE_PROTOCOL, buffer_callback=buffers.append))
+        out.write_int(len(buffers))
+        for buf in buffers:
+            write_buffer(buf.raw())
+
+    def get_type_id(self):
+        return PYTHON_TYPE_BINARY_PICKLE
+
+
 class IdentifiedDataSerializer(BaseSerializer):
     def __init__(self, factories):
         self._factories = factories
@@ -1,28 +1,34 @@
 import uuid
 
-from hazelcast.serialization.base import BaseSerializationService
+from hazelcast.config import COMPRESSION_ALGORITHM
+from hazelcast.serialization.base import BaseSerializationService, default_partition_strategy
+from hazelcast.serialization.compression import DataCompressor
 from hazelcast.serialization.portable.classdef import FieldType
 from hazelcast.serialization.portable.context import PortableContext
 from hazelcast.serialization.portable.serializer import PortableSerializer
 from hazelcast.serialization.serializer import *
 from hazelcast import six
 
-DEFAULT_OUT_BUFFER_SIZE = 4 * 1024
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
+DEFAULT_OUT_BUFFER_SIZE = 4 * 1024
 
-def default_partition_strategy(key):
-    if hasattr(key, "get_partition_key"):
-        return key.get_partition_key()
-    return None
+DEFAULT_MAX_POOLED_BUFFER_SIZE = 64 * 1024
 
 
 class SerializationServiceV1(BaseSerializationService):
 
     def __init__(self, serialization_config, version=1, global_partition_strategy=default_partition_strategy,
-                 output_buffer_size=DEFAULT_OUT_BUFFER_SIZE):
+                 output_buffer_size=DEFAULT_OUT_BUFFER_SIZE, max_pooled_buffer_size=DEFAULT_MAX_POOLED_BUFFER_SIZE):
         super(SerializationServiceV1, self).__init__(version, global_partition_strategy, output_buffer_size,
                                                      serialization_config.is_big_endian,
-                                                     serialization_config.default_integer_type)
+                                                     serialization_config.default_integer_type,
+                                                     max_pooled_buffer_size,
+                                                     serialization_config.key_cache_max_size,
+                                                     self._create_compressor(serialization_config))
         self._portable_context = PortableContext(self, serialization_config.portable_version)
         self.register_class_definitions(serialization_config.class_definitions, serialization_config.check_class_def_errors)
         self._registry._portable_serializer = PortableSerializer(self._portable_context, serialization_config.portable_factories)
@@ -31,7 +37,11 @@ class SerializationServiceV1(BaseSerializationService):
         factories = {}
         factories.update(serialization_config.data_serializable_factories)
         self._registry._data_serializer = IdentifiedDataSerializer(factories)
+        if serialization_config.use_binary_pickle:
+            self._registry._python_serializer = BinaryPickleSerializer()
         self._register_constant_serializers()
+        if serialization_config.use_numpy_arrays:
+            self._register_numpy_array_serializers()
 
         # Register Custom Serializers
         for _type, custom_serializer in six.iteritems(serialization_config.custom_serializers):
@@ -42,6 +52,14 @@ class SerializationServiceV1(BaseSerializationService):
         if global_serializer:
             self._registry._global_serializer = global_serializer()
 
+    @staticmethod
+    def _create_compressor(serialization_config):
+        algorithm = serialization_config.compression_algorithm
+        if algorithm == COMPRESSION_ALGORITHM.NONE:
+            return None
+        return DataCompressor(algorithm, serialization_config.compression_threshold,
+                              serialization_config.compression_policy)
+
     def _register_constant_serializers(self):
         self._registry.register_constant_serializer(self._registry._null_serializer, type(None))
         self._registry.register_constant_serializer(self._registry._data_serializer)
@@ -74,7 +92,14 @@ class SerializationServiceV1(BaseSerializationService):
         self._registry.register_constant_serializer(LinkedListSerializer())
         self._registry.register_constant_serializer(HazelcastJsonValueSerializer(), HazelcastJsonValue)
 
-        self._registry.safe_register_serializer(self._registry._python_serializer)
+        # objects pickled in either format can be read, whichever is used for the writes
+        self._registry.safe_register_serializer(PythonObjectSerializer())
+        self._registry.safe_register_serializer(BinaryPickleSerializer())
+
+    def _register_numpy_array_serializers(self):
+        if numpy is None:
+            raise ValueError("NumPy must be installed to use the NumPy array serializers")
+        self._registry.register_ndarray_serializers(numpy.ndarray, create_numpy_array_serializers())
 
     def register_class_definitions(self, class_definitions, check_error):
         class_defs = dict()
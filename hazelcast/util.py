@@ -1,7 +1,12 @@
 import threading
 import time
 import logging
-from collections import Sequence, Iterable
+
+try:
+    from collections.abc import Sequence, Iterable
+except ImportError:
+    # Python 2 does not have the collections.abc module
+    from collections import Sequence, Iterable
 
 from hazelcast import six
 from hazelcast.version import GIT_COMMIT_ID, GIT_COMMIT_DATE, CLIENT_VERSION
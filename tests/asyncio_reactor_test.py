@@ -0,0 +1,251 @@
+import socket
+import threading
+import time
+import unittest
+
+from hazelcast.config import ClientNetworkConfig, ClientProperties
+from hazelcast.core import Address
+from hazelcast.protocol.builtin import StringCodec
+from hazelcast.protocol.client_message import OutboundMessage, create_initial_buffer, REQUEST_HEADER_SIZE
+
+try:
+    from hazelcast.asyncio_reactor import AsyncioReactor
+except ImportError:
+    AsyncioReactor = None
+
+
+class _MockConnectionManager(object):
+    live = True
+
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def on_connection_close(self, connection, cause):
+        self.closed.set()
+
+
+class _EchoServer(object):
+    def __init__(self, paused=False):
+        self._resumed = threading.Event()
+        if not paused:
+            self._resumed.set()
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(1)
+        self.address = Address(*self._listener.getsockname())
+        self._thread = threading.Thread(target=self._serve)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def close(self):
+        self._listener.close()
+
+    def resume(self):
+        self._resumed.set()
+
+    def _serve(self):
+        sock, _ = self._listener.accept()
+        self._resumed.wait()
+        # Skip the protocol bytes and echo back everything else
+        protocol_bytes = b""
+        while len(protocol_bytes) < 3:
+            protocol_bytes += sock.recv(3 - len(protocol_bytes))
+        try:
+            while True:
+                data = sock.recv(1024)
+                if not data:
+                    break
+                sock.sendall(data)
+        except socket.error:
+            # the client has closed the connection
+            pass
+        sock.close()
+
+
+@unittest.skipIf(AsyncioReactor is None, "asyncio is not available")
+class AsyncioReactorTest(unittest.TestCase):
+    def setUp(self):
+        self.reactor = AsyncioReactor(ClientProperties({}), {})
+        self.reactor.start()
+
+    def tearDown(self):
+        self.reactor.shutdown()
+
+    def test_timer(self):
+        event = threading.Event()
+        start = time.time()
+        self.reactor.add_timer(0.05, event.set)
+        self.assertTrue(event.wait(5))
+        self.assertLess(time.time() - start, 1)
+
+    def test_canceled_timer(self):
+        event = threading.Event()
+        timer = self.reactor.add_timer(0.1, event.set)
+        timer.cancel()
+        self.assertFalse(event.wait(0.3))
+
+    def test_timer_statistics(self):
+        event = threading.Event()
+        self.reactor.add_timer(0.01, event.set)
+        self.reactor.add_timer(100, lambda: None).cancel()
+        self.reactor.add_timer(100, lambda: None)
+        self.assertTrue(event.wait(5))
+
+        stats = self.reactor.get_timer_statistics()
+        self.assertEqual(1, stats["pending"])
+        self.assertEqual(3, stats["scheduled"])
+        self.assertEqual(1, stats["expired"])
+        self.assertEqual(1, stats["canceled"])
+        self.assertGreaterEqual(stats["max_lateness"], 0)
+
+    def test_pending_timers_run_on_shutdown(self):
+        event = threading.Event()
+        self.reactor.add_timer(100, event.set)
+        self.reactor.shutdown()
+        self.assertTrue(event.is_set())
+
+    def test_connection_factory_raises_connection_errors(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        address = Address(*listener.getsockname())
+        listener.close()
+        with self.assertRaises(IOError):
+            self.reactor.connection_factory(_MockConnectionManager(), 0, address,
+                                            ClientNetworkConfig(), lambda m: None)
+
+    def test_send_and_receive(self):
+        self._send_and_receive(["message-%d" % i for i in range(10)])
+
+    def test_send_and_receive_messages_larger_than_the_read_buffer(self):
+        self._send_and_receive(["x" * 300000, "y" * 10, "z" * 200000])
+
+    def test_send_and_receive_fragmented_messages(self):
+        self.reactor.shutdown()
+        self.reactor = AsyncioReactor(ClientProperties({"hazelcast.client.io.max.frame.size": 1 << 16}), {})
+        self.reactor.start()
+        # the small message may be received before the fragmented ones
+        self._send_and_receive(["x" * 300000, "y" * 10, "z" * 200000], ordered=False)
+
+    def test_write_queue_water_marks(self):
+        self.reactor.shutdown()
+        self.reactor = AsyncioReactor(ClientProperties({
+            "hazelcast.client.io.write.queue.high.water.mark.bytes": 1 << 20,
+            "hazelcast.client.io.write.queue.low.water.mark.bytes": 1 << 18,
+        }), {})
+        self.reactor.start()
+        server = _EchoServer(paused=True)
+        try:
+            connection = self.reactor.connection_factory(_MockConnectionManager(), 0, server.address,
+                                                         ClientNetworkConfig(), lambda m: None)
+            buf = create_initial_buffer(REQUEST_HEADER_SIZE, 0)
+            StringCodec.encode(buf, "x" * (1 << 16), True)
+            message = OutboundMessage(buf, False)
+            # the transport and the socket buffers absorb some of the data before the queue grows
+            for _ in range(1024):
+                if not connection.wait_until_writable(0):
+                    break
+                connection.send_message(message)
+                time.sleep(0.001)
+
+            self.assertFalse(connection.wait_until_writable(0.1))
+            self.assertGreaterEqual(connection.pending_write_bytes, 1 << 20)
+
+            server.resume()
+            self.assertTrue(connection.wait_until_writable(5))
+            self.assertLessEqual(connection.pending_write_bytes, 1 << 18)
+            connection.close(None, None)
+        finally:
+            server.resume()
+            server.close()
+
+    def _send_and_receive(self, values, ordered=True):
+        server = _EchoServer()
+        received = []
+        event = threading.Event()
+
+        def on_message(message):
+            message.next_frame()
+            received.append(StringCodec.decode(message))
+            if len(received) == len(values):
+                event.set()
+
+        try:
+            connection_manager = _MockConnectionManager()
+            connection = self.reactor.connection_factory(connection_manager, 0, server.address,
+                                                         ClientNetworkConfig(), on_message)
+            for value in values:
+                buf = create_initial_buffer(REQUEST_HEADER_SIZE, 0)
+                StringCodec.encode(buf, value, True)
+                connection.send_message(OutboundMessage(buf, False))
+
+            self.assertTrue(event.wait(5))
+            if ordered:
+                self.assertEqual(values, received)
+            else:
+                self.assertEqual(sorted(values), sorted(received))
+            connection.close(None, None)
+            self.assertTrue(connection_manager.closed.is_set())
+        finally:
+            server.close()
+
+
+@unittest.skipIf(AsyncioReactor is None, "asyncio is not available")
+class MultiThreadedAsyncioReactorTest(unittest.TestCase):
+    def setUp(self):
+        self.reactor = AsyncioReactor(ClientProperties({"hazelcast.client.io.thread.count": 3}), {})
+        self.reactor.start()
+
+    def tearDown(self):
+        self.reactor.shutdown()
+
+    def test_timers_run_on_dedicated_thread(self):
+        event = threading.Event()
+        names = []
+
+        def callback():
+            names.append(threading.current_thread().name)
+            event.set()
+
+        self.reactor.add_timer(0, callback)
+        self.assertTrue(event.wait(5))
+        self.assertEqual(["hazelcast-reactor-timer"], names)
+
+    def test_connections_are_spread_across_threads(self):
+        servers = [_EchoServer() for _ in range(3)]
+        received = [[] for _ in range(3)]
+        events = [threading.Event() for _ in range(3)]
+        threads = [set() for _ in range(3)]
+
+        def on_message(i):
+            def callback(message):
+                threads[i].add(threading.current_thread().name)
+                message.next_frame()
+                received[i].append(StringCodec.decode(message))
+                if len(received[i]) == 100:
+                    events[i].set()
+
+            return callback
+
+        try:
+            connections = [self.reactor.connection_factory(_MockConnectionManager(), i, server.address,
+                                                           ClientNetworkConfig(), on_message(i))
+                           for i, server in enumerate(servers)]
+
+            for i, connection in enumerate(connections):
+                for j in range(100):
+                    buf = create_initial_buffer(REQUEST_HEADER_SIZE, 0)
+                    StringCodec.encode(buf, "%d-%d" % (i, j), True)
+                    connection.send_message(OutboundMessage(buf, False))
+
+            for i in range(3):
+                self.assertTrue(events[i].wait(5))
+                self.assertEqual(["%d-%d" % (i, j) for j in range(100)], received[i])
+                self.assertEqual(1, len(threads[i]))
+
+            self.assertEqual(3, len(set.union(*threads)))
+
+            for connection in connections:
+                connection.close(None, None)
+        finally:
+            for server in servers:
+                server.close()
@@ -10,8 +10,9 @@ from hazelcast.protocol.builtin import CodecUtil, FixSizedTypesCodec, ByteArrayC
     StringCodec, EntryListUUIDListIntegerCodec, EntryListUUIDLongCodec, ListMultiFrameCodec, ListIntegerCodec, \
     ListLongCodec, ListUUIDCodec, MapCodec
 from hazelcast.protocol.client_message import *
-from hazelcast.protocol.codec import client_authentication_codec
+from hazelcast.protocol.codec import client_authentication_codec, map_get_codec, map_put_codec
 from hazelcast.protocol.codec.custom.error_holder_codec import ErrorHolderCodec
+from hazelcast.protocol.template import RequestTemplate
 from hazelcast.serialization.data import Data
 
 
@@ -40,6 +41,157 @@ class OutboundMessageTest(unittest.TestCase):
         self.assertEqual(99, message.buf[0])
         self.assertEqual(0, copy.buf[0])  # should be a deep copy
 
+    def test_large_payloads_are_not_copied(self):
+        buf = create_initial_buffer(REQUEST_HEADER_SIZE, 0)
+        small = Data(bytearray(10))
+        large = Data(bytearray(MIN_EXTERNAL_PAYLOAD_SIZE))
+        DataCodec.encode(buf, small)
+        DataCodec.encode(buf, large)
+        DataCodec.encode(buf, large, True)
+        message = OutboundMessage(buf, False)
+
+        buffers = message.get_buffers()
+        self.assertEqual(4, len(buffers))
+        self.assertIs(large.to_bytes(), buffers[1])
+        self.assertIs(large.to_bytes(), buffers[3])
+        # header frame of the second payload is between them
+        self.assertEqual(SIZE_OF_FRAME_LENGTH_AND_FLAGS, len(buffers[2]))
+        self.assertEqual(len(buf) + 2 * len(large.to_bytes()), message.size())
+        self.assertEqual(message.size(), sum(len(b) for b in buffers))
+
+    def test_message_without_external_payloads(self):
+        buf = create_initial_buffer(REQUEST_HEADER_SIZE, 0)
+        DataCodec.encode(buf, Data(bytearray(10)), True)
+        message = OutboundMessage(buf, False)
+        self.assertEqual([buf], message.get_buffers())
+        self.assertEqual(len(buf), message.size())
+
+    def test_copy_with_external_payloads(self):
+        buf = create_initial_buffer(REQUEST_HEADER_SIZE, 0)
+        payload = bytearray(MIN_EXTERNAL_PAYLOAD_SIZE)
+        ByteArrayCodec.encode(buf, payload, True)
+        message = OutboundMessage(buf, False)
+
+        copy = message.copy()
+        first = buf[0]
+        buf[0] = first + 1
+        self.assertEqual(first, copy.buf[0])
+        copy_buffers = copy.get_buffers()
+        self.assertIs(payload, copy_buffers[1])
+        self.assertEqual(message.size(), copy.size())
+
+    def reassemble(self, fragments):
+        messages = []
+        builder = ClientMessageBuilder(messages.append)
+        reader = _Reader(None)
+        for fragment in fragments:
+            reader.read(bytearray().join(fragment))
+            builder.on_message(reader._read_message())
+        self.assertIsNone(reader._read_message())
+        self.assertEqual(1, len(messages))
+        return messages[0]
+
+    def test_fragments(self):
+        buf = create_initial_buffer(REQUEST_HEADER_SIZE, 0)
+        values = ["value-%d" % i * 10 for i in range(10)]
+        for value in values:
+            StringCodec.encode(buf, value)
+        StringCodec.encode(buf, "last", True)
+        message = OutboundMessage(buf, False)
+
+        fragments = message.get_fragments(200, 42)
+        self.assertGreater(len(fragments), 2)
+        for fragment in fragments:
+            self.assertEqual(42, LE_LONG.unpack_from(fragment[0], SIZE_OF_FRAME_LENGTH_AND_FLAGS)[0])
+
+        reassembled = self.reassemble(fragments)
+        reassembled.next_frame()
+        self.assertEqual(values, [StringCodec.decode(reassembled) for _ in values])
+        self.assertEqual("last", StringCodec.decode(reassembled))
+        self.assertFalse(reassembled.has_next_frame())
+
+    def test_fragments_with_external_payloads(self):
+        buf = create_initial_buffer(REQUEST_HEADER_SIZE, 0)
+        payload = bytearray(i % 251 for i in range(MIN_EXTERNAL_PAYLOAD_SIZE))
+        ByteArrayCodec.encode(buf, payload)
+        StringCodec.encode(buf, "a")
+        ByteArrayCodec.encode(buf, payload, True)
+        message = OutboundMessage(buf, False)
+
+        fragments = message.get_fragments(1024, 1)
+        # the large frames are not split, each of them makes up a fragment
+        self.assertEqual(4, len(fragments))
+        self.assertIs(payload, fragments[1][-1])
+        self.assertIs(payload, fragments[3][-1])
+
+        reassembled = self.reassemble(fragments)
+        reassembled.next_frame()
+        self.assertEqual(payload, ByteArrayCodec.decode(reassembled))
+        self.assertEqual("a", StringCodec.decode(reassembled))
+        self.assertEqual(payload, ByteArrayCodec.decode(reassembled))
+
+    def test_fragments_with_data_payloads(self):
+        payload = bytearray(i % 251 for i in range(MIN_EXTERNAL_PAYLOAD_SIZE))
+        head = bytearray(12)
+        data = Data(head + bytearray(16), payloads=[(12, payload), (20, payload)])
+        buf = create_initial_buffer(REQUEST_HEADER_SIZE, 0)
+        StringCodec.encode(buf, "a")
+        DataCodec.encode(buf, data)
+        StringCodec.encode(buf, "b", True)
+        message = OutboundMessage(buf, False)
+        self.assertEqual(2, sum(1 for b in message.get_buffers() if b is payload))
+
+        fragments = message.get_fragments(1024, 1)
+        self.assertEqual(3, len(fragments))
+        self.assertEqual(2, sum(1 for b in fragments[1] if b is payload))
+
+        reassembled = self.reassemble(fragments)
+        reassembled.next_frame()
+        self.assertEqual("a", StringCodec.decode(reassembled))
+        self.assertEqual(data, DataCodec.decode(reassembled))
+        self.assertEqual("b", StringCodec.decode(reassembled))
+
+    def test_message_smaller_than_the_max_frame_size_is_not_fragmented(self):
+        buf = create_initial_buffer(REQUEST_HEADER_SIZE, 0)
+        StringCodec.encode(buf, "a", True)
+        message = OutboundMessage(buf, False)
+        self.assertEqual([[buf]], message.get_fragments(1024, 1))
+
+
+class RequestTemplateTest(unittest.TestCase):
+    def setUp(self):
+        self.key = Data(bytearray(range(20)))
+        self.value = Data(bytearray(range(30)))
+
+    def test_key_request(self):
+        template = RequestTemplate(map_get_codec._REQUEST_MESSAGE_TYPE, "map", "<q", True)
+        message = template.encode_request(self.key, None, 42)
+        expected = map_get_codec.encode_request("map", self.key, 42)
+        self.assertEqual(expected.buf, message.buf)
+        self.assertTrue(message.retryable)
+
+    def test_key_value_request(self):
+        template = RequestTemplate(map_put_codec._REQUEST_MESSAGE_TYPE, "map", "<qq", False)
+        message = template.encode_request(self.key, self.value, 42, -1)
+        expected = map_put_codec.encode_request("map", self.key, self.value, 42, -1)
+        self.assertEqual(expected.buf, message.buf)
+        self.assertFalse(message.retryable)
+
+    def test_requests_are_independent(self):
+        template = RequestTemplate(map_get_codec._REQUEST_MESSAGE_TYPE, "map", "<q", True)
+        first = template.encode_request(self.key, None, 1)
+        first.set_correlation_id(5)
+        second = template.encode_request(self.key, None, 2)
+        self.assertEqual(map_get_codec.encode_request("map", self.key, 2).buf, second.buf)
+
+    def test_large_payloads(self):
+        template = RequestTemplate(map_put_codec._REQUEST_MESSAGE_TYPE, "map", "<qq", False)
+        value = Data(bytearray(MIN_EXTERNAL_PAYLOAD_SIZE))
+        message = template.encode_request(self.key, value, 42, -1)
+        expected = map_put_codec.encode_request("map", self.key, value, 42, -1)
+        self.assertEqual(bytearray().join(expected.get_buffers()), bytearray().join(message.get_buffers()))
+        self.assertIs(value.to_bytes(), message.get_buffers()[1])
+
 
 BEGIN_FRAME = Frame(bytearray(0), 1 << 12)
 END_FRAME = Frame(bytearray(), 1 << 11)
@@ -61,6 +213,31 @@ class InboundMessageTest(unittest.TestCase):
         CodecUtil.fast_forward_to_end_frame(message)
         self.assertFalse(message.has_next_frame())
 
+    def test_frames_are_stored_flat(self):
+        buf = bytearray(b"xxabcdefg")
+        message = InboundMessage()
+        message.append_frame(buf, 2, 3, 1 << 13)
+        message.append_frame(buf, 5, 4, 0)
+
+        self.assertEqual(1 << 13, message.peek_next_frame_flags())
+        self.assertEqual(b"abc", message.next_frame_content())
+        frame = message.peek_next_frame()
+        self.assertEqual(b"defg", frame.buf.tobytes())
+        self.assertEqual(0, frame.flags)
+        self.assertEqual(b"defg", message.next_frame().buf.tobytes())
+        self.assertFalse(message.has_next_frame())
+        self.assertIsNone(message.next_frame())
+        self.assertEqual(b"abc", message.start_frame.buf.tobytes())
+        self.assertEqual(b"defg", message.end_frame.buf.tobytes())
+
+    def test_merge(self):
+        message = InboundMessage(Frame(bytearray(b"a"), 0))
+        fragment = InboundMessage(Frame(bytearray(b"fragmentation"), 0))
+        fragment.add_frame(Frame(bytearray(b"b"), 0))
+        fragment.drop_fragmentation_frame()
+        message.merge(fragment)
+        self.assertEqual([b"a", b"b"], [message.next_frame_content() for _ in range(2)])
+
 
 class EncodeDecodeTest(unittest.TestCase):
     @classmethod
@@ -72,7 +249,7 @@ class EncodeDecodeTest(unittest.TestCase):
         self.message = OutboundMessage(self.buf, False)
 
     def write_and_decode(self):
-        self.reader.read(self.message.buf)
+        self.reader.read(bytearray().join(self.message.get_buffers()))
         return self.reader._read_message()
 
     def mark_initial_frame_as_non_final(self):
@@ -136,6 +313,16 @@ class EncodeDecodeTest(unittest.TestCase):
         self.assertEqual(data, DataCodec.decode_nullable(message))
         self.assertIsNone(DataCodec.decode_nullable(message))
 
+    def test_large_data(self):
+        self.mark_initial_frame_as_non_final()
+        data = Data(bytearray(range(256)) * 64)
+        DataCodec.encode(self.buf, data)
+        DataCodec.encode(self.buf, data, True)
+        message = self.write_and_decode()
+        message.next_frame()  # initial frame
+        self.assertEqual(data, DataCodec.decode(message))
+        self.assertEqual(data, DataCodec.decode(message))
+
     def test_entry_list(self):
         self.mark_initial_frame_as_non_final()
         entries = [("a", "1"), ("b", "2"), ("c", "3")]
@@ -296,7 +483,7 @@ class ClientMessageBuilderTest(unittest.TestCase):
         self.assertEqual(1, len(self.builder._fragmented_messages))
         fragmented_message = self.builder._fragmented_messages[fragmentation_id]
         self.assertIsNotNone(fragmented_message)
-        self.assertEqual("a", fragmented_message.end_frame.buf.decode("utf-8"))
+        self.assertEqual("a", fragmented_message.end_frame.buf.tobytes().decode("utf-8"))
 
         self.reader.read(middle_buf)
         middle_message = self.reader._read_message()
@@ -305,10 +492,98 @@ class ClientMessageBuilderTest(unittest.TestCase):
         self.assertEqual(1, len(self.builder._fragmented_messages))
         fragmented_message = self.builder._fragmented_messages[fragmentation_id]
         self.assertIsNotNone(fragmented_message)
-        self.assertEqual("b", fragmented_message.end_frame.buf.decode("utf-8"))
+        self.assertEqual("b", fragmented_message.end_frame.buf.tobytes().decode("utf-8"))
 
         self.reader.read(end_buf)
         end_message = self.reader._read_message()
         self.builder.on_message(end_message)
         self.assertEqual(1, self.counter.value)
         self.assertEqual(0, len(self.builder._fragmented_messages))
+
+
+class ReaderTest(unittest.TestCase):
+    def create_message(self, value):
+        buf = create_initial_buffer(REQUEST_HEADER_SIZE, 0)
+        StringCodec.encode(buf, value, True)
+        return buf
+
+    def receive(self, reader, data):
+        # Mimics the recv_into calls of the reactor
+        while data:
+            buf = reader.get_buffer()
+            n = min(len(buf), len(data))
+            buf[:n] = data[:n]
+            reader.advance(n)
+            data = data[n:]
+
+    def decode(self, message):
+        message.next_frame()
+        return StringCodec.decode(message)
+
+    def test_frames_are_views_over_the_buffer(self):
+        reader = _Reader(None)
+        self.receive(reader, self.create_message("a"))
+        message = reader._read_message()
+        self.assertIsInstance(message.start_frame.buf, memoryview)
+        self.assertEqual("a", self.decode(message))
+
+    def test_frame_crossing_the_buffer_boundary(self):
+        reader = _Reader(None, 32)
+        data = self.create_message("x" * 10) + self.create_message("y" * 10)
+        self.receive(reader, data)
+        first = reader._read_message()
+        second = reader._read_message()
+        self.assertIsNone(reader._read_message())
+        self.assertEqual("x" * 10, self.decode(first))
+        self.assertEqual("y" * 10, self.decode(second))
+
+    def test_frame_larger_than_the_buffer(self):
+        reader = _Reader(None, 16)
+        value = "z" * 1000
+        data = self.create_message(value)
+        for i in range(0, len(data), 7):
+            self.receive(reader, data[i:i + 7])
+            message = reader._read_message()
+            if message:
+                break
+
+        self.assertEqual(value, self.decode(message))
+        self.assertEqual(0, reader.length)
+
+    def test_frames_are_not_overwritten(self):
+        reader = _Reader(None, 64)
+        self.receive(reader, self.create_message("first"))
+        first = reader._read_message()
+        for i in range(20):
+            self.receive(reader, self.create_message("other-%d" % i))
+            self.assertEqual("other-%d" % i, self.decode(reader._read_message()))
+
+        self.assertEqual("first", self.decode(first))
+
+    def test_complete_frames_are_not_copied(self):
+        reader = _Reader(None, 1024)
+        messages = [self.create_message("message-%d" % i) for i in range(500)]
+        allocate = reader._allocate
+        copied = []
+
+        def allocate_and_count(extra):
+            allocate(extra)
+            # the pending bytes are moved to the beginning of the new buffer
+            copied.append(reader._bytes_written)
+
+        reader._allocate = allocate_and_count
+        self.receive(reader, bytearray().join(messages))
+        self.assertGreater(len(copied), 10)
+        # at most a partially received message is copied on each reallocation
+        self.assertLess(max(copied), max(len(message) for message in messages))
+        for i in range(len(messages)):
+            self.assertEqual("message-%d" % i, self.decode(reader._read_message()))
+        self.assertIsNone(reader._read_message())
+
+    def test_read_copies_into_the_buffer(self):
+        reader = _Reader(None, 16)
+        data = self.create_message("abc" * 10)
+        reader.read(data)
+        message = reader._read_message()
+        data[-1] = 0
+        self.assertEqual("abc" * 10, self.decode(message))
@@ -27,5 +27,29 @@ class DataTestCase(unittest.TestCase):
     def test_data_len(self):
         self.assertEqual(10, len(Data("1"* 10)))
 
+    def test_hashes_are_cached(self):
+        data = Data(binascii.unhexlify("00000000" + "01020304" + "12345678"))
+        self.assertEqual(data.hash_code(), data.get_partition_hash())
+        self.assertEqual(data.hash_code(), data._hash_code)
+        self.assertEqual(data.hash_code(), hash(data))
+        self.assertEqual(data.hash_code(), data._partition_hash)
+
+    def test_given_hashes_are_used(self):
+        data = Data(self._data.to_bytes(), 1, 2)
+        self.assertEqual(1, data.get_partition_hash())
+        self.assertEqual(2, data.hash_code())
+
+    def test_equality(self):
+        other = Data(bytes(self._data.to_bytes()))
+        self.assertEqual(self._data, other)
+        self.assertFalse(self._data != other)
+        hash(other)
+        self.assertEqual(self._data, other)
+        self.assertNotEqual(self._data, Data(binascii.unhexlify("12345678" + "01020304" + "12345679")))
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            self._data.attribute = 1
+
 if __name__ == '__main__':
     unittest.main()
@@ -7,6 +7,11 @@ from hazelcast.future import Future, ImmediateFuture, combine_futures, make_bloc
 from hazelcast import six
 from hazelcast.six.moves import range
 
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
 
 class FutureTest(unittest.TestCase):
     def test_set_result(self):
@@ -263,6 +268,73 @@ class FutureTest(unittest.TestCase):
         self.assertEqual(n.exception(), e)
 
 
+    def test_wait_primitive_is_created_only_when_blocking(self):
+        f = Future()
+        f.add_done_callback(lambda _: None)
+        f.set_result("done")
+        self.assertEqual("done", f.result())
+        self.assertIsNone(f._waiter)
+
+    def test_multiple_threads_waiting(self):
+        f = Future()
+        results = []
+
+        def wait():
+            results.append(f.result())
+
+        threads = [Thread(target=wait) for _ in range(5)]
+        for t in threads:
+            t.start()
+        while f._waiter is None:
+            Event().wait(0.01)
+        f.set_result("done")
+        for t in threads:
+            t.join(5)
+        self.assertEqual(["done"] * 5, results)
+
+    def test_callbacks_added_concurrently_with_completion_run_once(self):
+        for _ in range(100):
+            f = Future()
+            counter = [0]
+
+            def callback(_):
+                counter[0] += 1
+
+            t = Thread(target=f.set_result, args=("done",))
+            t.start()
+            for _ in range(10):
+                f.add_done_callback(callback)
+            t.join()
+            self.assertEqual(10, counter[0])
+
+    def test_lock_is_created_only_when_needed(self):
+        f = Future()
+        f.set_result("done")
+        f.add_done_callback(lambda _: None)
+        self.assertEqual("done", f.result())
+        self.assertIsNone(f._lock)
+
+        f, g = Future(), Future()
+        f.add_done_callback(lambda _: None)
+        g.add_done_callback(lambda _: None)
+        self.assertIsNotNone(f._lock)
+        self.assertIsNot(f._lock, g._lock)
+
+    def test_waiting_concurrently_with_completion(self):
+        for _ in range(100):
+            f = Future()
+            results = []
+            t = Thread(target=lambda: results.append(f.result()))
+            t.start()
+            f.set_result("done")
+            t.join(5)
+            self.assertEqual(["done"], results)
+
+    def test_futures_have_no_instance_dict(self):
+        self.assertFalse(hasattr(Future(), "__dict__"))
+        self.assertFalse(hasattr(ImmediateFuture("done"), "__dict__"))
+
+
 class ImmediateFutureTest(unittest.TestCase):
     f = None
 
@@ -421,3 +493,44 @@ class MakeBlockingTest(unittest.TestCase):
 
     def test_attribute(self):
         self.assertEqual(self.calculator.name, "calc")
+
+
+@unittest.skipIf(asyncio is None, "asyncio is not available")
+class AwaitableFutureTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_await_result(self):
+        f = Future()
+
+        def set_result():
+            f.set_result("done")
+
+        Thread(target=set_result).start()
+        # run_until_complete wraps the awaitable with a coroutine
+        self.assertEqual("done", self.loop.run_until_complete(f))
+
+    def test_await_none_result(self):
+        f = Future()
+        f.set_result(None)
+        self.assertIsNone(self.loop.run_until_complete(f))
+
+    def test_await_exception(self):
+        f = Future()
+
+        def set_exception():
+            f.set_exception(RuntimeError("error"))
+
+        Thread(target=set_exception).start()
+        with self.assertRaises(RuntimeError):
+            self.loop.run_until_complete(f)
+
+    def test_await_immediate_future(self):
+        self.assertEqual(1, self.loop.run_until_complete(ImmediateFuture(1)))
+
+    def test_await_immediate_exception_future(self):
+        with self.assertRaises(RuntimeError):
+            self.loop.run_until_complete(ImmediateExceptionFuture(RuntimeError("error")))
@@ -1,9 +1,11 @@
+import threading
 import time
+import unittest
 
 import hazelcast
 from hazelcast.config import ClientProperties
-from hazelcast.errors import HazelcastTimeoutError
-from hazelcast.invocation import Invocation
+from hazelcast.errors import HazelcastTimeoutError, HazelcastOverloadError
+from hazelcast.invocation import Invocation, InvocationService
 from hazelcast.protocol.client_message import OutboundMessage
 from tests.base import HazelcastTestCase
 
@@ -45,12 +47,331 @@ class InvocationTest(HazelcastTestCase):
         with self.assertRaises(HazelcastTimeoutError):
             invocation.future.result()
 
-    def test_invocation_not_timed_out_when_there_is_no_exception(self):
+    def test_invocation_timed_out_when_there_is_no_response(self):
         request = OutboundMessage(bytearray(22), True)
         invocation_service = self.client._invocation_service
         invocation = Invocation(request)
         invocation_service.invoke(invocation)
 
-        time.sleep(2)
+        with self.assertRaises(HazelcastTimeoutError):
+            invocation.future.result()
+        self.assertEqual(0, len(invocation_service._pending))
+        self.assertEqual(1, invocation_service.get_statistics()["timed_out"])
+
+
+class _MockLifecycleService(object):
+    def is_running(self):
+        return True
+
+
+class _MockClient(object):
+    def __init__(self, properties):
+        self.config = hazelcast.ClientConfig()
+        for name, value in properties.items():
+            self.config.set_property(name, value)
+        self.properties = ClientProperties(self.config.get_properties())
+        self.lifecycle_service = _MockLifecycleService()
+
+
+class _MockConnection(object):
+    def __init__(self):
+        self.messages = []
+        self.writable = True
+
+    def send_message(self, message):
+        self.messages.append(message)
+        return True
+
+    def wait_until_writable(self, timeout):
+        return self.writable
+
+
+class _MockReactor(object):
+    def __init__(self):
+        self.timers = []
+
+    def add_timer(self, delay, callback):
+        timer = _MockTimer(callback)
+        self.timers.append(timer)
+        return timer
+
+
+class _MockTimer(object):
+    def __init__(self, callback):
+        self.callback = callback
+        self.canceled = False
+
+    def cancel(self):
+        self.canceled = True
+
+
+class _MockResponse(object):
+    def __init__(self, correlation_id):
+        self._correlation_id = correlation_id
+
+    def has_event_flag(self):
+        return False
+
+    def get_correlation_id(self):
+        return self._correlation_id
+
+    def get_message_type(self):
+        return 1
+
+    def size(self):
+        return 22
+
+
+class _MockConnectionManager(object):
+    def __init__(self, connection):
+        self._connection = connection
+
+    def check_invocation_allowed(self):
+        pass
+
+    def get_random_connection(self):
+        return self._connection
+
+
+class InvocationBackpressureTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = _MockConnection()
+
+    def create_service(self, max_concurrent_invocations, backoff_timeout_millis=-1):
+        client = _MockClient({
+            ClientProperties.MAX_CONCURRENT_INVOCATIONS.name: max_concurrent_invocations,
+            ClientProperties.INVOCATION_BACKOFF_TIMEOUT_MILLIS.name: backoff_timeout_millis,
+        })
+        service = InvocationService(client, _MockReactor(), {})
+        service.start(None, _MockConnectionManager(self.connection), None)
+        return service
+
+    def invoke(self, service, urgent=False):
+        invocation = Invocation(OutboundMessage(bytearray(22), False), urgent=urgent)
+        service.invoke(invocation)
+        return invocation
+
+    def test_fail_fast(self):
+        service = self.create_service(2)
+        self.invoke(service)
+        self.invoke(service)
+        invocation = self.invoke(service)
+        with self.assertRaises(HazelcastOverloadError):
+            invocation.future.result()
+        self.assertEqual(2, len(self.connection.messages))
+
+    def test_slot_is_released_when_invocation_completes(self):
+        service = self.create_service(1)
+        first = self.invoke(service)
+        first.set_response(None)
+        second = self.invoke(service)
+        self.assertFalse(second.future.done())
+        self.assertEqual(2, len(self.connection.messages))
+
+    def test_blocking_until_slot_is_released(self):
+        service = self.create_service(1, 5000)
+        first = self.invoke(service)
+        timer = threading.Timer(0.1, first.set_response, [None])
+        timer.start()
+        start = time.time()
+        second = self.invoke(service)
+        self.assertLess(time.time() - start, 4)
+        self.assertFalse(second.future.done())
+        self.assertEqual(2, len(self.connection.messages))
+
+    def test_blocking_with_timeout(self):
+        service = self.create_service(1, 100)
+        self.invoke(service)
+        start = time.time()
+        invocation = self.invoke(service)
+        self.assertGreaterEqual(time.time() - start, 0.09)
+        with self.assertRaises(HazelcastOverloadError):
+            invocation.future.result()
+
+    def test_urgent_invocations_are_not_limited(self):
+        service = self.create_service(1)
+        self.invoke(service)
+        invocation = self.invoke(service, urgent=True)
         self.assertFalse(invocation.future.done())
-        self.assertEqual(1, len(invocation_service._pending))
+        self.assertEqual(2, len(self.connection.messages))
+
+    def test_connection_over_high_water_mark(self):
+        service = self.create_service(-1)
+        self.connection.writable = False
+        invocation = self.invoke(service)
+        with self.assertRaises(HazelcastOverloadError):
+            invocation.future.result()
+        self.assertEqual(0, len(self.connection.messages))
+
+        urgent = self.invoke(service, urgent=True)
+        self.assertFalse(urgent.future.done())
+        self.assertEqual(1, len(self.connection.messages))
+
+
+class InvocationTimeoutSweeperTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = _MockConnection()
+        self.reactor = _MockReactor()
+        client = _MockClient({ClientProperties.INVOCATION_TIMEOUT_SECONDS.name: 10})
+        self.service = InvocationService(client, self.reactor, {})
+        self.service.start(None, _MockConnectionManager(self.connection), None)
+
+    def tearDown(self):
+        self.service.shutdown()
+
+    def invoke(self, timeout=None, wait_timeout=None):
+        invocation = Invocation(OutboundMessage(bytearray(22), False), wait_timeout=wait_timeout)
+        invocation.timeout = timeout
+        self.service.invoke(invocation)
+        return invocation
+
+    def sweep(self):
+        self.reactor.timers[-1].callback()
+
+    def test_expired_invocations_time_out(self):
+        now = time.time()
+        expired = [self.invoke(now - 1), self.invoke(now - 2)]
+        not_expired = self.invoke(now + 100)
+        self.assertEqual({"pending": 3, "timed_out": 0}, self.service.get_statistics())
+
+        self.sweep()
+        for invocation in expired:
+            with self.assertRaises(HazelcastTimeoutError):
+                invocation.future.result()
+        self.assertFalse(not_expired.future.done())
+        self.assertEqual({"pending": 1, "timed_out": 2}, self.service.get_statistics())
+
+    def test_completed_invocations_are_not_timed_out(self):
+        invocation = self.invoke(time.time() - 1)
+        self.service.handle_client_message(_MockResponse(self.connection.messages[0].get_correlation_id()))
+        self.assertTrue(invocation.future.done())
+
+        self.sweep()
+        self.assertIsNone(invocation.future.exception())
+        self.assertEqual({"pending": 0, "timed_out": 0}, self.service.get_statistics())
+
+    def test_blocking_invocations_are_not_timed_out(self):
+        now = time.time()
+        # such as Queue.take or Map.lock, which may wait on the member indefinitely
+        blocking = self.invoke(now - 1, wait_timeout=-1)
+        # such as Queue.poll with a timeout, which gets its timeout on top of the invocation timeout
+        polling = self.invoke(now - 1, wait_timeout=100)
+        expired_polling = self.invoke(now - 101, wait_timeout=100)
+
+        self.sweep()
+        self.assertFalse(blocking.future.done())
+        self.assertFalse(polling.future.done())
+        with self.assertRaises(HazelcastTimeoutError):
+            expired_polling.future.result()
+        self.assertEqual({"pending": 2, "timed_out": 1}, self.service.get_statistics())
+
+        self.service.handle_client_message(_MockResponse(blocking.request.get_correlation_id()))
+        self.assertTrue(blocking.future.done())
+
+    def test_sweeper_is_rescheduled(self):
+        self.assertEqual(1, len(self.reactor.timers))
+        self.sweep()
+        self.assertEqual(2, len(self.reactor.timers))
+
+    def test_index_is_compacted(self):
+        for _ in range(2000):
+            self.invoke()
+        for message in self.connection.messages:
+            self.service.handle_client_message(_MockResponse(message.get_correlation_id()))
+
+        self.sweep()
+        self.assertEqual(0, len(self.service._deadlines))
+
+    def test_sweeper_is_canceled_on_shutdown(self):
+        self.service.shutdown()
+        self.assertTrue(self.reactor.timers[-1].canceled)
+
+
+
+class InvocationResponseThreadsTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = _MockConnection()
+        self.reactor = _MockReactor()
+
+    def tearDown(self):
+        self.service.shutdown()
+
+    def create_service(self, thread_count, inline_max_size=-1):
+        client = _MockClient({
+            ClientProperties.RESPONSE_THREAD_COUNT.name: thread_count,
+            ClientProperties.RESPONSE_INLINE_MAX_SIZE_BYTES.name: inline_max_size,
+        })
+        self.service = InvocationService(client, self.reactor, {})
+        self.service.start(None, _MockConnectionManager(self.connection), None)
+
+    def invoke(self, partition_id=-1, response_handler=lambda m: m):
+        invocation = Invocation(OutboundMessage(bytearray(22), False), partition_id=partition_id,
+                                connection=self.connection, response_handler=response_handler)
+        self.service.invoke(invocation)
+        return invocation
+
+    def respond(self, invocation):
+        self.service.handle_client_message(_MockResponse(invocation.request.get_correlation_id()))
+
+    def test_responses_are_completed_on_the_response_threads(self):
+        self.create_service(2)
+        names = []
+        invocation = self.invoke(response_handler=lambda m: names.append(threading.current_thread().name))
+        invocation.future.add_done_callback(lambda f: names.append(threading.current_thread().name))
+        self.respond(invocation)
+
+        invocation.future.result()
+        self.assertEqual(2, len(names))
+        self.assertTrue(names[0].startswith("hazelcast-response-"))
+        self.assertEqual(names[0], names[1])
+
+    def test_responses_of_a_partition_are_completed_in_order(self):
+        self.create_service(4)
+        completed = []
+        invocations = [self.invoke(partition_id=7) for _ in range(100)]
+        for index, invocation in enumerate(invocations):
+            invocation.future.add_done_callback(lambda f, i=index: completed.append(i))
+        for invocation in invocations:
+            self.respond(invocation)
+
+        for invocation in invocations:
+            invocation.future.result()
+        self.assertEqual(list(range(100)), completed)
+
+    def test_slow_callback_does_not_block_the_caller(self):
+        self.create_service(1)
+        event = threading.Event()
+        invocation = self.invoke()
+        invocation.future.add_done_callback(lambda f: event.wait(5))
+        start = time.time()
+        self.respond(invocation)
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual(1, self.service.get_response_statistics()["thread_count"])
+        event.set()
+
+    def test_trivial_responses_are_completed_inline(self):
+        self.create_service(1, 1024)
+        invocation = self.invoke()
+        self.respond(invocation)
+        self.assertTrue(invocation.future.done())
+
+        # responses that have callbacks are not trivial
+        invocation = self.invoke()
+        invocation.future.add_done_callback(lambda f: None)
+        self.respond(invocation)
+        invocation.future.result()
+
+        end = time.time() + 5
+        while self.service.get_response_statistics()["completed"] < 1 and time.time() < end:
+            time.sleep(0.01)
+        stats = self.service.get_response_statistics()
+        self.assertEqual(1, stats["inline"])
+        self.assertEqual(1, stats["completed"])
+        self.assertEqual(0, stats["queue_depth"])
+
+    def test_without_response_threads(self):
+        self.create_service(0)
+        invocation = self.invoke()
+        self.respond(invocation)
+        self.assertTrue(invocation.future.done())
+        self.assertEqual({"inline": 0}, self.service.get_response_statistics())
@@ -1,6 +1,13 @@
+import os
+import random
 import unittest
 
-from hazelcast.hash import murmur_hash3_x86_32, hash_to_index
+from hazelcast import hash as hash_module
+from hazelcast.hash import murmur_hash3_x86_32, hash_to_index, murmur_hash3_x86_32_batch, hash_to_index_batch
+from hazelcast.partition import _InternalPartitionService
+from hazelcast.serialization.data import Data
+
+_NUMPY_ENABLED = hash_module.NUMPY_ENABLED
 
 
 class HashTest(unittest.TestCase):
@@ -22,3 +29,68 @@ class HashTest(unittest.TestCase):
             p = hash_to_index(h, 271)
             self.assertEqual(h, hash)
             self.assertEqual(p, partition_id)
+
+    def test_hash_with_offset(self):
+        self.assertEqual(1228513025, murmur_hash3_x86_32(b"xyzkey-1", 3, 5))
+        self.assertEqual(1228513025, murmur_hash3_x86_32(bytearray(b"xyzkey-1"), 3, 5))
+
+
+class BatchHashTest(unittest.TestCase):
+    def setUp(self):
+        rnd = random.Random(42)
+        self.buffers = [os.urandom(rnd.randint(8, 64)) for _ in range(1000)]
+        self.buffers.append(b"\x00" * 8)
+        self.buffers.append(bytearray(b"\x00" * 8 + b"key-1"))
+
+    def tearDown(self):
+        hash_module.NUMPY_ENABLED = _NUMPY_ENABLED
+
+    def test_batch_hash(self):
+        self._check_batch_hash()
+
+    def test_batch_hash_without_numpy(self):
+        hash_module.NUMPY_ENABLED = False
+        self._check_batch_hash()
+
+    def test_batch_hash_to_index(self):
+        self._check_batch_hash_to_index()
+
+    def test_batch_hash_to_index_without_numpy(self):
+        hash_module.NUMPY_ENABLED = False
+        self._check_batch_hash_to_index()
+
+    def test_small_batch(self):
+        buffers = self.buffers[:3]
+        expected = [murmur_hash3_x86_32(buf, 8, len(buf) - 8) for buf in buffers]
+        self.assertEqual(expected, murmur_hash3_x86_32_batch(buffers, 8))
+
+    def _check_batch_hash(self):
+        expected = [murmur_hash3_x86_32(buf, 8, len(buf) - 8) for buf in self.buffers]
+        self.assertEqual(expected, murmur_hash3_x86_32_batch(self.buffers, 8))
+        self.assertEqual(1228513025, murmur_hash3_x86_32_batch(self.buffers, 8)[-1])
+
+    def _check_batch_hash_to_index(self):
+        hashes = [-2 ** 31, 2 ** 31 - 1, 0, -1, 1] + [murmur_hash3_x86_32(buf, 0, len(buf)) for buf in self.buffers]
+        expected = [hash_to_index(h, 271) for h in hashes]
+        self.assertEqual(expected, hash_to_index_batch(hashes, 271))
+
+
+class PartitionIdsTest(unittest.TestCase):
+    def test_get_partition_ids(self):
+        service = _InternalPartitionService(None, {})
+        service.partition_count = 271
+        rnd = random.Random(42)
+        keys = [Data(b"\x00" * 4 + os.urandom(rnd.randint(4, 40))) for _ in range(500)]
+        # keys with partition hashes
+        keys += [Data(b"\x00\x00\x00\x2a" + os.urandom(20)), Data(b"\xff\xff\xff\xff" + os.urandom(5))]
+
+        expected = [service.get_partition_id(key) for key in keys]
+        self.assertEqual(expected, service.get_partition_ids(keys))
+        self.assertEqual(42, service.get_partition_ids(keys)[-2])
+
+    def test_cached_partition_hashes_are_used(self):
+        service = _InternalPartitionService(None, {})
+        service.partition_count = 271
+        keys = [Data(b"\x00" * 4 + os.urandom(20), 42), Data(b"\x00" * 4 + os.urandom(20))]
+        keys[1].hash_code()
+        self.assertEqual([42, service.get_partition_id(keys[1])], service.get_partition_ids(keys))
@@ -78,6 +78,23 @@ class PropertyTest(TestCase):
         with self.assertRaises(ValueError):
             props.get_seconds(prop)
 
+    def test_client_properties_get_int(self):
+        config = ClientConfig()
+        prop = ClientProperty("test", 10)
+        config.set_property(prop.name, "20")
+
+        props = ClientProperties(config.get_properties())
+        self.assertEqual(20, props.get_int(prop))
+
+    def test_client_properties_get_int_unsupported_type(self):
+        config = ClientConfig()
+        prop = ClientProperty("test", 10)
+        config.set_property(prop.name, "value")
+
+        props = ClientProperties(config.get_properties())
+        with self.assertRaises(ValueError):
+            props.get_int(prop)
+
     def test_client_properties_get_second_positive(self):
         config = ClientConfig()
         prop = ClientProperty("test", 1000, TimeUnit.MILLISECOND)
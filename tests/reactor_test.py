@@ -0,0 +1,465 @@
+import select
+import socket
+import threading
+import time
+import unittest
+
+from hazelcast.config import ClientNetworkConfig, ClientProperties
+from hazelcast.connection import _frame_header
+from hazelcast.core import Address
+from hazelcast.protocol.builtin import ByteArrayCodec
+from hazelcast.protocol.client_message import OutboundMessage, REQUEST_HEADER_SIZE, create_initial_buffer, \
+    SIZE_OF_FRAME_LENGTH_AND_FLAGS
+from hazelcast.reactor import AsyncoreReactor, Timer, _TimingWheel, _Waker
+
+
+class _MockConnectionManager(object):
+    live = True
+
+    def on_connection_close(self, connection, cause):
+        pass
+
+
+class _Server(object):
+    def __init__(self, paused=False):
+        self._resumed = threading.Event()
+        if not paused:
+            self._resumed.set()
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(1)
+        self.address = Address(*self._listener.getsockname())
+        self.received = bytearray()
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._serve)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def wait_for(self, size, timeout):
+        end = time.time() + timeout
+        with self._condition:
+            while len(self.received) < size:
+                remaining = end - time.time()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            return bytes(self.received)
+
+    def close(self):
+        self._listener.close()
+
+    def resume(self):
+        self._resumed.set()
+
+    def _serve(self):
+        sock, _ = self._listener.accept()
+        self._resumed.wait()
+        while True:
+            data = sock.recv(1024)
+            if not data:
+                break
+            with self._condition:
+                self.received.extend(data)
+                self._condition.notify_all()
+        sock.close()
+
+
+class ReactorTest(unittest.TestCase):
+    def setUp(self):
+        self.reactor = AsyncoreReactor(ClientProperties({}), {})
+        self.reactor.start()
+
+    def tearDown(self):
+        self.reactor.shutdown()
+
+    def test_poll_timeout_without_timers(self):
+        self.assertIsNone(self.reactor._get_poll_timeout())
+
+    def test_poll_timeout_with_timer(self):
+        self.reactor.add_timer(10, lambda: None)
+        timeout = self.reactor._get_poll_timeout()
+        self.assertTrue(9 < timeout <= 10)
+
+    def test_timer_added_while_reactor_is_blocked(self):
+        # Give the reactor some time to block on the selector without any timers
+        time.sleep(0.1)
+        event = threading.Event()
+        start = time.time()
+        self.reactor.add_timer(0.05, event.set)
+        self.assertTrue(event.wait(5))
+        self.assertLess(time.time() - start, 1)
+
+    def test_canceled_timer(self):
+        event = threading.Event()
+        timer = self.reactor.add_timer(0.1, event.set)
+        timer.cancel()
+        self.assertFalse(event.wait(0.3))
+
+    def test_timer_statistics(self):
+        event = threading.Event()
+        self.reactor.add_timer(0.01, event.set)
+        self.reactor.add_timer(100, lambda: None).cancel()
+        self.reactor.add_timer(100, lambda: None)
+        self.assertTrue(event.wait(5))
+        # the expired timer is counted after its callback returns
+        time.sleep(0.1)
+
+        stats = self.reactor.get_timer_statistics()
+        self.assertEqual(1, stats["pending"])
+        self.assertEqual(3, stats["scheduled"])
+        self.assertEqual(1, stats["expired"])
+        self.assertEqual(1, stats["canceled"])
+        self.assertGreaterEqual(stats["max_lateness"], 0)
+        self.assertEqual(stats["max_lateness"], stats["average_lateness"])
+
+    def test_write_from_user_thread_while_reactor_is_blocked(self):
+        server = _Server()
+        try:
+            connection = self.reactor.connection_factory(_MockConnectionManager(), 0, server.address,
+                                                         ClientNetworkConfig(), lambda m: None)
+            self.assertEqual(b"CP2", server.wait_for(3, 5))
+
+            time.sleep(0.1)
+            connection.send_message(OutboundMessage(bytearray(b"message"), False))
+            self.assertEqual(b"CP2message", server.wait_for(10, 5))
+            connection.close(None, None)
+        finally:
+            server.close()
+
+    def test_queued_writes_are_coalesced(self):
+        server = _Server()
+        try:
+            connection = self.reactor.connection_factory(_MockConnectionManager(), 0, server.address,
+                                                         ClientNetworkConfig(), lambda m: None)
+            with connection._write_lock:
+                # hold the lock so that the messages accumulate in the queue
+                for i in range(10):
+                    connection.send_message(OutboundMessage(bytearray(b"m%d" % i), False))
+
+            connection._wake_up()
+            expected = b"CP2" + b"".join(b"m%d" % i for i in range(10))
+            self.assertEqual(expected, server.wait_for(len(expected), 5))
+            # counters are updated after the data is sent
+            end = time.time() + 5
+            while connection.flushed_message_count < 11 and time.time() < end:
+                time.sleep(0.01)
+            self.assertEqual(11, connection.flushed_message_count)
+            self.assertGreater(connection.messages_per_flush, 1)
+            connection.close(None, None)
+        finally:
+            server.close()
+
+    def test_buffers_are_kept_when_send_fails(self):
+        server = _Server()
+        try:
+            connection = self.reactor.connection_factory(_MockConnectionManager(), 0, server.address,
+                                                         ClientNetworkConfig(), lambda m: None)
+            self.assertEqual(b"CP2", server.wait_for(3, 5))
+
+            def fail(buffers):
+                raise socket.error("send failed")
+
+            with connection._write_lock:
+                connection.send_message(OutboundMessage(bytearray(b"m0"), False))
+                connection.send_message(OutboundMessage(bytearray(b"m1"), False))
+                connection._send_buffers = fail
+                self.assertRaises(socket.error, connection._flush)
+                del connection._send_buffers
+
+            connection._wake_up()
+            self.assertEqual(b"CP2m0m1", server.wait_for(7, 5))
+            connection.close(None, None)
+        finally:
+            server.close()
+
+    def test_message_with_external_payloads(self):
+        server = _Server(paused=True)
+        try:
+            connection = self.reactor.connection_factory(_MockConnectionManager(), 0, server.address,
+                                                         ClientNetworkConfig(), lambda m: None)
+            buf = create_initial_buffer(REQUEST_HEADER_SIZE, 0)
+            payload = bytes(bytearray(i % 251 for i in range(1 << 22)))
+            ByteArrayCodec.encode(buf, payload)
+            ByteArrayCodec.encode(buf, payload, True)
+            message = OutboundMessage(buf, False)
+            # larger than the socket buffers, so that it is sent partially
+            connection.send_message(message)
+            connection.send_message(OutboundMessage(bytearray(b"next"), False))
+
+            server.resume()
+            expected = b"CP2" + b"".join(bytes(b) for b in message.get_buffers()) + b"next"
+            self.assertEqual(expected, server.wait_for(len(expected), 10))
+            connection.close(None, None)
+        finally:
+            server.resume()
+            server.close()
+
+    def test_large_message_is_sent_in_fragments(self):
+        self.reactor.shutdown()
+        self.reactor = AsyncoreReactor(ClientProperties({"hazelcast.client.io.max.frame.size": 1 << 16}), {})
+        self.reactor.start()
+        server = _Server()
+        try:
+            connection = self.reactor.connection_factory(_MockConnectionManager(), 0, server.address,
+                                                         ClientNetworkConfig(), lambda m: None)
+            self.assertEqual(b"CP2", server.wait_for(3, 5))
+            buf = create_initial_buffer(REQUEST_HEADER_SIZE, 0)
+            payload = bytes(bytearray(i % 251 for i in range(1 << 15)))
+            for _ in range(8):
+                ByteArrayCodec.encode(buf, payload)
+            ByteArrayCodec.encode(buf, payload, True)
+            message = OutboundMessage(buf, False)
+            fragments = message.get_fragments(1 << 16, 0)
+            writes = []
+
+            def send_buffers(buffers):
+                writes.append(bytes(bytearray().join(buffers)))
+                return len(writes[-1])
+
+            with connection._write_lock:
+                # a message or a fragment per flush, recorded instead of sent
+                connection._send_buffers = send_buffers
+                connection._write_max_messages = 1
+                connection.send_message(message)
+                connection.send_message(OutboundMessage(bytearray(b"next"), False))
+                while connection.writable():
+                    connection._flush()
+                del connection._send_buffers
+
+            self.assertEqual(len(fragments) + 1, len(writes))
+            # the other message does not wait for all the fragments
+            self.assertLess(writes.index(b"next"), len(writes) - 1)
+            # same fragments, apart from the fragmentation id that ends the first frame
+            content_offset = SIZE_OF_FRAME_LENGTH_AND_FLAGS + 8
+            self.assertEqual([bytes(bytearray().join(fragment))[content_offset:] for fragment in fragments],
+                             [write[content_offset:] for write in writes if write != b"next"])
+            # fragments are made of frames, the last one of which is final
+            for write in writes:
+                if write == b"next":
+                    continue
+                position = 0
+                while True:
+                    frame_size, flags = _frame_header.unpack_from(write, position)
+                    position += frame_size
+                    if flags & (1 << 13):
+                        break
+                self.assertEqual(len(write), position)
+            connection.close(None, None)
+        finally:
+            server.close()
+
+    def test_fragments_are_not_starved_by_steady_load(self):
+        self.reactor.shutdown()
+        self.reactor = AsyncoreReactor(ClientProperties({"hazelcast.client.io.max.frame.size": 1 << 12}), {})
+        self.reactor.start()
+        server = _Server()
+        try:
+            connection = self.reactor.connection_factory(_MockConnectionManager(), 0, server.address,
+                                                         ClientNetworkConfig(), lambda m: None)
+            self.assertEqual(b"CP2", server.wait_for(3, 5))
+            buf = create_initial_buffer(REQUEST_HEADER_SIZE, 0)
+            ByteArrayCodec.encode(buf, bytes(bytearray(1 << 14)), True)
+            message = OutboundMessage(buf, False)
+            fragment_count = len(message.get_fragments(1 << 12, 0))
+            sent = []
+
+            def send_buffers(buffers):
+                sent.append(list(buffers))
+                return sum(len(b) for b in buffers)
+
+            with connection._write_lock:
+                connection._send_buffers = send_buffers
+                connection._write_max_messages = 2
+                connection.send_message(message)
+                # more messages are queued on each flush than a flush writes,
+                # the queue never drains
+                for i in range(2 * fragment_count):
+                    for _ in range(3):
+                        connection.send_message(OutboundMessage(bytearray(b"small"), False))
+                    connection._flush()
+                del connection._send_buffers
+
+            self.assertEqual(0, len(connection._fragmented_messages))
+            self.assertGreater(len(connection._write_queue), 0)
+            connection.close(None, None)
+        finally:
+            server.close()
+
+    def test_write_queue_water_marks(self):
+        self.reactor.shutdown()
+        self.reactor = AsyncoreReactor(ClientProperties({
+            "hazelcast.client.io.write.queue.high.water.mark.bytes": 1 << 20,
+            "hazelcast.client.io.write.queue.low.water.mark.bytes": 1 << 18,
+        }), {})
+        self.reactor.start()
+        server = _Server(paused=True)
+        try:
+            connection = self.reactor.connection_factory(_MockConnectionManager(), 0, server.address,
+                                                         ClientNetworkConfig(), lambda m: None)
+            message = OutboundMessage(bytearray(1 << 16), False)
+            # the socket buffers absorb some of the data before the queue grows
+            for _ in range(1024):
+                if not connection.wait_until_writable(0):
+                    break
+                connection.send_message(message)
+
+            self.assertFalse(connection.wait_until_writable(0.1))
+            self.assertGreaterEqual(connection.pending_write_bytes, 1 << 20)
+
+            server.resume()
+            self.assertTrue(connection.wait_until_writable(5))
+            self.assertLessEqual(connection.pending_write_bytes, 1 << 18)
+            connection.close(None, None)
+        finally:
+            server.resume()
+            server.close()
+
+
+class WakerTest(unittest.TestCase):
+    def setUp(self):
+        self.waker = _Waker({})
+
+    def tearDown(self):
+        self.waker.close()
+
+    def is_readable(self):
+        return len(select.select([self.waker.socket], [], [], 1)[0]) > 0
+
+    def test_wake_up(self):
+        self.waker.wake()
+        self.assertTrue(self.is_readable())
+        self.waker.handle_read()
+        self.assertFalse(select.select([self.waker.socket], [], [], 0)[0])
+
+    def test_wake_up_during_handle_read(self):
+        waker = self.waker
+        recv = waker.recv
+        calls = []
+
+        def recv_with_wake_up(size):
+            if not calls:
+                # another thread wakes up the reactor while it is draining the socket
+                calls.append(size)
+                waker.wake()
+            return recv(size)
+
+        waker.wake()
+        waker.recv = recv_with_wake_up
+        waker.handle_read()
+        del waker.recv
+
+        waker.wake()
+        self.assertTrue(self.is_readable())
+
+
+class TimingWheelTest(unittest.TestCase):
+    def setUp(self):
+        self.wheel = _TimingWheel(0.01, 16)
+        self.start = self.wheel._start
+
+    def add(self, delay):
+        timer = Timer(self.start + delay, lambda: None, lambda t: None)
+        self.wheel.add(timer)
+        return timer
+
+    def test_expire(self):
+        t1 = self.add(0.05)
+        t2 = self.add(0.02)
+        t3 = self.add(0.5)
+        self.assertEqual([], self.wheel.expire(self.start + 0.01))
+        self.assertEqual([t2, t1], self.wheel.expire(self.start + 0.05))
+        self.assertEqual(1, self.wheel.count)
+        self.assertEqual([t3], self.wheel.expire(self.start + 0.5))
+        self.assertEqual(0, self.wheel.count)
+
+    def test_expire_within_the_current_tick(self):
+        timer = self.add(0.015)
+        self.assertEqual([], self.wheel.expire(self.start + 0.012))
+        self.assertEqual([timer], self.wheel.expire(self.start + 0.015))
+
+    def test_timers_more_than_a_rotation_ahead(self):
+        # 16 slots of 10 ms cover 160 ms
+        near = self.add(0.05)
+        far = self.add(0.05 + 0.16)
+        farther = self.add(0.05 + 0.32)
+        self.assertEqual([near], self.wheel.expire(self.start + 0.1))
+        self.assertEqual(far.end, self.wheel.next_deadline())
+        self.assertEqual([far], self.wheel.expire(self.start + 0.25))
+        self.assertEqual(farther.end, self.wheel.next_deadline())
+        self.assertEqual([farther], self.wheel.expire(self.start + 1))
+
+    def test_expire_after_multiple_rotations(self):
+        timers = [self.add(i * 0.03) for i in range(20)]
+        self.assertEqual(timers, self.wheel.expire(self.start + 10))
+        self.assertEqual(0, self.wheel.count)
+
+    def test_expired_timer_added(self):
+        self.wheel.expire(self.start + 1)
+        timer = self.add(0.5)
+        self.assertEqual([timer], self.wheel.expire(self.start + 1))
+
+    def test_remove(self):
+        t1 = self.add(0.05)
+        t2 = self.add(0.05)
+        self.assertTrue(self.wheel.remove(t1))
+        self.assertFalse(self.wheel.remove(t1))
+        self.assertEqual(1, self.wheel.count)
+        self.assertEqual([t2], self.wheel.expire(self.start + 1))
+        self.assertFalse(self.wheel.remove(t2))
+
+    def test_next_deadline(self):
+        self.assertIsNone(self.wheel.next_deadline())
+        self.add(0.5)
+        timer = self.add(0.035)
+        self.add(0.036)
+        self.assertEqual(timer.end, self.wheel.next_deadline())
+
+    def test_clear(self):
+        t1 = self.add(1)
+        t2 = self.add(0.01)
+        self.assertEqual([t2, t1], self.wheel.clear())
+        self.assertEqual(0, self.wheel.count)
+        self.assertIsNone(self.wheel.next_deadline())
+
+
+class MultiThreadedReactorTest(unittest.TestCase):
+    def setUp(self):
+        self.reactor = AsyncoreReactor(ClientProperties({"hazelcast.client.io.thread.count": 3}), {})
+        self.reactor.start()
+
+    def tearDown(self):
+        self.reactor.shutdown()
+
+    def test_timers_run_on_dedicated_thread(self):
+        event = threading.Event()
+        names = []
+
+        def callback():
+            names.append(threading.current_thread().name)
+            event.set()
+
+        self.reactor.add_timer(0, callback)
+        self.assertTrue(event.wait(5))
+        self.assertEqual(["hazelcast-reactor-timer"], names)
+
+    def test_connections_are_spread_across_threads(self):
+        servers = [_Server() for _ in range(3)]
+        try:
+            connections = [self.reactor.connection_factory(_MockConnectionManager(), i, server.address,
+                                                           ClientNetworkConfig(), lambda m: None)
+                           for i, server in enumerate(servers)]
+            self.assertEqual([1, 1, 1], [io_loop.connection_count() for io_loop in self.reactor._io_loops])
+
+            for i, connection in enumerate(connections):
+                for j in range(100):
+                    connection.send_message(OutboundMessage(bytearray(b"%d-%d," % (i, j)), False))
+
+            for i, server in enumerate(servers):
+                expected = b"CP2" + b"".join(b"%d-%d," % (i, j) for j in range(100))
+                self.assertEqual(expected, server.wait_for(len(expected), 5))
+
+            for connection in connections:
+                connection.close(None, None)
+        finally:
+            for server in servers:
+                server.close()
@@ -0,0 +1,383 @@
+# coding: utf-8
+import unittest
+
+import hazelcast
+from hazelcast.errors import HazelcastSerializationError
+from hazelcast.serialization import SerializationServiceV1
+from hazelcast.serialization.api import IdentifiedDataSerializable, Portable
+from hazelcast.serialization.compiler import compile_identified_serializable, compile_portable
+from hazelcast.serialization.portable.classdef import ClassDefinitionBuilder, FieldType
+
+FACTORY_ID = 1
+RECORD_CLASS_ID = 1
+PERSON_CLASS_ID = 2
+ADDRESS_CLASS_ID = 3
+
+RECORD_SCHEMA = [
+    ("a_byte", FieldType.BYTE),
+    ("a_boolean", FieldType.BOOLEAN),
+    ("a_short", FieldType.SHORT),
+    ("an_int", FieldType.INT),
+    ("a_long", FieldType.LONG),
+    ("a_float", FieldType.FLOAT),
+    ("a_char", FieldType.CHAR),
+    ("a_string", FieldType.UTF),
+    ("a_double", FieldType.DOUBLE),
+    ("ints", FieldType.INT_ARRAY),
+    ("strings", FieldType.UTF_ARRAY),
+    ("another_int", FieldType.INT),
+]
+
+
+class _Record(IdentifiedDataSerializable):
+    def __init__(self, a_byte=0, a_boolean=False, a_short=0, an_int=0, a_long=0, a_float=0.0, a_char=u"\x00",
+                 a_string=None, a_double=0.0, ints=None, strings=None, another_int=0):
+        self.a_byte = a_byte
+        self.a_boolean = a_boolean
+        self.a_short = a_short
+        self.an_int = an_int
+        self.a_long = a_long
+        self.a_float = a_float
+        self.a_char = a_char
+        self.a_string = a_string
+        self.a_double = a_double
+        self.ints = ints
+        self.strings = strings
+        self.another_int = another_int
+
+    def write_data(self, out):
+        out.write_byte(self.a_byte)
+        out.write_boolean(self.a_boolean)
+        out.write_short(self.a_short)
+        out.write_int(self.an_int)
+        out.write_long(self.a_long)
+        out.write_float(self.a_float)
+        out.write_char(self.a_char)
+        out.write_utf(self.a_string)
+        out.write_double(self.a_double)
+        out.write_int_array(self.ints)
+        out.write_utf_array(self.strings)
+        out.write_int(self.another_int)
+
+    def read_data(self, inp):
+        self.a_byte = inp.read_byte()
+        self.a_boolean = inp.read_boolean()
+        self.a_short = inp.read_short()
+        self.an_int = inp.read_int()
+        self.a_long = inp.read_long()
+        self.a_float = inp.read_float()
+        self.a_char = inp.read_char()
+        self.a_string = inp.read_utf()
+        self.a_double = inp.read_double()
+        self.ints = inp.read_int_array()
+        self.strings = inp.read_utf_array()
+        self.another_int = inp.read_int()
+
+    def get_factory_id(self):
+        return FACTORY_ID
+
+    def get_class_id(self):
+        return RECORD_CLASS_ID
+
+    def __eq__(self, other):
+        return isinstance(other, _Record) and self.__dict__ == other.__dict__
+
+
+@compile_identified_serializable(RECORD_SCHEMA)
+class _CompiledRecord(_Record):
+    pass
+
+
+class _Address(Portable):
+    def __init__(self, street=None, number=0):
+        self.street = street
+        self.number = number
+
+    def write_portable(self, writer):
+        writer.write_utf("street", self.street)
+        writer.write_int("number", self.number)
+
+    def read_portable(self, reader):
+        self.street = reader.read_utf("street")
+        self.number = reader.read_int("number")
+
+    def get_factory_id(self):
+        return FACTORY_ID
+
+    def get_class_id(self):
+        return ADDRESS_CLASS_ID
+
+    def __eq__(self, other):
+        return isinstance(other, _Address) and self.__dict__ == other.__dict__
+
+
+class _Person(Portable):
+    def __init__(self, age=0, active=False, height=0.0, name=None, salary=0, address=None, previous_addresses=None,
+                 scores=None, rank=0):
+        self.age = age
+        self.active = active
+        self.height = height
+        self.name = name
+        self.salary = salary
+        self.address = address
+        self.previous_addresses = previous_addresses
+        self.scores = scores
+        self.rank = rank
+
+    def write_portable(self, writer):
+        writer.write_int("age", self.age)
+        writer.write_boolean("active", self.active)
+        writer.write_double("height", self.height)
+        writer.write_utf("name", self.name)
+        writer.write_long("salary", self.salary)
+        writer.write_portable("address", self.address)
+        writer.write_portable_array("previous_addresses", self.previous_addresses)
+        writer.write_long_array("scores", self.scores)
+        writer.write_short("rank", self.rank)
+
+    def read_portable(self, reader):
+        self.age = reader.read_int("age")
+        self.active = reader.read_boolean("active")
+        self.height = reader.read_double("height")
+        self.name = reader.read_utf("name")
+        self.salary = reader.read_long("salary")
+        self.address = reader.read_portable("address")
+        self.previous_addresses = reader.read_portable_array("previous_addresses")
+        self.scores = reader.read_long_array("scores")
+        self.rank = reader.read_short("rank")
+
+    def get_factory_id(self):
+        return FACTORY_ID
+
+    def get_class_id(self):
+        return PERSON_CLASS_ID
+
+    def __eq__(self, other):
+        return isinstance(other, _Person) and self.__dict__ == other.__dict__
+
+
+class _ReorderedPerson(_Person):
+    # Writes the fields in a different order than their indexes, like the classes of other clients might do
+    def write_portable(self, writer):
+        writer.write_short("rank", self.rank)
+        writer.write_long_array("scores", self.scores)
+        writer.write_portable_array("previous_addresses", self.previous_addresses)
+        writer.write_portable("address", self.address)
+        writer.write_long("salary", self.salary)
+        writer.write_utf("name", self.name)
+        writer.write_double("height", self.height)
+        writer.write_boolean("active", self.active)
+        writer.write_int("age", self.age)
+
+
+ADDRESS_CLASS_DEF = ClassDefinitionBuilder(FACTORY_ID, ADDRESS_CLASS_ID) \
+    .add_utf_field("street") \
+    .add_int_field("number") \
+    .build()
+
+PERSON_CLASS_DEF = ClassDefinitionBuilder(FACTORY_ID, PERSON_CLASS_ID) \
+    .add_int_field("age") \
+    .add_boolean_field("active") \
+    .add_double_field("height") \
+    .add_utf_field("name") \
+    .add_long_field("salary") \
+    .add_portable_field("address", ADDRESS_CLASS_DEF) \
+    .add_portable_array_field("previous_addresses", ADDRESS_CLASS_DEF) \
+    .add_long_array_field("scores") \
+    .add_short_field("rank") \
+    .build()
+
+
+@compile_portable(ADDRESS_CLASS_DEF)
+class _CompiledAddress(_Address):
+    pass
+
+
+@compile_portable(PERSON_CLASS_DEF)
+class _CompiledPerson(_Person):
+    pass
+
+
+def _create_record(cls):
+    return cls(a_byte=200, a_boolean=True, a_short=-300, an_int=123456, a_long=-1 << 40, a_float=1.5,
+               a_char=u"ç", a_string=u"çğıöşü", a_double=-2.25, ints=[1, 2, 3],
+               strings=[u"a", None, u"b"], another_int=-1)
+
+
+def _create_person(person_cls, address_cls):
+    return person_cls(age=42, active=True, height=1.85, name=u"Jane", salary=1 << 35,
+                      address=address_cls(u"Main Street", 7),
+                      previous_addresses=[address_cls(u"First Street", 1), address_cls(None, 2)],
+                      scores=[3, -5, 1 << 50], rank=-7)
+
+
+def _create_service(portable_classes=None, identified_classes=None, is_big_endian=True, class_definitions=()):
+    config = hazelcast.ClientConfig()
+    config.serialization.is_big_endian = is_big_endian
+    if portable_classes:
+        config.serialization.portable_factories[FACTORY_ID] = portable_classes
+    if identified_classes:
+        config.serialization.data_serializable_factories[FACTORY_ID] = identified_classes
+    for class_definition in class_definitions:
+        config.serialization.class_definitions.add(class_definition)
+    return SerializationServiceV1(config.serialization)
+
+
+class CompiledIdentifiedSerializableTestCase(unittest.TestCase):
+    def test_byte_identical_big_endian(self):
+        self._test_byte_identical(True)
+
+    def test_byte_identical_little_endian(self):
+        self._test_byte_identical(False)
+
+    def test_none_values(self):
+        service = _create_service(identified_classes={RECORD_CLASS_ID: _Record})
+        compiled_service = _create_service(identified_classes={RECORD_CLASS_ID: _CompiledRecord})
+        record = _Record(a_char=u"x")
+        compiled = _CompiledRecord(a_char=u"x")
+
+        data = compiled_service.to_data(compiled)
+        self.assertEqual(service.to_data(record).to_bytes(), data.to_bytes())
+        self.assertEqual(compiled, compiled_service.to_object(data))
+
+    def test_truncated_data(self):
+        service = _create_service(identified_classes={RECORD_CLASS_ID: _CompiledRecord})
+        data = service.to_data(_create_record(_CompiledRecord))
+        data._buffer = data._buffer[:20]
+        with self.assertRaises(HazelcastSerializationError):
+            service.to_object(data)
+
+    def test_generic_output(self):
+        # falls back to the methods of the output when it is not the default one
+        calls = []
+
+        class _Output(object):
+            def __getattr__(self, name):
+                return lambda value: calls.append((name, value))
+
+        record = _create_record(_CompiledRecord)
+        record.write_data(_Output())
+        self.assertEqual(["write_" + _suffix(t) for _, t in RECORD_SCHEMA], [name for name, _ in calls])
+        self.assertEqual([getattr(record, n) for n, _ in RECORD_SCHEMA], [value for _, value in calls])
+
+    def test_class_definition_schema(self):
+        class_def = ClassDefinitionBuilder(FACTORY_ID, RECORD_CLASS_ID) \
+            .add_int_field("an_int") \
+            .add_utf_field("a_string") \
+            .build()
+
+        @compile_identified_serializable(class_def)
+        class _Partial(_Record):
+            pass
+
+        service = _create_service(identified_classes={RECORD_CLASS_ID: _Partial})
+        partial = _Partial(an_int=5, a_string=u"five")
+        self.assertEqual(partial, service.to_object(service.to_data(partial)))
+
+    def test_portable_fields_are_rejected(self):
+        with self.assertRaises(ValueError):
+            compile_identified_serializable([("address", FieldType.PORTABLE)])
+
+    def test_invalid_attribute_names_are_rejected(self):
+        with self.assertRaises(ValueError):
+            compile_identified_serializable([("not valid", FieldType.INT)])
+
+    def _test_byte_identical(self, is_big_endian):
+        service = _create_service(identified_classes={RECORD_CLASS_ID: _Record}, is_big_endian=is_big_endian)
+        compiled_service = _create_service(identified_classes={RECORD_CLASS_ID: _CompiledRecord},
+                                           is_big_endian=is_big_endian)
+
+        data = service.to_data(_create_record(_Record))
+        compiled_data = compiled_service.to_data(_create_record(_CompiledRecord))
+        self.assertEqual(data.to_bytes(), compiled_data.to_bytes())
+
+        expected = service.to_object(data)
+        actual = compiled_service.to_object(data)
+        self.assertEqual(expected.__dict__, actual.__dict__)
+        self.assertEqual(expected.__dict__, service.to_object(compiled_data).__dict__)
+
+
+class CompiledPortableTestCase(unittest.TestCase):
+    def test_byte_identical_big_endian(self):
+        self._test_byte_identical(True)
+
+    def test_byte_identical_little_endian(self):
+        self._test_byte_identical(False)
+
+    def test_none_fields(self):
+        service = self._create_service(_Person, _Address)
+        compiled_service = self._create_service(_CompiledPerson, _CompiledAddress)
+        person = _Person()
+        compiled = _CompiledPerson()
+
+        data = compiled_service.to_data(compiled)
+        self.assertEqual(service.to_data(person).to_bytes(), data.to_bytes())
+        self.assertEqual(compiled, compiled_service.to_object(data))
+
+    def test_read_fields_written_in_another_order(self):
+        service = self._create_service(_ReorderedPerson, _Address)
+        compiled_service = self._create_service(_CompiledPerson, _CompiledAddress)
+
+        data = service.to_data(_create_person(_ReorderedPerson, _Address))
+        person = compiled_service.to_object(data)
+        self.assertEqual(_create_person(_CompiledPerson, _CompiledAddress), person)
+
+    def test_class_definition_is_registered_on_first_write(self):
+        compiled_service = _create_service(portable_classes={PERSON_CLASS_ID: _CompiledPerson,
+                                                             ADDRESS_CLASS_ID: _CompiledAddress})
+        service = self._create_service(_Person, _Address)
+        person = _create_person(_CompiledPerson, _CompiledAddress)
+
+        data = compiled_service.to_data(person)
+        self.assertEqual(service.to_data(_create_person(_Person, _Address)).to_bytes(), data.to_bytes())
+        self.assertEqual(person, compiled_service.to_object(data))
+
+    def test_different_class_definition_falls_back_to_default_serializer(self):
+        class_def = ClassDefinitionBuilder(FACTORY_ID, PERSON_CLASS_ID) \
+            .add_int_field("age") \
+            .add_utf_field("name") \
+            .build()
+
+        @compile_portable(class_def)
+        class _OtherPerson(_Person):
+            pass
+
+        compiled_service = self._create_service(_OtherPerson, _CompiledAddress)
+        data = self._create_service(_Person, _Address).to_data(_create_person(_Person, _Address))
+        # the generated read_portable is used with the default reader
+        person = compiled_service.to_object(data)
+        self.assertEqual((42, u"Jane"), (person.age, person.name))
+
+        self.assertFalse(_OtherPerson._compiled_portable.matches(PERSON_CLASS_DEF))
+        self.assertTrue(_CompiledPerson._compiled_portable.matches(PERSON_CLASS_DEF))
+
+    def _create_service(self, person_cls, address_cls, is_big_endian=True):
+        return _create_service(portable_classes={PERSON_CLASS_ID: person_cls, ADDRESS_CLASS_ID: address_cls},
+                               is_big_endian=is_big_endian, class_definitions=(PERSON_CLASS_DEF, ADDRESS_CLASS_DEF))
+
+    def _test_byte_identical(self, is_big_endian):
+        service = self._create_service(_Person, _Address, is_big_endian)
+        compiled_service = self._create_service(_CompiledPerson, _CompiledAddress, is_big_endian)
+
+        data = service.to_data(_create_person(_Person, _Address))
+        compiled_data = compiled_service.to_data(_create_person(_CompiledPerson, _CompiledAddress))
+        self.assertEqual(data.to_bytes(), compiled_data.to_bytes())
+
+        self.assertEqual(_create_person(_CompiledPerson, _CompiledAddress), compiled_service.to_object(data))
+        self.assertEqual(_create_person(_Person, _Address), service.to_object(compiled_data))
+
+
+def _suffix(field_type):
+    return {
+        FieldType.BYTE: "byte",
+        FieldType.BOOLEAN: "boolean",
+        FieldType.SHORT: "short",
+        FieldType.INT: "int",
+        FieldType.LONG: "long",
+        FieldType.FLOAT: "float",
+        FieldType.DOUBLE: "double",
+        FieldType.CHAR: "char",
+        FieldType.UTF: "utf",
+        FieldType.INT_ARRAY: "int_array",
+        FieldType.UTF_ARRAY: "utf_array",
+    }[field_type]
@@ -35,6 +35,23 @@ class InputTestCase(unittest.TestCase):
         self.assertEqual(0, initial_pos)
         self.assertEqual(self.INT_ARR, read_arr)
 
+    def test_double_array_le(self):
+        buff = bytearray(binascii.unhexlify("02000000" + "000000000000f83f" + "00000000000000c0"))
+        _input = _ObjectDataInput(buff, 0, None, False)
+        self.assertEqual([1.5, -2.0], _input.read_double_array())
+        self.assertEqual(len(buff), _input.position())
+
+    def test_char_array(self):
+        buff = bytearray(binascii.unhexlify("0000000200e7ffff"))
+        _input = _ObjectDataInput(buff, 0, None, True)
+        self.assertEqual([six.unichr(0x00e7), six.unichr(0xffff)], _input.read_char_array())
+
+    def test_truncated_array(self):
+        buff = bytearray(binascii.unhexlify("000000040001000200"))
+        _input = _ObjectDataInput(buff, 0, None, True)
+        with self.assertRaises(EOFError):
+            _input.read_short_array()
+
     def test_char_be(self):
         buff = bytearray(binascii.unhexlify("00e70000"))
         _input = _ObjectDataInput(buff, 0, None, True)
@@ -1,9 +1,15 @@
 import binascii
+import struct
 import unittest
 from hazelcast import six
 
 from hazelcast.serialization.output import _ObjectDataOutput
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class OutputTestCase(unittest.TestCase):
     def setUp(self):
@@ -23,11 +29,41 @@ class OutputTestCase(unittest.TestCase):
         self.assertEqual(bytearray(binascii.unhexlify("00000004")),  self._output._buffer[pos:pos + 4])
         self.assertEqual(bytearray(binascii.unhexlify("00000001000000020000000300000004")),  self._output._buffer[pos+4:pos + 20])
 
+    def test_double_array_le(self):
+        output = _ObjectDataOutput(4, None, False)
+        output.write_double_array([1.5, -2.0])
+        self.assertEqual(bytearray(binascii.unhexlify("02000000" + "000000000000f83f" + "00000000000000c0")),
+                         output.to_byte_array())
+
+    def test_char_array(self):
+        pos = self._output._pos
+        self._output.write_char_array([six.unichr(0x00e7), six.unichr(0x0041)])
+        self.assertEqual(bytearray(binascii.unhexlify("0000000200e70041")), self._output._buffer[pos:pos + 8])
+
+    def test_none_and_empty_arrays(self):
+        self._output.write_long_array(None)
+        self._output.write_long_array([])
+        self.assertEqual(bytearray(binascii.unhexlify("ffffffff00000000")), self._output.to_byte_array())
+
     def test_char(self):
         pos = self._output._pos
         self._output.write_char(six.unichr(0x00e7))
         self.assertEqual(bytearray(binascii.unhexlify("00e70000000000000000")),  self._output._buffer[pos:pos + 10])
 
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_array_with_other_byte_order(self):
+        self._output.write_int_array(numpy.array([1, -2], dtype="<i4"))
+        self.assertEqual(bytearray(binascii.unhexlify("0000000200000001fffffffe")), self._output.to_byte_array())
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_array_is_not_cast(self):
+        self._output.write_int_array(numpy.array([1, 2], dtype="i8"))
+        self.assertEqual(bytearray(binascii.unhexlify("000000020000000100000002")), self._output.to_byte_array())
+        with self.assertRaises(struct.error):
+            self._output.write_int_array(numpy.array([1 << 40], dtype="i8"))
+        with self.assertRaises(struct.error):
+            self._output.write_int_array(numpy.array([1.5]))
+
 
 if __name__ == '__main__':
     unittest.main()
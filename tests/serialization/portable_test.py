@@ -4,7 +4,7 @@ import hazelcast
 from hazelcast.errors import HazelcastSerializationError
 from hazelcast.serialization import SerializationServiceV1
 from hazelcast.serialization.api import Portable
-from hazelcast.serialization.portable.classdef import ClassDefinitionBuilder
+from hazelcast.serialization.portable.classdef import ClassDefinitionBuilder, FieldType
 from tests.serialization.identified_test import create_identified, SerializationV1Identified
 from hazelcast import six
 
@@ -228,6 +228,17 @@ def create_portable():
                                    identified)
 
 
+class ReadAllPortable(SerializationV1Portable):
+    def read_portable(self, inp):
+        self.fields = inp.read_all()
+        super(ReadAllPortable, self).read_portable(inp)
+
+
+class ReadAllInnerPortable(InnerPortable):
+    def read_portable(self, reader):
+        reader.read_all(self)
+
+
 the_factory = {SerializationV1Portable.CLASS_ID: SerializationV1Portable, InnerPortable.CLASS_ID: InnerPortable}
 
 
@@ -353,3 +364,83 @@ class PortableSerializationTestCase(unittest.TestCase):
         data = ss1.to_data(p)
 
         self.assertEqual(p, ss2.to_object(data))
+
+    def test_read_all(self):
+        config = hazelcast.ClientConfig()
+        config.serialization.portable_factories[FACTORY_ID] = {ReadAllPortable.CLASS_ID: ReadAllPortable,
+                                                               InnerPortable.CLASS_ID: ReadAllInnerPortable}
+        service = SerializationServiceV1(config.serialization)
+        obj = create_portable()
+
+        obj2 = service.to_object(service.to_data(obj))
+        self.assertTrue(obj == obj2)
+        expected = {"1": obj.a_byte, "2": obj.a_boolean, "3": obj.a_character, "4": obj.a_short,
+                    "5": obj.a_integer, "6": obj.a_long, "7": obj.a_float, "8": obj.a_double, "9": obj.a_string,
+                    "a1": obj.bytes, "a2": obj.booleans, "a3": obj.chars, "a4": obj.shorts, "a5": obj.ints,
+                    "a6": obj.longs, "a7": obj.floats, "a8": obj.doubles, "a9": obj.strings,
+                    "p": obj.inner_portable, "ap": obj.inner_portable_array}
+        self.assertEqual(sorted(expected.keys()), sorted(obj2.fields.keys()))
+        for name, value in expected.items():
+            self.assertEqual(value, obj2.fields[name], name)
+
+    def test_field_table_is_cached_for_registered_class_definitions(self):
+        config = hazelcast.ClientConfig()
+        config.serialization.portable_factories[FACTORY_ID] = the_factory
+        service = SerializationServiceV1(config.serialization)
+        service.to_data(create_portable())
+
+        context = service._portable_context
+        class_def = context.lookup_class_definition(FACTORY_ID, InnerPortable.CLASS_ID, 0)
+        table = context.get_field_table(class_def)
+        self.assertIs(table, context.get_field_table(class_def))
+        self.assertEqual(["param_str", "param_int"], [fd.field_name for fd in table.field_defs])
+        self.assertEqual((FieldType.INT, 4, 2 + len("param_int") + 1), table.fields["param_int"])
+
+        unregistered = ClassDefinitionBuilder(FACTORY_ID, InnerPortable.CLASS_ID).add_int_field("x").build()
+        self.assertIsNot(context.get_field_table(unregistered), context.get_field_table(unregistered))
+
+
+class PortableRecordTestCase(unittest.TestCase):
+    def setUp(self):
+        config = hazelcast.ClientConfig()
+        config.serialization.portable_factories[FACTORY_ID] = the_factory
+        self.service = SerializationServiceV1(config.serialization)
+        self.obj = create_portable()
+        self.data = self.service.to_data(self.obj)
+
+    def test_fields_are_decoded_on_access(self):
+        record = self.service.to_lazy_object(self.data)
+        self.assertEqual({}, record._values)
+        self.assertEqual(self.obj.a_integer, record.get_field("5"))
+        self.assertEqual(self.obj.a_string, getattr(record, "9"))
+        self.assertEqual(self.obj.strings, record.get_field("a9"))
+        self.assertEqual(self.obj.inner_portable, record.get_field("p"))
+        self.assertEqual(self.obj.inner_portable_array, record.get_field("ap"))
+        self.assertEqual(["5", "9", "a9", "ap", "p"], sorted(record._values.keys()))
+
+    def test_fields_of_the_class_definition(self):
+        record = self.service.to_lazy_object(self.data)
+        self.assertEqual(SerializationV1Portable.CLASS_ID, record.class_definition.class_id)
+        self.assertTrue(record.has_field("a9"))
+        self.assertFalse(record.has_field("missing"))
+        self.assertEqual(20, len(record.get_field_names()))
+
+    def test_unknown_field(self):
+        record = self.service.to_lazy_object(self.data)
+        with self.assertRaises(AttributeError):
+            record.missing
+        with self.assertRaises(HazelcastSerializationError):
+            record.get_field("missing")
+
+    def test_to_object(self):
+        record = self.service.to_lazy_object(self.data)
+        self.assertEqual(self.obj, record.to_object())
+        self.assertEqual(record, self.service.to_lazy_object(self.data))
+
+    def test_read_without_factory(self):
+        service = SerializationServiceV1(hazelcast.SerializationConfig())
+        record = service.to_lazy_object(self.data)
+        self.assertEqual(self.obj.a_double, record.get_field("8"))
+
+    def test_non_portable_data_is_deserialized(self):
+        self.assertEqual("a", self.service.to_lazy_object(self.service.to_data("a")))
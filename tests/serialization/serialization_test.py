@@ -1,11 +1,24 @@
+import os
+import threading
 import unittest
 
-from hazelcast.config import SerializationConfig
-from hazelcast.core import Address
+from hazelcast import six
+from hazelcast.config import SerializationConfig, INTEGER_TYPE, COMPRESSION_ALGORITHM
+from hazelcast.core import Address, HazelcastJsonValue
+from hazelcast.errors import HazelcastSerializationError
+from hazelcast.serialization.api import StreamSerializer
 from hazelcast.serialization.data import Data
+from hazelcast.serialization.serialization_const import PYTHON_TYPE_PICKLE, PYTHON_TYPE_BINARY_PICKLE, \
+    PYTHON_TYPE_COMPRESSED, CONSTANT_TYPE_STRING, CONSTANT_TYPE_BYTE_ARRAY
+from hazelcast.serialization.serializer import _PICKLE_PROTOCOL
 from hazelcast.serialization.service import SerializationServiceV1
 from hazelcast.six.moves import range
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class SerializationTestCase(unittest.TestCase):
     def setUp(self):
@@ -81,3 +94,356 @@ class SerializationTestCase(unittest.TestCase):
         obj = 0
         obj2 = self.service.to_object(obj)
         self.assertEqual(obj, obj2)
+
+
+class BinaryPickleSerializationTestCase(unittest.TestCase):
+    def setUp(self):
+        config = SerializationConfig()
+        config.use_binary_pickle = True
+        self.service = SerializationServiceV1(serialization_config=config)
+
+    def tearDown(self):
+        self.service.destroy()
+
+    def test_pickle_serialization(self):
+        obj = {"key-%d" % x: Address("localhost", x) for x in range(0, 100)}
+        data = self.service.to_data(obj)
+        self.assertEqual(PYTHON_TYPE_BINARY_PICKLE, data.get_type())
+        self.assertEqual(obj, self.service.to_object(data))
+
+    def test_smaller_than_text_pickle(self):
+        obj = {"key-%d" % x: x for x in range(0, 1000)}
+        text_service = SerializationServiceV1(serialization_config=SerializationConfig())
+        text_data = text_service.to_data(obj)
+        self.assertEqual(PYTHON_TYPE_PICKLE, text_data.get_type())
+        self.assertLess(self.service.to_data(obj).total_size(), text_data.total_size())
+
+    def test_text_pickle_is_readable(self):
+        obj = Address("localhost", 5701)
+        text_service = SerializationServiceV1(serialization_config=SerializationConfig())
+        self.assertEqual(obj, self.service.to_object(text_service.to_data(obj)))
+        self.assertEqual(obj, text_service.to_object(self.service.to_data(obj)))
+
+    @unittest.skipIf(numpy is None or _PICKLE_PROTOCOL < 5, "NumPy or pickle protocol 5 is not available")
+    def test_out_of_band_buffers(self):
+        array = numpy.arange(1 << 16, dtype=numpy.float64)
+        data = self.service.to_data({"array": array})
+        # the buffer of the array is written once, next to the pickle
+        self.assertLess(data.total_size(), array.nbytes + 1024)
+        obj = self.service.to_object(data)["array"]
+        self.assertTrue(numpy.array_equal(array, obj))
+        self.assertTrue(obj.flags.writeable)
+
+    @unittest.skipIf(numpy is None or _PICKLE_PROTOCOL < 5, "NumPy or pickle protocol 5 is not available")
+    def test_out_of_band_buffers_are_referenced(self):
+        array = numpy.arange(1 << 10, dtype=numpy.int32)
+        data = self.service.to_data(array)
+        self.assertTrue(data.has_payloads())
+        payloads = [buf for buf in data.get_buffers() if isinstance(buf, memoryview) and buf.obj is array]
+        self.assertEqual(1, len(payloads))
+        self.assertEqual(Data(data.to_bytes()), data)
+        self.assertEqual(hash(Data(data.to_bytes())), hash(data))
+        self.assertTrue(numpy.array_equal(array, self.service.to_object(data)))
+
+    @unittest.skipIf(numpy is None or _PICKLE_PROTOCOL < 5, "NumPy or pickle protocol 5 is not available")
+    def test_out_of_band_buffers_of_nested_objects_are_copied(self):
+        data = self.service.to_data([numpy.arange(4)])
+        self.assertFalse(data.has_payloads())
+
+
+class CompressionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.config = SerializationConfig()
+        self.config.compression_algorithm = COMPRESSION_ALGORITHM.ZLIB
+        self.config.compression_threshold = 100
+        self.service = SerializationServiceV1(serialization_config=self.config)
+
+    def tearDown(self):
+        self.service.destroy()
+
+    def test_large_values_are_compressed(self):
+        obj = "value " * 1000
+        data = self.service.value_to_data(obj)
+        self.assertEqual(PYTHON_TYPE_COMPRESSED, data.get_type())
+        self.assertLess(data.total_size(), 200)
+        self.assertEqual(obj, self.service.to_object(data))
+
+        stats = self.service.compressor.get_statistics()
+        self.assertEqual(1, stats["compressed_count"])
+        self.assertEqual(data.total_size(), stats["compressed_bytes"])
+        self.assertGreater(stats["ratio"], 10)
+
+    def test_small_values_are_not_compressed(self):
+        data = self.service.value_to_data("value")
+        self.assertEqual(CONSTANT_TYPE_STRING, data.get_type())
+
+    def test_incompressible_values_are_not_compressed(self):
+        obj = bytearray(os.urandom(1000))
+        data = self.service.value_to_data(obj)
+        self.assertEqual(CONSTANT_TYPE_BYTE_ARRAY, data.get_type())
+        self.assertEqual(1, self.service.compressor.get_statistics()["incompressible_count"])
+
+    def test_policy(self):
+        self.config.compression_policy[str] = False
+        service = SerializationServiceV1(serialization_config=self.config)
+        self.assertEqual(CONSTANT_TYPE_STRING, service.value_to_data("value " * 1000).get_type())
+        self.assertEqual(PYTHON_TYPE_COMPRESSED, service.value_to_data(HazelcastJsonValue("[" + "1," * 1000 + "1]")).get_type())
+
+    def test_custom_serializer(self):
+        self.config.custom_serializers[_Key] = _KeySerializer
+        service = SerializationServiceV1(serialization_config=self.config)
+        obj = _Key("value " * 1000, None)
+        data = service.value_to_data(obj)
+        self.assertEqual(PYTHON_TYPE_COMPRESSED, data.get_type())
+        self.assertEqual(obj.value, service.to_object(data))
+
+    def test_compressed_and_uncompressed_values_coexist(self):
+        obj = "value " * 1000
+        plain_service = SerializationServiceV1(serialization_config=SerializationConfig())
+        self.assertEqual(obj, self.service.to_object(plain_service.to_data(obj)))
+        self.assertEqual(obj, plain_service.to_object(self.service.value_to_data(obj)))
+
+    def test_partition_hash_is_kept(self):
+        obj = _Key("value " * 1000, "partition-key")
+        data = self.service.value_to_data(obj)
+        self.assertEqual(PYTHON_TYPE_COMPRESSED, data.get_type())
+        plain_service = SerializationServiceV1(serialization_config=SerializationConfig())
+        self.assertEqual(plain_service.to_data(obj).get_partition_hash(), data.get_partition_hash())
+
+    def test_only_values_are_compressed(self):
+        # predicates, entry processors and the like must stay readable by the members
+        obj = "value " * 1000
+        self.assertEqual(CONSTANT_TYPE_STRING, self.service.to_data(obj).get_type())
+        self.assertEqual(CONSTANT_TYPE_STRING, self.service.to_data(obj, lambda o: "partition-key").get_type())
+
+    def test_keys_are_not_compressed(self):
+        key = "key " * 1000
+        self.assertEqual(CONSTANT_TYPE_STRING, self.service.key_to_data(key).get_type())
+        self.assertEqual(CONSTANT_TYPE_STRING, self.service.to_data_and_partition_hash(key)[0].get_type())
+
+    @unittest.skipIf(six.PY2, "LZMA is not available")
+    def test_lzma(self):
+        self.config.compression_algorithm = COMPRESSION_ALGORITHM.LZMA
+        service = SerializationServiceV1(serialization_config=self.config)
+        obj = "value " * 1000
+        data = service.value_to_data(obj)
+        self.assertEqual(PYTHON_TYPE_COMPRESSED, data.get_type())
+        self.assertEqual(obj, self.service.to_object(data))
+
+
+class _Key(object):
+    def __init__(self, value, partition_key):
+        self.value = value
+        self.partition_key = partition_key
+
+    def get_partition_key(self):
+        return self.partition_key
+
+
+class _KeySerializer(StreamSerializer):
+    def get_type_id(self):
+        return 1000
+
+    def write(self, out, obj):
+        out.write_utf(obj.value)
+
+    def read(self, inp):
+        return inp.read_utf()
+
+    def destroy(self):
+        pass
+
+
+class SerializationPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        config = SerializationConfig()
+        config.set_custom_serializer(_Key, _KeySerializer)
+        self.service = SerializationServiceV1(serialization_config=config, max_pooled_buffer_size=8 * 1024)
+
+    def tearDown(self):
+        self.service.destroy()
+
+    def test_output_is_reused(self):
+        self.service.to_data("a")
+        out = self.service._output_pool.take()
+        self.service._output_pool.give_back(out)
+
+        self.service.to_data("b")
+        self.assertIs(out, self.service._output_pool.take())
+        self.assertEqual(0, out.position())
+
+    def test_pooled_output_does_not_leak_previous_data(self):
+        self.assertEqual("a long string", self.service.to_object(self.service.to_data("a long string")))
+        self.assertEqual("b", self.service.to_object(self.service.to_data("b")))
+        self.assertEqual(self.service.to_data("b"), SerializationServiceV1(SerializationConfig()).to_data("b"))
+
+    def test_large_output_is_not_retained(self):
+        self.service.to_data("x" * 100000)
+        out = self.service._output_pool.take()
+        self.assertEqual(4 * 1024, out.buffer_size())
+
+    def test_input_is_reused_and_released(self):
+        data = self.service.to_data("a")
+        self.service.to_object(data)
+        inp = self.service._input_pool.take()
+        self.assertEqual(0, inp.size())
+        self.service._input_pool.give_back(inp)
+
+        self.assertEqual("b", self.service.to_object(self.service.to_data("b")))
+        self.assertIs(inp, self.service._input_pool.take())
+
+    def test_nested_serialization(self):
+        # serializing the partition key takes another output while the first one is in use
+        data = self.service.to_data(_Key("value", "partition-key"))
+        self.assertEqual(self.service.to_data("partition-key").get_partition_hash(), data.get_partition_hash())
+        self.assertEqual("value", self.service.to_object(data))
+
+    def test_output_is_given_back_on_error(self):
+        with self.assertRaises(Exception):
+            self.service.to_data(_Key(42, None))
+        out = self.service._output_pool.take()
+        self.assertEqual(0, out.position())
+
+    def test_pools_are_thread_local(self):
+        self.service.to_data("a")
+        outputs = []
+        thread = threading.Thread(target=lambda: outputs.append(self.service._output_pool.take()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(outputs[0], self.service._output_pool.take())
+
+
+class SerializerDispatchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.service = SerializationServiceV1(serialization_config=SerializationConfig())
+        self.registry = self.service._registry
+
+    def tearDown(self):
+        self.service.destroy()
+
+    def test_serializer_is_cached_per_type(self):
+        serializer = self.registry.serializer_for("a")
+        self.assertIs(serializer, self.registry._dispatch_cache[str])
+        self.assertIs(serializer, self.registry.serializer_for("b"))
+
+    def test_var_ints_are_dispatched_on_value(self):
+        self.registry.int_type = INTEGER_TYPE.VAR
+        self.assertEqual(self.registry.serializer_for(1).get_type_id(), self.registry.serializer_for(2).get_type_id())
+        self.assertNotEqual(self.registry.serializer_for(1).get_type_id(),
+                            self.registry.serializer_for(1 << 40).get_type_id())
+        self.assertNotIn(int, self.registry._dispatch_cache)
+
+    def test_registration_invalidates_cache(self):
+        self.assertIs(self.registry._python_serializer, self.registry.serializer_for(_Key("a", None)))
+        self.registry._type_dict.pop(_Key)
+        self.registry.safe_register_serializer(_KeySerializer(), _Key)
+        self.assertIsInstance(self.registry.serializer_for(_Key("a", None)), _KeySerializer)
+
+    def test_to_data_and_partition_hash(self):
+        for key in ["key", u"key", 42, 4.2, True, b"key"]:
+            data, partition_hash = self.service.to_data_and_partition_hash(key)
+            self.assertEqual(self.service.to_data(key), data)
+            self.assertEqual(data.get_partition_hash(), partition_hash)
+            self.assertEqual(key, self.service.to_object(data))
+
+    def test_to_data_and_partition_hash_with_partition_key(self):
+        key = _Key("value", "partition-key")
+        data, partition_hash = self.service.to_data_and_partition_hash(key)
+        self.assertEqual(self.service.to_data("partition-key").get_partition_hash(), partition_hash)
+
+    def test_to_data_and_partition_hash_of_data(self):
+        data = self.service.to_data("key")
+        self.assertEqual((data, data.get_partition_hash()), self.service.to_data_and_partition_hash(data))
+
+
+class KeyDataCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        config = SerializationConfig()
+        config.key_cache_max_size = 2
+        self.service = SerializationServiceV1(serialization_config=config)
+        self.cache = self.service.key_cache
+
+    def tearDown(self):
+        self.service.destroy()
+
+    def test_disabled_by_default(self):
+        service = SerializationServiceV1(serialization_config=SerializationConfig())
+        self.assertIsNone(service.key_cache)
+        self.assertEqual(service.to_data("a"), service.key_to_data("a"))
+
+    def test_hit_returns_same_data(self):
+        data = self.service.key_to_data("a")
+        self.assertIs(data, self.service.key_to_data("a"))
+        self.assertEqual(self.service.to_data("a"), data)
+        self.assertEqual(self.service.to_data("a").get_partition_hash(), data.get_partition_hash())
+        stats = self.cache.get_statistics()
+        self.assertEqual(1, stats["hits"])
+        self.assertEqual(1, stats["misses"])
+
+    def test_keyed_by_type(self):
+        self.assertEqual(1, self.service.to_object(self.service.key_to_data(1)))
+        self.assertIs(True, self.service.to_object(self.service.key_to_data(True)))
+        self.assertEqual(2, self.cache.get_statistics()["misses"])
+
+    def test_least_recently_used_is_evicted(self):
+        a = self.service.key_to_data("a")
+        self.service.key_to_data("b")
+        self.service.key_to_data("a")
+        self.service.key_to_data("c")
+        self.assertIs(a, self.service.key_to_data("a"))
+        stats = self.cache.get_statistics()
+        self.assertEqual(2, stats["owned_entry_count"])
+        self.assertEqual(1, stats["evictions"])
+        self.assertEqual(3, stats["misses"])
+        self.service.key_to_data("b")
+        self.assertEqual(4, self.cache.get_statistics()["misses"])
+
+    def test_other_types_are_not_cached(self):
+        self.service.key_to_data(0.0)
+        self.service.key_to_data(_Key("a", None))
+        self.assertEqual(0, self.cache.get_statistics()["misses"])
+        self.assertNotEqual(self.service.key_to_data(0.0), self.service.key_to_data(-0.0))
+
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class NumpyArraySerializationTestCase(unittest.TestCase):
+    def setUp(self):
+        config = SerializationConfig()
+        config.use_numpy_arrays = True
+        self.service = SerializationServiceV1(serialization_config=config)
+
+    def tearDown(self):
+        self.service.destroy()
+
+    def test_arrays(self):
+        for dtype in ["?", "<i2", ">i4", "i8", "f4", ">f8"]:
+            array = numpy.arange(10).astype(dtype)
+            obj = self.service.to_object(self.service.to_data(array))
+            self.assertEqual(array.dtype.newbyteorder("="), obj.dtype)
+            self.assertTrue(numpy.array_equal(array, obj))
+
+    def test_compatible_with_primitive_arrays(self):
+        array = numpy.array([1.5, 2.5])
+        data = self.service.to_data(array)
+        self.assertEqual([1.5, 2.5], SerializationServiceV1(SerializationConfig()).to_object(data))
+
+    def test_native_byte_order_reads_without_copy(self):
+        config = SerializationConfig()
+        config.use_numpy_arrays = True
+        config.is_big_endian = not numpy.little_endian
+        service = SerializationServiceV1(serialization_config=config)
+        data = service.to_data(numpy.arange(4.0))
+        obj = service.to_object(data)
+        self.assertFalse(obj.flags.writeable)
+        self.assertFalse(obj.flags.owndata)
+
+    def test_other_arrays_are_pickled(self):
+        array = numpy.array(["a", "b"])
+        self.assertTrue(numpy.array_equal(array, self.service.to_object(self.service.to_data(array))))
+        array = numpy.arange(3.0)
+        self.assertEqual(numpy.float64, self.service.to_object(self.service.to_data(array)).dtype)
+
+    def test_multi_dimensional_arrays_are_rejected(self):
+        with self.assertRaises(HazelcastSerializationError):
+            self.service.to_data(numpy.zeros((2, 2)))